@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+
+sys.path.append('src')
+
+from spellchecker import SpellChecker
+from src.symspell import SymSpell
+from src.data_loading import DataLoading
+from src.data_processing import DataProcessing
+from src.text_normalizer import TextNormalizer
+from src.spelling_correction import SpellingCorrector
+
+
+def correct_words(spell: object, words: list[str]) -> tuple[list[str], float]:
+    """
+    Correct every word with the given spell checker the same way `SpellingCorrector.correct_word` does.
+
+    Args:
+        spell (object): The pyspellchecker or SymSpell spell checker.
+        words (list[str]): The words to correct.
+
+    Returns:
+        tuple[list[str], float]: The corrected words and the elapsed time in seconds.
+    """
+    start: float = time.perf_counter()
+    corrected_words: list[str] = []
+
+    for word in words:
+        correction: str = word if word in spell else spell.correction(word)
+        corrected_words.append(correction if isinstance(correction, str) else word)
+
+    return corrected_words, time.perf_counter() - start
+
+def is_expected_difference(symspell: SymSpell, word: str, expected: str, actual: str) -> bool:
+    """
+    Check whether a different correction by SymSpell is an accepted consequence of its distance.
+
+    SymSpell ranks the known words within `max_edit_distance` by optimal string alignment distance,
+    then by frequency. pyspellchecker applies edits twice for distance 2, so it also finds words that
+    are only within the Damerau-Levenshtein distance, such as "ca" -> "abc", and it breaks frequency
+    ties arbitrarily. A difference is expected if SymSpell's correction ranks at least as high as
+    pyspellchecker's under SymSpell's ranking; otherwise SymSpell missed a candidate.
+
+    Args:
+        symspell (SymSpell): The SymSpell index.
+        word (str): The corrected word.
+        expected (str): The correction of pyspellchecker.
+        actual (str): The correction of SymSpell.
+
+    Returns:
+        bool: Whether the difference is expected.
+    """
+    def rank(correction: str) -> tuple[int, int]:
+        correction = correction.lower()
+        if correction not in symspell:
+            return symspell.max_edit_distance + 1, 0
+
+        distance: int = SymSpell.distance(word.lower(), correction, symspell.max_edit_distance)
+        if distance > symspell.max_edit_distance:
+            return symspell.max_edit_distance + 1, 0
+
+        return distance, -symspell.frequencies[correction]
+
+    return rank(actual) <= rank(expected)
+
+def benchmark_spelling() -> int:
+    """
+    Build the SymSpell index and compare its corrections and speed with pyspellchecker on the training utterances.
+
+    Args:
+        None
+
+    Returns:
+        int: The number of words SymSpell corrects differently than expected from its distance.
+    """
+    script_dir: str = os.path.dirname(os.path.realpath(__file__))
+    config: dict[str, any] = DataLoading.load_config(os.path.join(script_dir, 'config.json'))
+    spelling_config: dict[str, any] = config.get('spelling', {})
+    spelling_path: str = os.path.join(script_dir, config['paths']['spelling'])
+    index_path: str = os.path.join(script_dir, config['paths']['spelling_index'])
+    contractions: dict[str, str] = DataLoading.load_contractions(os.path.join(script_dir, config['paths']['contractions']))
+    intents: dict[str, list[str]] = DataLoading.load_intents(os.path.join(script_dir, config['paths']['intents']))
+
+    normalizer: TextNormalizer = TextNormalizer.get_instance(contractions)
+    words: list[str] = []
+    for utterance in DataProcessing.get_training_utterances(intents):
+        words.extend(normalizer.normalize(utterance).split())
+
+    spell: SpellChecker = SpellChecker(language="de", distance=spelling_config.get("max_edit_distance", 2))
+    spell.word_frequency.load_text_file(spelling_path)
+
+    start: float = time.perf_counter()
+    SpellingCorrector.configure({**spelling_config, "backend": "symspell"}, index_path)
+    symspell: SymSpell = SpellingCorrector.get_instance(spelling_path).spell
+    print(f"Built SymSpell index in {time.perf_counter() - start:.2f}s.")
+
+    pyspellchecker_words, pyspellchecker_time = correct_words(spell, words)
+    symspell_words, symspell_time = correct_words(symspell, words)
+
+    differences: list[tuple[str, str, str]] = [
+        (word, expected, actual) for word, expected, actual in zip(words, pyspellchecker_words, symspell_words) if expected != actual
+    ]
+    unexpected_differences: int = 0
+    for word, expected, actual in differences:
+        expected_difference: bool = is_expected_difference(symspell, word, expected, actual)
+        unexpected_differences += not expected_difference
+        print(f"{word}: pyspellchecker '{expected}', symspell '{actual}'{'' if expected_difference else ' (unexpected)'}")
+
+    print(f"{len(words)} words, {len(differences)} differences, {unexpected_differences} unexpected.")
+    print(f"pyspellchecker: {pyspellchecker_time:.2f}s, symspell: {symspell_time:.2f}s.")
+
+    return unexpected_differences
+
+if __name__ == "__main__":
+    sys.exit(1 if benchmark_spelling() else 0)
@@ -1,18 +1,58 @@
+import atexit
 from flask import Flask, request, jsonify
-from predict import predict_solution
+from predict import predict_solution, predict_top_solutions, predict_solutions, create_batcher
+from src.model_registry import ModelRegistry
+from src.micro_batcher import MicroBatcher
 
 app: Flask = Flask(__name__)
+registry: ModelRegistry = ModelRegistry.get_instance()
+batcher: MicroBatcher = create_batcher(registry)
+atexit.register(batcher.close)
 
 @app.route('/predict', methods=['POST'])
 def predict():
     try:
         data: dict[str, str] = request.get_json()
         error_message: str = data['errorMessage']
-        prediction, confidence = predict_solution(error_message)
-        return jsonify({'prediction': prediction, 'confidence': str(confidence)})
+        top_k: int = int(data.get('topK', 1))
+
+        if top_k > 1:
+            predictions, source = predict_top_solutions(error_message, top_k, registry)
+            return jsonify({'prediction': predictions[0][0], 'confidence': str(predictions[0][1]), 'source': source,
+                            'alternatives': [{'prediction': prediction, 'confidence': str(confidence)} for prediction, confidence in predictions]})
+
+        prediction, confidence, source = predict_solution(error_message, registry, batcher)
+        return jsonify({'prediction': prediction, 'confidence': str(confidence), 'source': source})
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    try:
+        data: dict[str, list[str]] = request.get_json(silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get('errorMessages'), list):
+            return jsonify({'error': 'errorMessages must be a list of error messages.'}), 400
+
+        error_messages: list[str] = data['errorMessages']
+        top_k: int = int(data.get('topK', 1))
+        results: list[dict[str, any]] = predict_solutions(error_messages, registry, top_k=top_k)
+        return jsonify({'predictions': [
+            {'prediction': result['prediction'],
+             'confidence': None if result['confidence'] is None else str(result['confidence']),
+             'alternatives': [{'prediction': prediction, 'confidence': str(confidence)} for prediction, confidence in result['alternatives']],
+             'source': result['source'],
+             'error': result['error']}
+            for result in results
+        ]})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/health', methods=['GET'])
+def health():
+    return jsonify({'status': 'ok', 'modelVersion': registry.model_version, 'loadTimings': registry.load_timings,
+                    'cache': registry.prediction_cache.stats()})
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
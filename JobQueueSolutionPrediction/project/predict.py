@@ -1,21 +1,17 @@
-import os
 import sys
-import spacy
-import numpy as np
-import tensorflow as tf
-from typing import Callable
-from sklearn.preprocessing import LabelEncoder
-from keras.layers import TextVectorization
+from typing import Optional
 
 sys.path.append('src')
 
-from src.data_loading import DataLoading
 from src.helper import Helper
+from src.model_registry import ModelRegistry
+from src.micro_batcher import MicroBatcher
 
 
 def load_data(config: dict[str, any], script_dir: str) -> tuple:
     """
-    Load various data needed for prediction.
+    Load various data needed for prediction from the process-wide model registry.
+    The registry reads the configuration from `config.json` in the script directory.
 
     Args:
         config (dict[str, any]): Configuration parameters.
@@ -24,56 +20,167 @@ def load_data(config: dict[str, any], script_dir: str) -> tuple:
     Returns:
         tuple: Tuple containing loaded data.
     """
-    intents_path: str = os.path.join(script_dir, config['paths']['intents'])
-    trained_nlp_path: str = os.path.join(script_dir, config['paths']['nlp'])
-    contractions_path: str = os.path.join(script_dir, config['paths']['contractions'])
-    preprocessing_functions_path: str = os.path.join(script_dir, config['paths']['preprocessing_functions'])
-    job_queue_vectorizer_path: str = os.path.join(script_dir, config['paths']['vectorizer'])
-    job_queue_label_encoder_path: str = os.path.join(script_dir, config['paths']['label_encoder'])
-    job_queue_model_path: str = os.path.join(script_dir, config['paths']['model'])
-    
-    intents: dict[str, list[str]] = DataLoading.load_intents(intents_path)
-    trained_nlp: spacy.Language = DataLoading.load_trained_nlp(trained_nlp_path)
-    contractions: dict[str, str] = DataLoading.load_contractions(contractions_path)
-    preprocessing_functions: dict[str, Callable[[str], str]] = DataLoading.load_preprocessing_functions(preprocessing_functions_path)
-    job_queue_vectorizer: dict[dict[str, object], list[str]] = DataLoading.load_job_queue_vectorizer(job_queue_vectorizer_path)
-    job_queue_label_encoder: LabelEncoder = DataLoading.load_label_encoder(job_queue_label_encoder_path)
-    job_queue_model: tf.keras.models.Sequential = DataLoading.load_keras_model(job_queue_model_path)
-
-    return intents, trained_nlp, contractions, preprocessing_functions, job_queue_vectorizer, job_queue_label_encoder, job_queue_model
-
-def predict_solution(error_message: str) -> tuple[str, float]:
+    registry: ModelRegistry = ModelRegistry.get_instance(script_dir)
+
+    return (
+        registry.intents, registry.trained_nlp, registry.contractions, registry.preprocessing_pipeline,
+        registry.job_queue_vectorizer, registry.job_queue_label_encoder, registry.job_queue_model
+    )
+
+def create_batcher(registry: ModelRegistry) -> MicroBatcher:
+    """
+    Create a micro-batcher that runs one vectorize and model call per batch of concurrent requests.
+
+    Args:
+        registry (ModelRegistry): The loaded prediction artifacts.
+
+    Returns:
+        MicroBatcher: The started micro-batcher.
+    """
+    serving: dict[str, float] = registry.config.get("serving", {})
+
+    def predict_batch(preprocessed_job_queue_errors: list[str]) -> list[tuple[str, float]]:
+        return Helper.calculate_predictions(
+            preprocessed_job_queue_errors, registry.vectorizer, registry.label_responses, registry.job_queue_model
+        )
+
+    return MicroBatcher(
+        predict_batch, serving.get("batch_window_ms", 5), serving.get("max_batch_size", 64), serving.get("request_timeout_ms", 5000)
+    )
+
+def predict_solution(
+    error_message: str,
+    registry: Optional[ModelRegistry] = None,
+    batcher: Optional[MicroBatcher] = None
+) -> tuple[str, float, str]:
     """
     Predict function to perform prediction.
 
     Args:
         error_message (str): The error message for prediction.
+        registry (Optional[ModelRegistry]): The loaded prediction artifacts. Defaults to the process-wide registry.
+        batcher (Optional[MicroBatcher]): Batches the model call with concurrent requests. Defaults to predicting on its own.
+
+    Returns:
+        tuple[str, float, str]: A tuple containing the prediction, confidence and source ("template", "cache" or "model").
+    """
+    if registry is None:
+        registry = ModelRegistry.get_instance()
+
+    tag: Optional[str] = registry.template_index.lookup(error_message)
+    if tag is not None:
+        return registry.responses[tag], 1.0, "template"
+
+    preprocessed_job_queue_error: str = Helper.process_job_queue_error(
+        error_message, registry.trained_nlp, registry.preprocessing_pipeline, registry.entity_masker
+    )
+
+    cached_prediction: Optional[tuple[str, float]] = registry.prediction_cache.get(registry.model_version, preprocessed_job_queue_error)
+    if cached_prediction is not None:
+        return cached_prediction[0], cached_prediction[1], "cache"
+
+    if batcher is not None:
+        prediction: tuple[str, float] = batcher.predict(preprocessed_job_queue_error)
+    else:
+        prediction = Helper.calculate_predictions(
+            [preprocessed_job_queue_error], registry.vectorizer, registry.label_responses, registry.job_queue_model
+        )[0]
+
+    registry.prediction_cache.put(registry.model_version, preprocessed_job_queue_error, prediction)
+
+    return prediction[0], prediction[1], "model"
+
+def predict_top_solutions(
+    error_message: str,
+    top_k: int,
+    registry: Optional[ModelRegistry] = None
+) -> tuple[list[tuple[str, float]], str]:
+    """
+    Predict the k best solutions for an error message.
+
+    Args:
+        error_message (str): The error message for prediction.
+        top_k (int): The number of solutions to return.
+        registry (Optional[ModelRegistry]): The loaded prediction artifacts. Defaults to the process-wide registry.
 
     Returns:
-        tuple[str, float]: A tuple containing the prediction, and confidence.
+        tuple[list[tuple[str, float]], str]: The predictions and confidences, best first, and the source ("template", "cache" or "model").
     """
-    script_dir: str = os.path.dirname(os.path.realpath(__file__))
-    config_path: str = os.path.join(script_dir, 'config.json')
-    config: dict[str, any] = DataLoading.load_config(config_path)
-    tf.random.set_seed(42)
+    result: dict[str, any] = predict_solutions([error_message], registry, top_k=top_k)[0]
 
-    (intents, trained_nlp, contractions, preprocessing_functions, job_queue_vectorizer, 
-     job_queue_label_encoder, job_queue_model) = load_data(config, script_dir)
+    if result["error"] is not None:
+        raise ValueError(result["error"])
 
-    vectorizer: TextVectorization = TextVectorization.from_config(job_queue_vectorizer["config"])
-    vectorizer.set_weights(job_queue_vectorizer["weights"])
+    return result["alternatives"], result["source"]
 
-    helper = Helper()
+def predict_solutions(
+    error_messages: list[str],
+    registry: Optional[ModelRegistry] = None,
+    use_templates: bool = True,
+    top_k: int = 1
+) -> list[dict[str, any]]:
+    """
+    Predict the solutions for a batch of error messages with a single model forward pass.
 
-    preprocessed_job_queue_error: str = helper.process_job_queue_error(
-        error_message, trained_nlp, preprocessing_functions, contractions, config
+    Args:
+        error_messages (list[str]): The error messages for prediction.
+        registry (Optional[ModelRegistry]): The loaded prediction artifacts. Defaults to the process-wide registry.
+        use_templates (bool, optional): Whether to answer messages matching the template index without the model. Defaults to True.
+        top_k (int, optional): The number of alternatives to return for each error message. Defaults to 1.
+
+    Returns:
+        list[dict[str, any]]: For each error message, a dictionary with the prediction, confidence, alternatives, source and error.
+    """
+    if registry is None:
+        registry = ModelRegistry.get_instance()
+
+    results: list[dict[str, any]] = [
+        {"prediction": None, "confidence": None, "alternatives": [], "source": None, "error": None} for _ in error_messages
+    ]
+
+    untemplated_indices: list[int] = []
+    for i, error_message in enumerate(error_messages):
+        tag: Optional[str] = registry.template_index.lookup(error_message) if use_templates and isinstance(error_message, str) else None
+        if tag is not None:
+            results[i].update(prediction=registry.responses[tag], confidence=1.0, alternatives=[(registry.responses[tag], 1.0)], source="template")
+        else:
+            untemplated_indices.append(i)
+
+    processed_job_queue_errors: list[tuple[Optional[str], Optional[str]]] = Helper.process_job_queue_errors(
+        [error_messages[i] for i in untemplated_indices],
+        registry.trained_nlp, registry.preprocessing_pipeline, registry.entity_masker
+    )
+
+    uncached: list[tuple[int, str]] = []
+    for i, (preprocessed_job_queue_error, error) in zip(untemplated_indices, processed_job_queue_errors):
+        if preprocessed_job_queue_error is None:
+            results[i]["error"] = error
+            continue
+
+        # The cache only holds the best prediction, so it cannot answer requests for several alternatives.
+        cached_prediction: Optional[tuple[str, float]] = None
+        if top_k <= 1:
+            cached_prediction = registry.prediction_cache.get(registry.model_version, preprocessed_job_queue_error)
+
+        if cached_prediction is not None:
+            results[i].update(prediction=cached_prediction[0], confidence=cached_prediction[1], alternatives=[cached_prediction], source="cache")
+        else:
+            uncached.append((i, preprocessed_job_queue_error))
+
+    top_predictions: list[list[tuple[str, float]]] = Helper.calculate_top_predictions(
+        [preprocessed_job_queue_error for _, preprocessed_job_queue_error in uncached],
+        registry.vectorizer, registry.label_responses, registry.job_queue_model, top_k
     )
 
-    helper.calculate_prediction(
-        preprocessed_job_queue_error, intents, vectorizer, job_queue_label_encoder, job_queue_model
+    for (i, _), predictions in zip(uncached, top_predictions):
+        results[i].update(prediction=predictions[0][0], confidence=predictions[0][1], alternatives=predictions, source="model")
+
+    # The best alternative is the top-1 prediction, so it is cached for every top_k.
+    registry.prediction_cache.put_many(
+        registry.model_version, [(preprocessed_job_queue_error, predictions[0]) for (_, preprocessed_job_queue_error), predictions in zip(uncached, top_predictions)]
     )
 
-    return helper.prediction, helper.confidence
+    return results
 
 if __name__ == "__main__":
     job_queue_error: str = "Die E-Mail-Adresse 'test.bobl@axians-infoma.com' ist ungültig."
@@ -0,0 +1,38 @@
+import sys
+import argparse
+
+sys.path.append('src')
+
+from src.model_registry import ModelRegistry
+from src.prediction_store import PredictionStore
+
+
+def prune_prediction_store(max_age_hours: float) -> int:
+    """
+    Delete the predictions of previous model versions from the persistent prediction store.
+    Run it after a deploy has finished; predictions of other versions younger than `max_age_hours` are kept.
+
+    Args:
+        max_age_hours (float): The age after which predictions of other model versions are deleted.
+
+    Returns:
+        int: The number of deleted predictions.
+    """
+    registry: ModelRegistry = ModelRegistry.get_instance()
+
+    if "prediction_store" not in registry.config['paths']:
+        print("No prediction store is configured.")
+        return 0
+
+    store: PredictionStore = PredictionStore(registry.get_path('prediction_store'))
+    deleted: int = store.prune(registry.model_version, max_age_hours * 3600)
+    print(f"Deleted {deleted} predictions of previous model versions.")
+
+    return deleted
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete the predictions of previous model versions from the prediction store.")
+    parser.add_argument("--max-age-hours", type=float, default=24, help="Keep predictions of other model versions younger than this.")
+    args = parser.parse_args()
+
+    prune_prediction_store(args.max_age_hours)
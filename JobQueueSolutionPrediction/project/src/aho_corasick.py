@@ -0,0 +1,71 @@
+from collections import deque
+from typing import Sequence
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton finding every occurrence of a fixed set of phrases in one pass over a sequence.
+
+    Phrases and the searched sequence are sequences of symbols, such as the texts of tokens, so a phrase
+    matches exactly where its symbols occur consecutively. States are stored in flat lists: the
+    transitions of every state, its failure link and the phrases ending in it as (length, label)
+    pairs, including those inherited through failure links.
+    """
+
+    def __init__(self, phrases: list[tuple[Sequence[str], str]]):
+        self.transitions: list[dict[str, int]] = [{}]
+        self.failures: list[int] = [0]
+        self.outputs: list[list[tuple[int, str]]] = [[]]
+
+        for phrase, label in phrases:
+            if not phrase:
+                continue
+
+            state: int = 0
+            for symbol in phrase:
+                next_state: int = self.transitions[state].get(symbol, -1)
+                if next_state == -1:
+                    next_state = len(self.transitions)
+                    self.transitions.append({})
+                    self.failures.append(0)
+                    self.outputs.append([])
+                    self.transitions[state][symbol] = next_state
+                state = next_state
+
+            if (len(phrase), label) not in self.outputs[state]:
+                self.outputs[state].append((len(phrase), label))
+
+        queue: deque[int] = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for symbol, next_state in self.transitions[state].items():
+                queue.append(next_state)
+
+                failure: int = self.failures[state]
+                while failure and symbol not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                self.failures[next_state] = self.transitions[failure].get(symbol, 0)
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.failures[next_state]]
+
+    def find_all(self, symbols: Sequence[str]) -> list[tuple[int, int, str]]:
+        """
+        Find every occurrence of every phrase, including overlapping ones.
+
+        Args:
+            symbols (Sequence[str]): The sequence to search.
+
+        Returns:
+            list[tuple[int, int, str]]: The start and end offsets in the sequence and the label of every occurrence.
+        """
+        matches: list[tuple[int, int, str]] = []
+        state: int = 0
+
+        for position, symbol in enumerate(symbols):
+            while state and symbol not in self.transitions[state]:
+                state = self.failures[state]
+            state = self.transitions[state].get(symbol, 0)
+
+            for length, label in self.outputs[state]:
+                matches.append((position + 1 - length, position + 1, label))
+
+        return matches
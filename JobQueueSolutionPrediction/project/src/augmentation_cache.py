@@ -0,0 +1,97 @@
+import os
+import json
+import pickle
+import hashlib
+
+
+class AugmentationCache:
+    """
+    Persistent cache of BERT augmentations, so retraining on mostly unchanged intents does not augment again.
+
+    Every entry is keyed by the hash of the seed utterance, the augmentation action, the model and the
+    random seed, and holds the augmented utterances generated for it so far, in generation order. A
+    request for n augmentations takes the first n; only the missing ones are generated and appended.
+    The augmentations are stored before the stopwords are restored, so changing the stopwords does not
+    invalidate them.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path: str = file_path
+        self.entries: dict[str, list[str]] = {}
+        self.used_keys: set[str] = set()
+
+        if os.path.exists(file_path):
+            with open(file_path, "rb") as cache_file:
+                self.entries = pickle.load(cache_file)
+
+    @staticmethod
+    def get_key(utterance: str, action: str, model_path: str, seed: int) -> str:
+        """
+        Compute the cache key of a seed utterance and its augmentation settings.
+
+        Args:
+            utterance (str): The seed utterance.
+            action (str): The augmentation action.
+            model_path (str): The augmentation model.
+            seed (int): The random seed.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the utterance and the settings.
+        """
+        description: str = json.dumps([utterance, action, model_path, seed], ensure_ascii=False)
+
+        return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+    def get(self, utterance: str, action: str, model_path: str, seed: int) -> list[str]:
+        """
+        Look up the augmentations generated for a seed utterance.
+
+        Args:
+            utterance (str): The seed utterance.
+            action (str): The augmentation action.
+            model_path (str): The augmentation model.
+            seed (int): The random seed.
+
+        Returns:
+            list[str]: The augmented utterances generated so far, possibly empty.
+        """
+        key: str = self.get_key(utterance, action, model_path, seed)
+        self.used_keys.add(key)
+
+        return self.entries.get(key, [])
+
+    def put(self, utterance: str, action: str, model_path: str, seed: int, augmented_utterances: list[str]) -> None:
+        """
+        Store all augmentations generated for a seed utterance.
+
+        Args:
+            utterance (str): The seed utterance.
+            action (str): The augmentation action.
+            model_path (str): The augmentation model.
+            seed (int): The random seed.
+            augmented_utterances (list[str]): The augmented utterances, in generation order.
+
+        Returns:
+            None
+        """
+        key: str = self.get_key(utterance, action, model_path, seed)
+        self.entries[key] = augmented_utterances
+        self.used_keys.add(key)
+
+    def save(self) -> None:
+        """
+        Save the entries used in this run, dropping the ones of seed utterances that are no longer augmented.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        directory: str = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        entries: dict[str, list[str]] = {key: self.entries[key] for key in self.used_keys if key in self.entries}
+        with open(self.file_path, "wb") as cache_file:
+            pickle.dump(entries, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
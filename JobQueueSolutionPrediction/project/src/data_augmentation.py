@@ -1,24 +1,154 @@
+import sys
 import math
+import random
+import threading
+import numpy as np
 import nlpaug.augmenter.word as naw
 from collections import Counter
+from typing import Optional
+
+sys.path.append('src')
+
+from src.augmentation_cache import AugmentationCache
 
 
 class DataAugmentation:
+    """
+    Augments the utterances of under-represented labels with a contextual BERT model (insert and substitute).
+
+    The augmenters are created on first use and cached per process, so the model is only loaded when a
+    label actually needs augmentation; nlpaug shares the loaded model between the insert and the
+    substitute augmenter. All requests of a run are sent through the model as one list, which nlpaug
+    splits into forward passes of `batch_size` texts. With an `AugmentationCache`, only the augmentations
+    missing from the cache are generated, with the random generators seeded by `seed`.
+    """
+
+    actions: tuple[str, ...] = ("insert", "substitute")
+
+    _augmenters: dict[tuple[str, str, int], naw.ContextualWordEmbsAug] = {}
+    _lock: threading.Lock = threading.Lock()
+
+    def __init__(
+        self,
+        model_path: str = "distilbert-base-german-cased",
+        batch_size: int = 32,
+        num_threads: int = 0,
+        seed: int = 42,
+        cache: Optional[AugmentationCache] = None
+    ):
+        self.model_path: str = model_path
+        self.batch_size: int = batch_size
+        self.num_threads: int = num_threads
+        self.seed: int = seed
+        self.cache: Optional[AugmentationCache] = cache
+
+    def get_augmenter(self, action: str) -> naw.ContextualWordEmbsAug:
+        """
+        Return the augmenter for an action, loading the model on the first request.
+
+        Args:
+            action (str): The augmentation action, `insert` or `substitute`.
+
+        Returns:
+            naw.ContextualWordEmbsAug: The augmenter.
+        """
+        key: tuple[str, str, int] = (self.model_path, action, self.batch_size)
+        augmenter: Optional[naw.ContextualWordEmbsAug] = DataAugmentation._augmenters.get(key)
 
-    def __init__(self):
-        self.aug_bert_insert = naw.ContextualWordEmbsAug(
-            model_path="distilbert-base-german-cased",
-            model_type="bert",
-            action="insert",
-            top_k=10
-        )
-
-        self.aug_bert_substitute = naw.ContextualWordEmbsAug(
-            model_path="distilbert-base-german-cased",
-            model_type="bert",
-            action="substitute",
-            top_k=10
-        )
+        if augmenter is None:
+            with DataAugmentation._lock:
+                augmenter = DataAugmentation._augmenters.get(key)
+                if augmenter is None:
+                    if self.num_threads > 0:
+                        import torch
+                        torch.set_num_threads(self.num_threads)
+
+                    augmenter = naw.ContextualWordEmbsAug(
+                        model_path=self.model_path,
+                        model_type="bert",
+                        action=action,
+                        top_k=10,
+                        batch_size=self.batch_size
+                    )
+                    DataAugmentation._augmenters[key] = augmenter
+
+        return augmenter
+
+    def seed_random(self) -> None:
+        """
+        Seed the random generators used by nlpaug and the model, so the generated augmentations are reproducible.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        import torch
+
+        random.seed(self.seed)
+        np.random.seed(self.seed)
+        torch.manual_seed(self.seed)
+
+    @staticmethod
+    def get_action_counts(no_utterances: int) -> dict[str, int]:
+        """
+        Split the number of utterances to be created between insertion and substitution.
+
+        Args:
+            no_utterances (int): The number of utterances that will be created.
+
+        Returns:
+            dict[str, int]: The number of utterances per action.
+        """
+        return {"insert": math.ceil(no_utterances/2), "substitute": math.floor(no_utterances/2)}
+
+    def augment(self, requests: list[tuple[str, str, int]]) -> list[list[str]]:
+        """
+        Creates the augmented utterances of many requests, with one batched model call per action.
+        Augmentations found in the cache are reused and only the missing ones are generated.
+
+        Args:
+            requests (list[tuple[str, str, int]]): The utterance, the action and the number of utterances of every request.
+
+        Returns:
+            list[list[str]]: The augmented utterances of every request, without replaced stopwords.
+        """
+        needed: dict[tuple[str, str], int] = {}
+        for utterance, action, no_utterances in requests:
+            needed[(utterance, action)] = max(needed.get((utterance, action), 0), no_utterances)
+
+        generated: dict[tuple[str, str], list[str]] = {
+            (utterance, action): list(self.cache.get(utterance, action, self.model_path, self.seed)) if self.cache is not None else []
+            for utterance, action in needed
+        }
+
+        for action in self.actions:
+            texts: list[str] = []
+            owners: list[tuple[str, str]] = []
+            for (utterance, request_action), no_utterances in needed.items():
+                no_missing: int = no_utterances - len(generated[(utterance, request_action)])
+                if request_action == action and no_missing > 0:
+                    texts.extend([utterance] * no_missing)
+                    owners.extend([(utterance, action)] * no_missing)
+
+            if not texts:
+                continue
+
+            print(f"Generating {len(texts)} augmentations by {action}.")
+            self.seed_random()
+            augmented_utterances: list[str] = self.get_augmenter(action).augment(texts)
+            if len(augmented_utterances) != len(texts):
+                raise ValueError(f"Augmentation by {action} returned {len(augmented_utterances)} utterances for {len(texts)} texts.")
+
+            for owner, augmented_utterance in zip(owners, augmented_utterances):
+                generated[owner].append(augmented_utterance)
+
+        if self.cache is not None:
+            for (utterance, action), augmented_utterances in generated.items():
+                self.cache.put(utterance, action, self.model_path, self.seed, augmented_utterances)
+
+        return [generated[(utterance, action)][:no_utterances] for utterance, action, no_utterances in requests]
 
     def get_augmented_utterances_labels(
         self,
@@ -30,6 +160,7 @@ class DataAugmentation:
     ) -> tuple[list[str], list[str]]:
         """
         Creates augmented utterances for each label so that each label will have exaclty n utterances.
+        The augmentations of all labels are created together in batches.
 
         Args:
             training_utterances (list[str]): The list of utterances.
@@ -41,25 +172,28 @@ class DataAugmentation:
         Returns:
             tuple[list[str], list[str]]: A tuple with the augmented utterances and labels.
         """ 
+        label_utterances: dict[str, list[str]] = {label: [] for label in label_counts}
+        for utterance, label in zip(training_utterances, training_labels):
+            label_utterances[label].append(utterance)
+
+        seeds: dict[str, tuple[str, int]] = {
+            label: (label_utterances[label][0], no_utterances - count)
+            for label, count in label_counts.items() if no_utterances > count
+        }
+        augmented: dict[str, list[str]] = dict(zip(seeds, self.get_augmented_utterances_batch(list(seeds.values()), aug_stopwords)))
+        print(f"Augmented {len(seeds)} of {len(label_counts)} labels.")
+
         aug_training_utterances: list[str] = []
         aug_training_labels: list[str] = []
         
-        for idx, (label, count) in enumerate(label_counts.items(), 1):
-            utterances: list[str] = self.get_utterances(label, training_labels, training_utterances)
-            aug_training_utterances.extend(utterances)
+        for label, count in label_counts.items():
+            aug_training_utterances.extend(label_utterances[label])
             
-            if (no_utterances > count):
-                no_utterances_to_be_augmented: int = no_utterances - count
-                augmented_utterances: list[str] = self.get_augmented_utterances(utterances[0], aug_stopwords, no_utterances_to_be_augmented)
-                augmented_labels: list[str] = [label] * no_utterances
-                aug_training_utterances.extend(augmented_utterances)    
+            if label in augmented:
+                aug_training_utterances.extend(augmented[label])
+                aug_training_labels.extend([label] * no_utterances)
             else:
-                augmented_labels: list[str] = [label] * count
-
-            aug_training_labels.extend(augmented_labels)
-
-            if idx % 10 == 0 or idx == len(label_counts):
-                print(f"Processed {idx} labels.")
+                aug_training_labels.extend([label] * count)
             
         return aug_training_utterances, aug_training_labels
 
@@ -84,27 +218,32 @@ class DataAugmentation:
 
         return utterances
 
-    def get_augmented_utterances(self, utterance: str, aug_stopwords: list[str], no_utterances: int) -> list[str]:
+    def get_augmented_utterances_batch(self, seeds: list[tuple[str, int]], aug_stopwords: list[str]) -> list[list[str]]:
         """
-        Creates n augmented utterances for the given utterance.
+        Creates n augmented utterances for each of the given utterances, half by insertion and half by substitution.
 
         Args:
-            utterance (str): The utterance that will be augmented.
+            seeds (list[tuple[str, int]]): The utterances that will be augmented with the number of utterances that will be created.
             aug_stopwords (list[str]): A list of words that will not be replaced in the augmented sentences.
-            no_utterances (int): The number of utterances that will be created.
 
         Returns:
-            list[str]: The new augmented utterances.
+            list[list[str]]: The new augmented utterances of every given utterance.
         """
-        aug_utterances_inserted: list[str] = []
-        aug_utterances_substitued: list[str] = []
-        
-        aug_utterances_inserted = self.aug_bert_insert.augment(utterance, n=math.ceil(no_utterances/2))
-        if (no_utterances > 1):
-            aug_utterances_substitued = self.aug_bert_substitute.augment(utterance, n=math.floor(no_utterances/2))
-            
-        aug_combined: list[str] = aug_utterances_inserted + aug_utterances_substitued
-        augmented_utterances: list[str] = self.replace_aug_stopwords(aug_combined, self.get_aug_stopwords(utterance, aug_stopwords))
+        requests: list[tuple[str, str, int]] = [
+            (utterance, action, count)
+            for utterance, no_utterances in seeds
+            for action, count in self.get_action_counts(no_utterances).items()
+        ]
+        results: list[list[str]] = self.augment(requests)
+
+        augmented_utterances: list[list[str]] = []
+        for i, (utterance, _) in enumerate(seeds):
+            aug_combined: list[str] = [
+                augmented_utterance
+                for result in results[i * len(self.actions):(i + 1) * len(self.actions)]
+                for augmented_utterance in result
+            ]
+            augmented_utterances.append(self.replace_aug_stopwords(aug_combined, self.get_aug_stopwords(utterance, aug_stopwords)))
 
         return augmented_utterances
 
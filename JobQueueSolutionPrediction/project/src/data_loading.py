@@ -1,12 +1,13 @@
-import dill
 import json
 import spacy
 import pickle
-import tensorflow as tf
-from typing import Callable
-from tensorflow import keras
+import numpy as np
+from typing import TYPE_CHECKING
 from sklearn.preprocessing import LabelEncoder
 
+if TYPE_CHECKING:
+    import tensorflow as tf
+
 
 class DataLoading:
 
@@ -168,21 +169,20 @@ class DataLoading:
         return contractions
 
     @staticmethod
-    def load_preprocessing_functions(file_path: str) -> dict[str, Callable[[str], str]]:
+    def load_preprocessing_spec(file_path: str) -> dict[str, any]:
         """
-        Loads preprocessing functions from a pickle file.
+        Loads the preprocessing spec from a JSON file.
         
         Args:
-            file_path (str): The path to the pickle file containing the preprocessing functions.
+            file_path (str): The path to the JSON file containing the preprocessing spec.
         
         Returns:
-            dict[str, Callable[[str], str]]: A dictionary mapping function names to preprocessing functions.
-                The functions take a string as input and return a processed string as output.
+            dict[str, any]: The spec with its version and the list of preprocessing steps and their parameters.
         """
-        with open(file_path, "rb") as preprocessing_file:
-            preprocessing_functions: dict[str, Callable[[str], str]] = dill.load(preprocessing_file)
+        with open(file_path, encoding="utf-8") as preprocessing_file:
+            preprocessing_spec: dict[str, any] = json.load(preprocessing_file)
         
-        return preprocessing_functions
+        return preprocessing_spec
 
     @staticmethod
     def load_job_queue_vectorizer(file_path: str) -> dict[dict[str, object], list[str]]:
@@ -202,18 +202,17 @@ class DataLoading:
         return job_queue_vectorizer
 
     @staticmethod
-    def load_vectorized_dataset(file_path: str) -> tf.Tensor:
+    def load_vectorized_dataset(file_path: str) -> np.ndarray:
         """
-        Loads the vectorized dataset from a pickle file.
+        Loads the vectorized dataset from a `.npy` file as a read-only memory-mapped array.
         
         Args:
-            file_path (str): The path to the pickle file containing the vectorized dataset.
+            file_path (str): The path to the `.npy` file containing the vectorized dataset.
         
         Returns:
-            tf.Tensor: The loaded vectorized dataset.
+            np.ndarray: The memory-mapped vectorized dataset.
         """
-        with open(file_path, "rb") as vectorized_dataset_file:
-            vectorized_dataset: tf.Tensor = pickle.load(vectorized_dataset_file)
+        vectorized_dataset: np.ndarray = np.load(file_path, mmap_mode="r")
 
         return vectorized_dataset
 
@@ -234,7 +233,7 @@ class DataLoading:
         return job_queue_label_encoder
 
     @staticmethod
-    def load_keras_model(file_path: str) -> tf.keras.models.Sequential:
+    def load_keras_model(file_path: str) -> "tf.keras.models.Sequential":
         """
         Load a Keras Sequential model from a H5 file.
 
@@ -244,6 +243,40 @@ class DataLoading:
         Returns:
             tf.keras.models.Sequential: The loaded Keras Sequential model.
         """
+        from tensorflow import keras
+
         job_queue_model: tf.keras.models.Sequential = keras.models.load_model(file_path)
         
         return job_queue_model
+
+    @staticmethod
+    def load_template_index(file_path: str) -> dict[str, str]:
+        """
+        Load the template index fingerprints from a JSON file.
+
+        Args:
+            file_path (str): The path to the JSON file.
+
+        Returns:
+            dict[str, str]: The mapping of fingerprints to tags.
+        """
+        with open(file_path, encoding="utf-8") as template_index_file:
+            fingerprints: dict[str, str] = json.load(template_index_file)
+
+        return fingerprints
+
+    @staticmethod
+    def load_lemma_table(file_path: str) -> tuple[list[str], list[str]]:
+        """
+        Load the lemma table from a JSON file.
+
+        Args:
+            file_path (str): The path to the JSON file.
+
+        Returns:
+            tuple[list[str], list[str]]: The sorted words and their lemmas.
+        """
+        with open(file_path, encoding="utf-8") as lemma_table_file:
+            lemma_table: dict[str, list[str]] = json.load(lemma_table_file)
+
+        return lemma_table["words"], lemma_table["lemmas"]
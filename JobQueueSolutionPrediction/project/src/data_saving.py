@@ -1,8 +1,9 @@
-import dill
+import os
+import json
 import spacy
 import pickle
+import numpy as np
 import tensorflow as tf
-from typing import Callable
 from sklearn.preprocessing import LabelEncoder
 
 
@@ -36,6 +37,23 @@ class DataSaving:
         """
         model.save(file_path)
 
+    @staticmethod
+    def get_vectorizer_state(vectorizer: object) -> dict[str, object]:
+        """
+        Get the configuration and weights of a vectorizer. The adapted vocabulary is stored in the
+        configuration, because Keras 3 no longer returns it from `get_weights`.
+
+        Args:
+            vectorizer (object): The adapted vectorizer.
+
+        Returns:
+            dict[str, object]: The vectorizer configuration and weights.
+        """
+        config: dict[str, object] = vectorizer.get_config()
+        config["vocabulary"] = vectorizer.get_vocabulary()
+
+        return {"config": config, "weights": vectorizer.get_weights()}
+
     @staticmethod
     def save_vectorizer(vectorizer: object, file_path: str) -> None:
         """
@@ -49,8 +67,7 @@ class DataSaving:
             None
         """
         with open(file_path, "wb") as vectorizer_file:
-            pickle.dump({"config": vectorizer.get_config(),
-                        "weights": vectorizer.get_weights()}, 
+            pickle.dump(DataSaving.get_vectorizer_state(vectorizer),
                         vectorizer_file, 
                         protocol=pickle.HIGHEST_PROTOCOL)
 
@@ -72,18 +89,65 @@ class DataSaving:
                         protocol=pickle.HIGHEST_PROTOCOL)
 
     @staticmethod
-    def save_preprocessing_functions(preprocessing_functions: dict[str, Callable[[str], str]], file_path: str) -> None:
+    def save_preprocessing_spec(preprocessing_spec: dict[str, any], file_path: str) -> None:
         """
-        Save a dictionary of preprocessing functions using dill and pickle.
+        Save the preprocessing spec to a JSON file.
 
         Args:
-            preprocessing_functions (dict[str, Callable[[str], str]]): The dictionary of preprocessing functions to be saved.
-            file_path (str): The path to save the pickle file.
+            preprocessing_spec (dict[str, any]): The spec with its version and the list of preprocessing steps and their parameters.
+            file_path (str): The path to save the JSON file.
+
+        Returns:
+            None
+        """
+        with open(file_path, "w", encoding="utf-8") as preprocessing_file:
+            json.dump(preprocessing_spec, preprocessing_file, ensure_ascii=False, indent=4)
+
+    @staticmethod
+    def save_vectorized_dataset(vectorized_dataset: np.ndarray, file_path: str) -> None:
+        """
+        Save the vectorized dataset to a `.npy` file that can be memory-mapped.
+
+        Args:
+            vectorized_dataset (np.ndarray): The vectorized dataset.
+            file_path (str): The path to save the `.npy` file.
+
+        Returns:
+            None
+        """
+        np.save(file_path, np.ascontiguousarray(vectorized_dataset), allow_pickle=False)
+
+    @staticmethod
+    def save_template_index(fingerprints: dict[str, str], file_path: str) -> None:
+        """
+        Save the template index fingerprints to a JSON file.
+
+        Args:
+            fingerprints (dict[str, str]): The mapping of fingerprints to tags.
+            file_path (str): The path to save the JSON file.
+
+        Returns:
+            None
+        """
+        directory: str = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(file_path, "w", encoding="utf-8") as template_index_file:
+            json.dump(fingerprints, template_index_file, ensure_ascii=False)
+
+    @staticmethod
+    def save_lemma_table(words: list[str], lemmas: list[str], file_path: str) -> None:
+        """
+        Save the lemma table to a JSON file.
+
+        Args:
+            words (list[str]): The sorted words.
+            lemmas (list[str]): The lemma of every word.
+            file_path (str): The path to save the JSON file.
 
         Returns:
             None
         """
-        with open(file_path, "wb") as preprocessing_file:
-            dill.dump(preprocessing_functions,
-                    preprocessing_file,
-                    protocol=pickle.HIGHEST_PROTOCOL)
\ No newline at end of file
+        with open(file_path, "w", encoding="utf-8") as lemma_table_file:
+            json.dump({"words": words, "lemmas": lemmas}, lemma_table_file, ensure_ascii=False)
@@ -0,0 +1,123 @@
+import re
+import numpy as np
+from typing import Optional
+
+
+class DictionaryVectorizer:
+    """
+    TensorFlow-free replacement for the Keras `TextVectorization` layer at inference time.
+
+    It reproduces the layer's `lower_and_strip_punctuation` standardization, whitespace split,
+    vocabulary lookup with a single OOV index, and padding/truncation to `output_sequence_length`.
+    """
+
+    mask_token: str = ""
+    oov_token: str = "[UNK]"
+    mask_index: int = 0
+    oov_index: int = 1
+    ascii_lower_table: dict[int, int] = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+    strip_pattern: re.Pattern = re.compile(r'[!"#$%&()\*\+,-\./:;<=>?@\[\\\]^_`{|}~\']')
+    split_pattern: re.Pattern = re.compile(r"[ \t\n\v\f\r]+")
+
+    def __init__(self, token_ids: dict[str, int], output_sequence_length: Optional[int]):
+        self.token_ids: dict[str, int] = token_ids
+        self.output_sequence_length: Optional[int] = output_sequence_length
+
+    @staticmethod
+    def from_saved(job_queue_vectorizer: dict[dict[str, object], list[str]]) -> "DictionaryVectorizer":
+        """
+        Build the vectorizer from the pickled configuration and weights of a `TextVectorization` layer.
+
+        Args:
+            job_queue_vectorizer (dict[dict[str, object], list[str]]): The saved vectorizer configuration and weights.
+
+        Returns:
+            DictionaryVectorizer: The dictionary-based vectorizer.
+        """
+        config: dict[str, object] = job_queue_vectorizer["config"]
+
+        if config.get("standardize") != "lower_and_strip_punctuation" or config.get("split") != "whitespace" \
+                or config.get("ngrams") is not None or config.get("output_mode") != "int":
+            raise ValueError("The dictionary vectorizer only supports the default integer TextVectorization configuration.")
+
+        return DictionaryVectorizer(
+            DictionaryVectorizer.get_token_ids(config, job_queue_vectorizer["weights"]),
+            config.get("output_sequence_length")
+        )
+
+    @staticmethod
+    def get_token_ids(config: dict[str, object], weights: list[np.ndarray]) -> dict[str, int]:
+        """
+        Extract the token to id mapping from the saved vocabulary.
+
+        Args:
+            config (dict[str, object]): The configuration of the `TextVectorization` layer.
+            weights (list[np.ndarray]): The weights of the `TextVectorization` layer.
+
+        Returns:
+            dict[str, int]: The id of every vocabulary token except the mask and OOV tokens.
+        """
+        vocabulary: Optional[list[object]] = config.get("vocabulary")
+        token_ids: Optional[list[int]] = None
+
+        if vocabulary is None or isinstance(vocabulary, str):
+            string_arrays: list[np.ndarray] = [np.asarray(weight) for weight in weights if np.asarray(weight).dtype.kind in "OSU"]
+            if not string_arrays:
+                raise ValueError("The saved vectorizer does not contain a vocabulary.")
+
+            vocabulary = list(string_arrays[0])
+            id_arrays: list[np.ndarray] = [
+                np.asarray(weight) for weight in weights
+                if np.asarray(weight).dtype.kind in "iu" and len(weight) == len(vocabulary)
+            ]
+            if id_arrays:
+                token_ids = [int(token_id) for token_id in id_arrays[0]]
+
+        tokens: list[str] = [token.decode("utf-8") if isinstance(token, bytes) else str(token) for token in vocabulary]
+
+        if token_ids is None:
+            if tokens[:2] != [DictionaryVectorizer.mask_token, DictionaryVectorizer.oov_token]:
+                tokens = [DictionaryVectorizer.mask_token, DictionaryVectorizer.oov_token] + tokens
+            token_ids = list(range(len(tokens)))
+
+        return {
+            token: token_id for token, token_id in zip(tokens, token_ids)
+            if token not in (DictionaryVectorizer.mask_token, DictionaryVectorizer.oov_token)
+        }
+
+    @staticmethod
+    def tokenize(text: str) -> list[str]:
+        """
+        Standardize and split a text the same way `TextVectorization` does.
+
+        Args:
+            text (str): The text to tokenize.
+
+        Returns:
+            list[str]: The tokens.
+        """
+        text = DictionaryVectorizer.strip_pattern.sub("", text.translate(DictionaryVectorizer.ascii_lower_table))
+
+        return [token for token in DictionaryVectorizer.split_pattern.split(text) if token]
+
+    def vectorize(self, texts: list[str]) -> np.ndarray:
+        """
+        Vectorize a batch of texts into a padded int32 array.
+
+        Args:
+            texts (list[str]): The texts to vectorize.
+
+        Returns:
+            np.ndarray: The token ids of shape (len(texts), output_sequence_length).
+        """
+        token_lists: list[list[int]] = [
+            [self.token_ids.get(token, self.oov_index) for token in self.tokenize(text)] for text in texts
+        ]
+        sequence_length: int = self.output_sequence_length or max((len(token_list) for token_list in token_lists), default=0)
+
+        vectorized: np.ndarray = np.zeros((len(texts), sequence_length), dtype=np.int32)
+        for row, token_list in enumerate(token_lists):
+            token_list = token_list[:sequence_length]
+            vectorized[row, :len(token_list)] = token_list
+
+        return vectorized
@@ -0,0 +1,81 @@
+import re
+import sys
+import spacy
+
+sys.path.append('src')
+
+from src.aho_corasick import AhoCorasick
+from src.named_entity_recognition import NamedEntityRecognition
+
+
+class EntityMasker:
+    """
+    Rule-based replacement of entities with the placeholders of the trained NER, using only the spaCy tokenizer.
+
+    It reproduces the Matcher and PhraseMatcher of `NamedEntityRecognition` without running them: the
+    regular expressions of `NamedEntityRecognition.token_patterns` are searched in every token text, and
+    the phrases of the entities file are found with an Aho-Corasick automaton over the token texts.
+    Overlapping matches are resolved with `NamedEntityRecognition.resolve_overlaps`, so the result is
+    the same as replacing the Matcher and PhraseMatcher matches.
+    """
+
+    def __init__(self, entities_dict: dict[str, list[str]], nlp: spacy.Language):
+        self.nlp: spacy.Language = nlp
+        self.token_patterns: list[tuple[str, re.Pattern]] = [
+            (label, re.compile(pattern)) for label, pattern in NamedEntityRecognition.token_patterns.items()
+        ]
+        self.automaton: AhoCorasick = AhoCorasick([
+            (tuple(token.text for token in doc), label)
+            for label, values in entities_dict.items()
+            for doc in nlp.tokenizer.pipe(values)
+        ])
+
+    def find_doc_entities(self, doc: spacy.tokens.Doc) -> list[tuple[int, int, str]]:
+        """
+        Find the non-overlapping entities of a tokenized text.
+
+        Args:
+            doc (spacy.tokens.Doc): The tokenized text.
+
+        Returns:
+            list[tuple[int, int, str]]: The start and end character offsets and the label of every entity, sorted by start.
+        """
+        token_texts: list[str] = [token.text for token in doc]
+
+        matches: list[tuple[int, int, str]] = [
+            (i, i + 1, label)
+            for i, token_text in enumerate(token_texts)
+            for label, pattern in self.token_patterns
+            if pattern.search(token_text)
+        ]
+        matches.extend(self.automaton.find_all(token_texts))
+
+        return NamedEntityRecognition.get_character_offsets(doc, NamedEntityRecognition.resolve_overlaps(matches))
+
+    def find_entities(self, texts: list[str], batch_size: int = 1000) -> list[list[tuple[int, int, str]]]:
+        """
+        Find the non-overlapping entities of every text.
+
+        Args:
+            texts (list[str]): The texts.
+            batch_size (int, optional): The number of texts per tokenizer batch. Defaults to 1000.
+
+        Returns:
+            list[list[tuple[int, int, str]]]: The start and end character offsets and the label of the entities of every text.
+        """
+        return [self.find_doc_entities(doc) for doc in self.nlp.tokenizer.pipe(texts, batch_size=batch_size)]
+
+    def mask(self, texts: list[str]) -> list[str]:
+        """
+        Replace the entities of every text with their placeholders.
+
+        Args:
+            texts (list[str]): The texts.
+
+        Returns:
+            list[str]: The texts with the entities replaced.
+        """
+        return [
+            NamedEntityRecognition.rewrite_entities(text, entities)
+            for text, entities in zip(texts, self.find_entities(texts))
+        ]
@@ -1,80 +1,263 @@
 import sys
 import spacy
 import numpy as np
-from typing import Callable
-import tensorflow as tf
+from typing import TYPE_CHECKING, Optional, Union
 from sklearn.preprocessing import LabelEncoder
 
 sys.path.append('src')
 
-from src.model_training import ModelTraining
-from src.text_preprocessing import TextPreprocessing
+from src.dictionary_vectorizer import DictionaryVectorizer
+from src.preprocessing_pipeline import PreprocessingPipeline
 from src.named_entity_recognition import NamedEntityRecognition
+from src.entity_masker import EntityMasker
+
+
+if TYPE_CHECKING:
+    import tensorflow as tf
+    from keras.layers import TextVectorization
 
 
 class Helper:
 
     def __init__(self):
         self.confidence: float
-        self.prediction_array: np.ndarray
         self.prediction: str
 
     @staticmethod
     def process_job_queue_error(
         job_queue_error: str, 
-        trained_nlp: spacy.Language, 
-        preprocessing_functions: dict[str, Callable[[str], str]], 
-        contractions: dict[str, str],
-        config: dict[str, any]
+        trained_nlp: Optional[spacy.Language], 
+        preprocessing_pipeline: PreprocessingPipeline,
+        entity_masker: Optional[EntityMasker] = None
     ) -> str:
         """
         Process the job queue error message by replacing characters, entities, and applying preprocessing.
 
         Args:
             job_queue_error (str): The job queue error message.
-            trained_nlp (spacy.Language): The trained NLP model.
-            preprocessing_functions (dict[str, Callable[[str], str]]): A dictionary of preprocessing functions.
-            contractions (dict[str, str]): A dictionary of contractions.
-            config (dict[str, any]): The configuration file.
+            trained_nlp (Optional[spacy.Language]): The trained NLP model, or None to only use the entity masker.
+            preprocessing_pipeline (PreprocessingPipeline): The compiled preprocessing pipeline.
+            entity_masker (Optional[EntityMasker], optional): The rule-based entity masker. Defaults to None.
 
         Returns:
             str: The preprocessed job queue error message.
         """
         job_queue_error = job_queue_error.replace("=", " ").replace("'", " ")
-        job_queue_error = NamedEntityRecognition.replace_entities([job_queue_error], trained_nlp)[0]
-        preprocessed_job_queue_error = TextPreprocessing.preprocess_utterance(job_queue_error, preprocessing_functions, contractions, config)
+        job_queue_error = Helper.replace_entities([job_queue_error], trained_nlp, entity_masker)[0]
+        preprocessed_job_queue_error = preprocessing_pipeline.process(job_queue_error)
         
         return preprocessed_job_queue_error
 
+    @staticmethod
+    def replace_entities(
+        job_queue_errors: list[str],
+        trained_nlp: Optional[spacy.Language],
+        entity_masker: Optional[EntityMasker]
+    ) -> list[str]:
+        """
+        Replace the entities of the job queue errors with their placeholders, using the rule-based entity masker,
+        the trained NER, or both, skipping whichever is None. With both, the trained NER runs on the original
+        messages as a fallback and only adds the entities that do not overlap the ones of the masker.
+
+        Args:
+            job_queue_errors (list[str]): The job queue error messages.
+            trained_nlp (Optional[spacy.Language]): The trained NLP model.
+            entity_masker (Optional[EntityMasker]): The rule-based entity masker.
+
+        Returns:
+            list[str]: The job queue error messages with the entities replaced.
+        """
+        if entity_masker is None:
+            return NamedEntityRecognition.replace_entities(job_queue_errors, trained_nlp) if trained_nlp is not None else job_queue_errors
+
+        entities: list[list[tuple[int, int, str]]] = entity_masker.find_entities(job_queue_errors)
+
+        if trained_nlp is not None:
+            for masked_entities, doc in zip(entities, trained_nlp.pipe(job_queue_errors)):
+                fallback_entities: list[tuple[int, int, str]] = [
+                    (e.start_char, e.end_char, e.label_) for e in doc.ents
+                    if all(e.end_char <= start_char or e.start_char >= end_char for start_char, end_char, _ in masked_entities)
+                ]
+                masked_entities.extend(fallback_entities)
+                masked_entities.sort()
+
+        return [
+            NamedEntityRecognition.rewrite_entities(job_queue_error, masked_entities)
+            for job_queue_error, masked_entities in zip(job_queue_errors, entities)
+        ]
+
     def calculate_prediction(
         self,
         preprocessed_job_queue_error: str,
         intents: dict[str, list[str]],
-        vectorizer: dict[dict[str, object], list[str]],
+        vectorizer: Union["TextVectorization", DictionaryVectorizer],
         job_queue_label_encoder: LabelEncoder,
-        job_queue_model: tf.keras.models.Sequential
+        job_queue_model: "tf.keras.models.Sequential"
     ) -> None:
         """
-        Print the prediction result for a preprocessed job queue error.
+        Calculate the prediction for a preprocessed job queue error and store it in `prediction` and `confidence`.
 
         Args:
             preprocessed_job_queue_error (str): The preprocessed job queue error.
             intents (dict[str, list[str]]): A dictionary containing intents and responses.
-            vectorizer (dict[dict[str, object], list[str]]): A dictionary containing the vectorizer configuration.
+            vectorizer (Union[TextVectorization, DictionaryVectorizer]): The vectorizer.
             job_queue_label_encoder (LabelEncoder): The label encoder for job queue errors.
             job_queue_model (tf.keras.models.Sequential): The trained Sequential model for job queue errors.
 
         Returns:
             None
         """
-        np.set_printoptions(suppress = True)
+        label_responses: list[str] = Helper.build_label_responses(intents, job_queue_label_encoder)
+
+        self.prediction, self.confidence = Helper.calculate_top_predictions(
+            [preprocessed_job_queue_error], vectorizer, label_responses, job_queue_model, 1
+        )[0][0]
+
+    @staticmethod
+    def process_job_queue_errors(
+        job_queue_errors: list[str],
+        trained_nlp: Optional[spacy.Language],
+        preprocessing_pipeline: PreprocessingPipeline,
+        entity_masker: Optional[EntityMasker] = None
+    ) -> list[tuple[Optional[str], Optional[str]]]:
+        """
+        Process a batch of job queue error messages by replacing characters, entities, and applying preprocessing.
+        The entities are replaced for the whole batch at once; if that fails, they are replaced message by message,
+        so only the messages that fail get an error.
+
+        Args:
+            job_queue_errors (list[str]): The job queue error messages.
+            trained_nlp (Optional[spacy.Language]): The trained NLP model, or None to only use the entity masker.
+            preprocessing_pipeline (PreprocessingPipeline): The compiled preprocessing pipeline.
+            entity_masker (Optional[EntityMasker], optional): The rule-based entity masker. Defaults to None.
+
+        Returns:
+            list[tuple[Optional[str], Optional[str]]]: For each message, the preprocessed message and None,
+                or None and the error raised while preprocessing it.
+        """
+        processed_job_queue_errors: list[tuple[Optional[str], Optional[str]]] = [
+            (None, None) if isinstance(job_queue_error, str) else (None, f"Error message must be a string, got {type(job_queue_error).__name__}.")
+            for job_queue_error in job_queue_errors
+        ]
+        valid_indices: list[int] = [i for i, job_queue_error in enumerate(job_queue_errors) if isinstance(job_queue_error, str)]
+
+        valid_job_queue_errors: list[str] = [job_queue_errors[i].replace("=", " ").replace("'", " ") for i in valid_indices]
+        try:
+            replaced_job_queue_errors: list[Optional[str]] = Helper.replace_entities(valid_job_queue_errors, trained_nlp, entity_masker)
+        except Exception:
+            replaced_job_queue_errors = [None] * len(valid_job_queue_errors)
+
+        for i, job_queue_error, replaced_job_queue_error in zip(valid_indices, valid_job_queue_errors, replaced_job_queue_errors):
+            try:
+                if replaced_job_queue_error is None:
+                    replaced_job_queue_error = Helper.replace_entities([job_queue_error], trained_nlp, entity_masker)[0]
+                preprocessed_job_queue_error: str = preprocessing_pipeline.process(replaced_job_queue_error)
+                processed_job_queue_errors[i] = (preprocessed_job_queue_error, None)
+            except Exception as e:
+                processed_job_queue_errors[i] = (None, str(e))
+
+        return processed_job_queue_errors
+
+    @staticmethod
+    def vectorize(
+        preprocessed_job_queue_errors: list[str],
+        vectorizer: Union["TextVectorization", DictionaryVectorizer]
+    ) -> Union["tf.Tensor", np.ndarray]:
+        """
+        Vectorize a batch of preprocessed job queue errors with either vectorizer implementation.
+
+        Args:
+            preprocessed_job_queue_errors (list[str]): The preprocessed job queue errors.
+            vectorizer (Union[TextVectorization, DictionaryVectorizer]): The vectorizer.
+
+        Returns:
+            Union[tf.Tensor, np.ndarray]: The vectorized job queue errors.
+        """
+        if isinstance(vectorizer, DictionaryVectorizer):
+            return vectorizer.vectorize(preprocessed_job_queue_errors)
+
+        from src.model_training import ModelTraining
+
+        return ModelTraining.vectorize_text(preprocessed_job_queue_errors, vectorizer)
+
+    @staticmethod
+    def build_label_responses(intents: dict[str, list[str]], job_queue_label_encoder: LabelEncoder) -> list[str]:
+        """
+        Build the index mapping each encoded label to its response.
+
+        Args:
+            intents (dict[str, list[str]]): A dictionary containing intents and responses.
+            job_queue_label_encoder (LabelEncoder): The label encoder for job queue errors.
+
+        Returns:
+            list[str]: The response of each label, indexed by the encoded label.
+        """
+        responses: dict[str, str] = {intent["tag"]: intent["response"] for intent in intents["intents"]}
+
+        return [responses.get(tag) for tag in job_queue_label_encoder.classes_]
+
+    @staticmethod
+    def calculate_top_predictions(
+        preprocessed_job_queue_errors: list[str],
+        vectorizer: dict[dict[str, object], list[str]],
+        label_responses: list[str],
+        job_queue_model: "tf.keras.models.Sequential",
+        top_k: int
+    ) -> list[list[tuple[str, float]]]:
+        """
+        Calculate the k best predictions for a batch of preprocessed job queue errors with a single model forward pass.
+
+        Args:
+            preprocessed_job_queue_errors (list[str]): The preprocessed job queue errors.
+            vectorizer (dict[dict[str, object], list[str]]): A dictionary containing the vectorizer configuration.
+            label_responses (list[str]): The response of each label, indexed by the encoded label.
+            job_queue_model (tf.keras.models.Sequential): The trained Sequential model for job queue errors.
+            top_k (int): The number of predictions to return for each job queue error.
+
+        Returns:
+            list[list[tuple[str, float]]]: The predictions and confidences for each job queue error, best first.
+        """
+        if not preprocessed_job_queue_errors:
+            return []
+
+        vectorized_preprocessed_job_queue_errors = Helper.vectorize(preprocessed_job_queue_errors, vectorizer)
+        prediction_array: np.ndarray = job_queue_model.predict(vectorized_preprocessed_job_queue_errors, verbose=0)
+
+        top_k = max(1, min(top_k, prediction_array.shape[1]))
+        if top_k == 1:
+            top_indices: np.ndarray = np.argmax(prediction_array, axis=1)[:, np.newaxis]
+        else:
+            top_indices = np.argpartition(-prediction_array, top_k - 1, axis=1)[:, :top_k]
+            order: np.ndarray = np.argsort(-np.take_along_axis(prediction_array, top_indices, axis=1), axis=1)
+            top_indices = np.take_along_axis(top_indices, order, axis=1)
+        top_confidences: np.ndarray = np.take_along_axis(prediction_array, top_indices, axis=1)
+
+        return [
+            [(label_responses[index], float(confidence)) for index, confidence in zip(indices, confidences)]
+            for indices, confidences in zip(top_indices, top_confidences)
+        ]
+
+    @staticmethod
+    def calculate_predictions(
+        preprocessed_job_queue_errors: list[str],
+        vectorizer: dict[dict[str, object], list[str]],
+        label_responses: list[str],
+        job_queue_model: "tf.keras.models.Sequential"
+    ) -> list[tuple[str, float]]:
+        """
+        Calculate the predictions for a batch of preprocessed job queue errors with a single model forward pass.
 
-        vectorized_preprocessed_job_queue_error = ModelTraining.vectorize_text(preprocessed_job_queue_error, vectorizer)
-        self.prediction_array = job_queue_model.predict(vectorized_preprocessed_job_queue_error)
-        prediction_index: int = np.argmax(self.prediction_array)
-        tag: np.ndarray = job_queue_label_encoder.inverse_transform([prediction_index])
-        self.confidence = np.amax(self.prediction_array)
+        Args:
+            preprocessed_job_queue_errors (list[str]): The preprocessed job queue errors.
+            vectorizer (dict[dict[str, object], list[str]]): A dictionary containing the vectorizer configuration.
+            label_responses (list[str]): The response of each label, indexed by the encoded label.
+            job_queue_model (tf.keras.models.Sequential): The trained Sequential model for job queue errors.
+
+        Returns:
+            list[tuple[str, float]]: The prediction and confidence for each job queue error.
+        """
+        top_predictions: list[list[tuple[str, float]]] = Helper.calculate_top_predictions(
+            preprocessed_job_queue_errors, vectorizer, label_responses, job_queue_model, 1
+        )
 
-        for i in intents["intents"]:
-            if i["tag"] == tag:
-                self.prediction = i["response"]
\ No newline at end of file
+        return [predictions[0] for predictions in top_predictions]
\ No newline at end of file
@@ -0,0 +1,110 @@
+import sys
+from bisect import bisect_left
+from collections import Counter
+from typing import Optional
+
+sys.path.append('src')
+
+from src.text_preprocessing import TextPreprocessing
+
+
+class LemmaTable:
+    """
+    Word to lemma table covering the training vocabulary, used to lemmatize without running spaCy.
+
+    The table is built from the spaCy lemmas of the training utterances. spaCy lemmatizes in context,
+    so only whitespace-separated words that got the same lemma in every training utterance are kept;
+    words with several lemmas are left out. It is stored as two parallel lists sorted by word and
+    searched with binary search; the lemmas are interned. A text with a word missing from the table, or
+    whose words are not separated by single spaces, is lemmatized as a whole with spaCy, one `nlp.pipe`
+    call per batch, so every training utterance gets exactly the lemmas it got at training time.
+    """
+
+    def __init__(self, words: list[str], lemmas: list[str]):
+        self.words: list[str] = words
+        self.lemmas: list[str] = [sys.intern(lemma) for lemma in lemmas]
+
+    @staticmethod
+    def from_word_lemmas(word_lemmas: list[list[tuple[str, str]]]) -> "LemmaTable":
+        """
+        Build the table from the words and lemmas recorded by `TextPreprocessing.lemmatize_texts`,
+        leaving out the words whose lemma depends on the context.
+
+        Args:
+            word_lemmas (list[list[tuple[str, str]]]): The words of every text with their lemmas.
+
+        Returns:
+            LemmaTable: The table.
+        """
+        lemma_counts: dict[str, Counter] = {}
+        for text_word_lemmas in word_lemmas:
+            for word, lemma in text_word_lemmas:
+                lemma_counts.setdefault(word, Counter())[lemma] += 1
+
+        words: list[str] = sorted(word for word, counts in lemma_counts.items() if len(counts) == 1)
+
+        return LemmaTable(words, [next(iter(lemma_counts[word])) for word in words])
+
+    def get(self, word: str) -> Optional[str]:
+        """
+        Look up the lemma of a word.
+
+        Args:
+            word (str): The word.
+
+        Returns:
+            Optional[str]: The lemma, or None if the word is not in the table.
+        """
+        i: int = bisect_left(self.words, word)
+
+        if i < len(self.words) and self.words[i] == word:
+            return self.lemmas[i]
+
+        return None
+
+    def lemmatize_texts(self, texts: list[str], spacy_trained_pipeline: str, batch_size: int = 256, n_process: int = 1) -> list[str]:
+        """
+        Lemmatize a batch of texts word by word, running spaCy once on all texts with a word missing from the table.
+
+        Args:
+            texts (list[str]): The texts to be lemmatized.
+            spacy_trained_pipeline (str): The trained pipeline from spacy that is used for texts with missing words.
+            batch_size (int, optional): The number of texts per spaCy batch. Defaults to 256.
+            n_process (int, optional): The number of spaCy processes. Defaults to 1.
+
+        Returns:
+            list[str]: The lemmatized texts.
+        """
+        lemmatized_texts: list[Optional[str]] = []
+        missing_indices: list[int] = []
+
+        for i, text in enumerate(texts):
+            words: list[str] = text.split(" ")
+            lemmas: list[Optional[str]] = [self.get(word) for word in words] if all(words) else [None]
+            if None in lemmas:
+                lemmatized_texts.append(None)
+                missing_indices.append(i)
+            else:
+                lemmatized_texts.append(" ".join(lemmas))
+
+        if missing_indices:
+            spacy_lemmatized_texts: list[str] = TextPreprocessing.lemmatize_texts(
+                [texts[i] for i in missing_indices], spacy_trained_pipeline, batch_size, n_process
+            )
+            for i, lemmatized_text in zip(missing_indices, spacy_lemmatized_texts):
+                lemmatized_texts[i] = lemmatized_text
+
+        return lemmatized_texts
+
+    def lemmatize_text(self, text: str, spacy_trained_pipeline: str) -> str:
+        """
+        Lemmatize a single text word by word, running spaCy on the whole text if a word is missing from the table.
+
+        Args:
+            text (str): The text to be lemmatized.
+            spacy_trained_pipeline (str): The trained pipeline from spacy that is used if a word is missing.
+
+        Returns:
+            str: The lemmatized text.
+        """
+        return self.lemmatize_texts([text], spacy_trained_pipeline)[0]
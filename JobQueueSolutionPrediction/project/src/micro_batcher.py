@@ -0,0 +1,155 @@
+import time
+import queue
+import threading
+from typing import Callable, Optional
+from concurrent.futures import Future, TimeoutError
+
+
+class MicroBatcher:
+    """
+    Collects preprocessed job queue errors submitted by concurrent requests into batches.
+
+    A background thread waits for the first pending item, keeps collecting items until the
+    batch window has elapsed or the batch is full, runs one batched prediction and resolves
+    the future of every request in the batch. Requests stop waiting after the batch window
+    plus `request_timeout_ms`. `close` stops accepting requests, lets the thread finish the
+    pending ones and stops it.
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[list[str]], list[tuple[str, float]]],
+        batch_window_ms: float,
+        max_batch_size: int,
+        request_timeout_ms: float = 5000
+    ):
+        self.predict_batch: Callable[[list[str]], list[tuple[str, float]]] = predict_batch
+        self.batch_window: float = batch_window_ms / 1000
+        self.max_batch_size: int = max_batch_size
+        self.result_timeout: float = (batch_window_ms + request_timeout_ms) / 1000
+        self.pending: queue.Queue = queue.Queue()
+        self.closed: bool = False
+        self.lock: threading.Lock = threading.Lock()
+        self.worker: threading.Thread = threading.Thread(target=self.run, name="micro-batcher", daemon=True)
+        self.worker.start()
+
+    def submit(self, preprocessed_job_queue_error: str) -> Future:
+        """
+        Queue a preprocessed job queue error for the next batch.
+
+        Args:
+            preprocessed_job_queue_error (str): The preprocessed job queue error.
+
+        Returns:
+            Future: A future resolving to the prediction and confidence.
+
+        Raises:
+            RuntimeError: If the micro-batcher was closed.
+        """
+        future: Future = Future()
+
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("The micro-batcher is closed.")
+            self.pending.put((preprocessed_job_queue_error, future))
+
+        return future
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting requests and wait for the background thread to finish the pending ones.
+
+        Args:
+            timeout (Optional[float]): The number of seconds to wait for the thread. Defaults to waiting until it finished.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            if not self.closed:
+                self.closed = True
+                self.pending.put(None)
+
+        self.worker.join(timeout)
+
+    def predict(self, preprocessed_job_queue_error: str) -> tuple[str, float]:
+        """
+        Predict a preprocessed job queue error in the next batch and wait for the result.
+
+        Args:
+            preprocessed_job_queue_error (str): The preprocessed job queue error.
+
+        Returns:
+            tuple[str, float]: The prediction and confidence.
+
+        Raises:
+            TimeoutError: If the batch did not finish within the batch window plus the request timeout.
+        """
+        future: Future = self.submit(preprocessed_job_queue_error)
+
+        try:
+            return future.result(timeout=self.result_timeout)
+        except TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"The prediction did not finish within {self.result_timeout:.3f}s.")
+
+    def collect_batch(self) -> list[tuple[str, Future]]:
+        """
+        Block until an item is pending, then collect items until the window elapses, the batch is full
+        or the micro-batcher is closed.
+
+        Args:
+            None
+
+        Returns:
+            list[Optional[tuple[str, Future]]]: The collected items with their futures, ending with None if the micro-batcher was closed.
+        """
+        batch: list[Optional[tuple[str, Future]]] = [self.pending.get()]
+        deadline: float = time.perf_counter() + self.batch_window
+
+        while batch[-1] is not None and len(batch) < self.max_batch_size:
+            remaining: float = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def run(self) -> None:
+        """
+        Process batches until the micro-batcher is closed.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        stopping: bool = False
+
+        while not stopping:
+            collected: list[Optional[tuple[str, Future]]] = self.collect_batch()
+            stopping = collected[-1] is None
+            batch: list[tuple[str, Future]] = [
+                (text, future) for text, future in filter(None, collected) if future.set_running_or_notify_cancel()
+            ]
+
+            if not batch:
+                continue
+
+            texts: list[str] = [text for text, _ in batch]
+            futures: list[Future] = [future for _, future in batch]
+
+            try:
+                predictions: list[tuple[str, float]] = self.predict_batch(texts)
+                if len(predictions) != len(futures):
+                    raise ValueError(f"The batch returned {len(predictions)} predictions for {len(futures)} requests.")
+
+                for future, prediction in zip(futures, predictions):
+                    future.set_result(prediction)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
@@ -0,0 +1,339 @@
+import os
+import sys
+import time
+import hashlib
+import spacy
+import threading
+from typing import TYPE_CHECKING, Callable, Optional, Union
+from sklearn.preprocessing import LabelEncoder
+
+sys.path.append('src')
+
+from src.data_loading import DataLoading
+from src.prediction_cache import PredictionCache
+from src.prediction_store import PredictionStore
+from src.template_index import TemplateIndex
+from src.helper import Helper
+from src.numpy_model import NumpyModel
+from src.tflite_model import TFLiteModel
+from src.dictionary_vectorizer import DictionaryVectorizer
+from src.spelling_correction import SpellingCorrector
+from src.preprocessing_pipeline import PreprocessingPipeline
+from src.entity_masker import EntityMasker
+from src.spacy_pipelines import SpacyPipelines
+
+if TYPE_CHECKING:
+    import tensorflow as tf
+    from keras.layers import TextVectorization
+
+
+class ModelRegistry:
+    """
+    Process-wide registry holding every artifact needed for prediction.
+
+    The artifacts are loaded and validated once per process, either eagerly at
+    startup or lazily on the first call to `get_instance`, and are then shared by
+    all requests.
+    """
+
+    _instance: Optional["ModelRegistry"] = None
+    vectorizer_builders: dict[str, Callable[[dict[dict[str, object], list[str]]], object]] = {
+        "keras": lambda job_queue_vectorizer: ModelRegistry.build_vectorizer(job_queue_vectorizer),
+        "dictionary": DictionaryVectorizer.from_saved
+    }
+    model_keys: dict[str, str] = {
+        "keras": "model",
+        "numpy": "numpy_model",
+        "tflite_float16": "tflite_float16_model",
+        "tflite_int8": "tflite_int8_model"
+    }
+    model_loaders: dict[str, Callable[[str], object]] = {
+        "keras": DataLoading.load_keras_model,
+        "numpy": NumpyModel.load,
+        "tflite_float16": TFLiteModel.load,
+        "tflite_int8": TFLiteModel.load
+    }
+    _lock: threading.Lock = threading.Lock()
+
+    def __init__(self, script_dir: str):
+        self.script_dir: str = script_dir
+        self.load_timings: dict[str, float] = {}
+        self.config: dict[str, any]
+        self.intents: dict[str, list[str]]
+        self.responses: dict[str, str]
+        self.label_responses: list[str]
+        self.template_index: TemplateIndex
+        self.spelling_corrector: SpellingCorrector
+        self.trained_nlp: Optional[spacy.Language]
+        self.entity_masker: Optional[EntityMasker]
+        self.contractions: dict[str, str]
+        self.preprocessing_spec: dict[str, any]
+        self.preprocessing_pipeline: PreprocessingPipeline
+        self.job_queue_vectorizer: dict[dict[str, object], list[str]]
+        self.vectorizer: Union["TextVectorization", DictionaryVectorizer]
+        self.job_queue_label_encoder: LabelEncoder
+        self.job_queue_model: Union["tf.keras.models.Sequential", NumpyModel, TFLiteModel]
+        self.model_version: str
+        self.prediction_cache: PredictionCache
+
+    @classmethod
+    def get_instance(cls, script_dir: Optional[str] = None) -> "ModelRegistry":
+        """
+        Return the process-wide registry, loading all artifacts on the first call.
+
+        Args:
+            script_dir (Optional[str]): The project directory containing `config.json`. Defaults to the parent of `src`.
+
+        Returns:
+            ModelRegistry: The loaded registry.
+        """
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    if script_dir is None:
+                        script_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+                    registry = cls(script_dir)
+                    registry.load()
+                    cls._instance = registry
+
+        return cls._instance
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Drop the process-wide registry so that the next `get_instance` call reloads all artifacts.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        with cls._lock:
+            cls._instance = None
+
+    def get_path(self, key: str) -> str:
+        """
+        Resolve an artifact path from the configuration relative to the script directory.
+
+        Args:
+            key (str): The key of the path in the `paths` section of the configuration.
+
+        Returns:
+            str: The absolute path of the artifact.
+        """
+        return os.path.join(self.script_dir, self.config['paths'][key])
+
+    def _timed_load(self, name: str, loader: Callable[..., object], *args: object) -> object:
+        """
+        Run a loader and record how long it took.
+
+        Args:
+            name (str): The name of the artifact.
+            loader (Callable[..., object]): The function that loads the artifact.
+            *args (object): The arguments passed to the loader.
+
+        Returns:
+            object: The loaded artifact.
+        """
+        start: float = time.perf_counter()
+        artifact: object = loader(*args)
+        self.load_timings[name] = time.perf_counter() - start
+
+        return artifact
+
+    def load(self) -> None:
+        """
+        Load every prediction artifact, build the vectorizer and validate the result.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.config = self._timed_load("config", DataLoading.load_config, os.path.join(self.script_dir, 'config.json'))
+
+        backend: str = self.config.get("serving", {}).get("backend", "keras")
+        model_key: str = self.model_keys.get(backend)
+        if model_key is None:
+            raise ValueError(f"Unknown serving backend: {backend}")
+
+        vectorizer_type: str = self.config.get("serving", {}).get("vectorizer", "dictionary")
+        if vectorizer_type not in self.vectorizer_builders:
+            raise ValueError(f"Unknown serving vectorizer: {vectorizer_type}")
+
+        # Only the Keras backend and vectorizer need TensorFlow; the others must not import it.
+        if backend == "keras" or vectorizer_type == "keras":
+            import tensorflow as tf
+
+            tf.random.set_seed(42)
+
+        entity_masking: bool = self.config.get("serving", {}).get("entity_masking", False)
+        ner_fallback: bool = self.config.get("serving", {}).get("ner_fallback", True)
+        uses_trained_nlp: bool = not entity_masking or ner_fallback
+
+        artifact_keys: list[str] = ["intents", "contractions", "preprocessing_spec", "vectorizer", "label_encoder", model_key]
+        artifact_keys += ["nlp"] if uses_trained_nlp else []
+        artifact_keys += ["entities"] if entity_masking else []
+        missing: list[str] = [self.get_path(key) for key in artifact_keys if not os.path.exists(self.get_path(key))]
+        if missing:
+            raise FileNotFoundError(f"Missing prediction artifacts: {', '.join(missing)}")
+
+        self.intents = self._timed_load("intents", DataLoading.load_intents, self.get_path('intents'))
+        self.trained_nlp = self._timed_load("nlp", DataLoading.load_trained_nlp, self.get_path('nlp')) if uses_trained_nlp else None
+        self.entity_masker = self._timed_load("entity_masker", self.load_entity_masker) if entity_masking else None
+        self.contractions = self._timed_load("contractions", DataLoading.load_contractions, self.get_path('contractions'))
+        self.preprocessing_spec = self._timed_load(
+            "preprocessing_spec", DataLoading.load_preprocessing_spec, self.get_path('preprocessing_spec')
+        )
+        self.job_queue_vectorizer = self._timed_load("vectorizer", DataLoading.load_job_queue_vectorizer, self.get_path('vectorizer'))
+        self.job_queue_label_encoder = self._timed_load("label_encoder", DataLoading.load_label_encoder, self.get_path('label_encoder'))
+        self.job_queue_model = self._timed_load("model", self.model_loaders[backend], self.get_path(model_key))
+        self.vectorizer = self._timed_load("vectorizer_layer", self.vectorizer_builders[vectorizer_type], self.job_queue_vectorizer)
+        self.template_index = self._timed_load("template_index", self.load_template_index)
+        self.spelling_corrector = self._timed_load("spelling_corrector", self.load_spelling_corrector)
+        self.preprocessing_pipeline = self._timed_load(
+            "preprocessing_pipeline", PreprocessingPipeline.compile, self.preprocessing_spec, self.contractions, self.script_dir
+        )
+        self.responses = {intent["tag"]: intent["response"] for intent in self.intents["intents"]}
+
+        self.validate()
+
+        self.label_responses = Helper.build_label_responses(self.intents, self.job_queue_label_encoder)
+
+        self.model_version = self._timed_load("model_version", self.hash_artifacts, [model_key, "vectorizer", "label_encoder", "intents"])
+        self.prediction_cache = self._timed_load("prediction_cache", self.build_prediction_cache)
+
+        for name, seconds in self.load_timings.items():
+            print(f"Loaded {name} in {seconds:.3f}s.")
+
+    def hash_artifacts(self, keys: list[str]) -> str:
+        """
+        Compute a content hash over the given artifact files.
+
+        Args:
+            keys (list[str]): The keys of the artifact paths in the `paths` section of the configuration.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the artifacts.
+        """
+        digest = hashlib.sha256()
+
+        for key in keys:
+            with open(self.get_path(key), "rb") as artifact_file:
+                for chunk in iter(lambda: artifact_file.read(1 << 20), b""):
+                    digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def build_prediction_cache(self) -> PredictionCache:
+        """
+        Build the prediction cache, backed by the persistent prediction store when one is configured.
+
+        Args:
+            None
+
+        Returns:
+            PredictionCache: The prediction cache.
+        """
+        serving: dict[str, float] = self.config.get("serving", {})
+        store: Optional[PredictionStore] = None
+
+        if "prediction_store" in self.config['paths']:
+            store = PredictionStore(self.get_path('prediction_store'))
+
+        return PredictionCache(serving.get("cache_max_size", 10000), serving.get("cache_ttl_seconds", 3600), store)
+
+    def load_template_index(self) -> TemplateIndex:
+        """
+        Load the template index, falling back to an empty index when none was saved during training.
+
+        Args:
+            None
+
+        Returns:
+            TemplateIndex: The template index.
+        """
+        template_index_path: Optional[str] = self.get_path('template_index') if "template_index" in self.config['paths'] else None
+
+        if template_index_path is None or not os.path.exists(template_index_path):
+            return TemplateIndex({})
+
+        return TemplateIndex(DataLoading.load_template_index(template_index_path))
+
+    def load_entity_masker(self) -> EntityMasker:
+        """
+        Build the rule-based entity masker from the entities file and the tokenizer of the spaCy pipeline.
+
+        Args:
+            None
+
+        Returns:
+            EntityMasker: The entity masker.
+        """
+        return EntityMasker(
+            DataLoading.load_entities(self.get_path('entities')), SpacyPipelines.get_tokenizer(self.config['spacy']['trained_pipeline'])
+        )
+
+    def load_spelling_corrector(self) -> SpellingCorrector:
+        """
+        Build the shared spelling corrector and load the corrections memoized during training.
+
+        Args:
+            None
+
+        Returns:
+            SpellingCorrector: The shared spelling corrector.
+        """
+        index_path: Optional[str] = self.get_path('spelling_index') if "spelling_index" in self.config['paths'] else None
+        SpellingCorrector.configure(self.config.get('spelling', {}), index_path)
+        spelling_corrector: SpellingCorrector = SpellingCorrector.get_instance(self.get_path('spelling'))
+
+        if "spelling_memo" in self.config['paths']:
+            spelling_corrector.load_memo(self.get_path('spelling_memo'))
+
+        return spelling_corrector
+
+    @staticmethod
+    def build_vectorizer(job_queue_vectorizer: dict[dict[str, object], list[str]]) -> "TextVectorization":
+        """
+        Rebuild the TextVectorization layer from its saved configuration and weights.
+
+        Args:
+            job_queue_vectorizer (dict[dict[str, object], list[str]]): The saved vectorizer configuration and weights.
+
+        Returns:
+            TextVectorization: The rebuilt TextVectorization layer.
+        """
+        from keras.layers import TextVectorization
+
+        vectorizer: TextVectorization = TextVectorization.from_config(job_queue_vectorizer["config"])
+        vectorizer.set_weights(job_queue_vectorizer["weights"])
+
+        return vectorizer
+
+    def validate(self) -> None:
+        """
+        Check that the loaded artifacts are consistent with each other.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        tags: set[str] = {intent["tag"] for intent in self.intents["intents"]}
+        unknown_templates: list[str] = [tag for tag in set(self.template_index.fingerprints.values()) if tag not in tags]
+        if unknown_templates:
+            raise ValueError(f"Template index contains tags without an intent: {', '.join(unknown_templates)}")
+
+        unknown_tags: list[str] = [str(label) for label in self.job_queue_label_encoder.classes_ if label not in tags]
+        if unknown_tags:
+            raise ValueError(f"Label encoder contains tags without an intent: {', '.join(unknown_tags)}")
+
+        num_outputs: int = self.job_queue_model.output_shape[-1]
+        num_labels: int = len(self.job_queue_label_encoder.classes_)
+        if num_outputs != num_labels:
+            raise ValueError(f"Model has {num_outputs} outputs but the label encoder has {num_labels} labels.")
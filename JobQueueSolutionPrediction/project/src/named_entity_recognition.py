@@ -1,15 +1,25 @@
 import sys
+import random
 import spacy
-from typing import Union
+from typing import Iterator, Optional, Union
 from spacy import displacy
 from spacy.matcher import Matcher, PhraseMatcher
+from thinc.api import Optimizer
 
 sys.path.append('src')
 
 from src.data_loading import DataLoading
+from src.spacy_pipelines import SpacyPipelines
 
 
 class NamedEntityRecognition:
+
+    # Single-token regular expressions of the Matcher, in the order their labels win when they match the same token
+    token_patterns: dict[str, str] = {
+        "Email": r"[a-z0-9\.\-+_]+ *@[a-z0-9\.\-+_]+",
+        "Benutzer": r"^FUM-GLOBAL\\[A-Za-z]+(?:\.[A-Za-z]+)?$",
+        "Nummer": r"\d+"
+    }
     
     @staticmethod
     def create_matcher(nlp: spacy.Language) -> Matcher:
@@ -24,20 +34,75 @@ class NamedEntityRecognition:
         """
         matcher: Matcher = Matcher(nlp.vocab)
 
-        pattern_numbers: list[dict[str, dict[str, str]]] = [{"TEXT": {"REGEX": r"\d+"}}]
-        pattern_users: list[dict[str, dict[str, str]]] = [{"TEXT": {"REGEX": "^FUM-GLOBAL\\\\[A-Za-z]+(?:\\.[A-Za-z]+)?$"}}]
-        pattern_emails: list[dict[str, dict[str, str]]] = [{"TEXT": {"REGEX": "[a-z0-9\.\-+_]+ *@[a-z0-9\.\-+_]+"}}]
-
-        matcher.add("Nummer", [pattern_numbers])
-        matcher.add("Benutzer", [pattern_users])
-        matcher.add("Email", [pattern_emails])
+        for label, pattern in NamedEntityRecognition.token_patterns.items():
+            matcher.add(label, [[{"TEXT": {"REGEX": pattern}}]])
 
         return matcher
 
+    @staticmethod
+    def get_label_rank(label: str) -> tuple[int, Union[int, str]]:
+        """
+        Return the rank deciding which label wins when several labels match the same tokens.
+
+        Args:
+            label (str): The entity label.
+
+        Returns:
+            tuple[int, Union[int, str]]: The rank; Matcher labels in the order of `token_patterns` come first, then phrase labels alphabetically.
+        """
+        labels: list[str] = list(NamedEntityRecognition.token_patterns)
+
+        return (0, labels.index(label)) if label in labels else (1, label)
+
+    @staticmethod
+    def resolve_overlaps(matches: list[tuple[int, int, str]]) -> list[tuple[int, int, str]]:
+        """
+        Select non-overlapping matches like `spacy.util.filter_spans`: longest first, then earliest,
+        then by label rank.
+
+        Matches that do not overlap are all kept, so the entities are the same as the plain list of
+        Matcher and PhraseMatcher matches. Only overlapping matches, such as an email address that also
+        contains a number, are reduced to one; `Example.from_dict` rejects overlapping entities (E103),
+        so such utterances could not be used for training before.
+
+        Args:
+            matches (list[tuple[int, int, str]]): The start and end token offsets and the label of every match.
+
+        Returns:
+            list[tuple[int, int, str]]: The selected matches, sorted by start.
+        """
+        ranked: list[tuple[int, int, str]] = sorted(
+            set(matches), key=lambda match: (match[0] - match[1], match[0], NamedEntityRecognition.get_label_rank(match[2]))
+        )
+
+        selected: list[tuple[int, int, str]] = []
+        taken: set[int] = set()
+        for start, end, label in ranked:
+            if not taken.intersection(range(start, end)):
+                selected.append((start, end, label))
+                taken.update(range(start, end))
+
+        return sorted(selected)
+
+    @staticmethod
+    def get_character_offsets(doc: spacy.tokens.Doc, matches: list[tuple[int, int, str]]) -> list[tuple[int, int, str]]:
+        """
+        Convert token offsets of matches into character offsets.
+
+        Args:
+            doc (spacy.tokens.Doc): The tokenized text.
+            matches (list[tuple[int, int, str]]): The start and end token offsets and the label of every match.
+
+        Returns:
+            list[tuple[int, int, str]]: The start and end character offsets and the label of every match.
+        """
+        return [(doc[start].idx, doc[end - 1].idx + len(doc[end - 1]), label) for start, end, label in matches]
+
     @staticmethod
     def create_phrase_matcher(nlp: spacy.Language, entities_dict: dict[str, list[str]]) -> PhraseMatcher:
         """
         Create a PhraseMatcher object for phrase matching.
+        The PhraseMatcher matches on the token text, so the patterns are only tokenized.
 
         Args:
             nlp (spacy.Language): The Spacy language model.
@@ -49,7 +114,7 @@ class NamedEntityRecognition:
         phrase_matcher: PhraseMatcher = PhraseMatcher(nlp.vocab)
 
         for key, values in entities_dict.items():
-            phrase_patterns: list[spacy.tokens.Doc] = [nlp(value) for value in values]
+            phrase_patterns: list[spacy.tokens.Doc] = list(nlp.tokenizer.pipe(values))
             phrase_matcher.add(key, phrase_patterns)
 
         return phrase_matcher
@@ -59,55 +124,111 @@ class NamedEntityRecognition:
         nlp: spacy.Language,
         matcher: Matcher,
         phrase_matcher: PhraseMatcher,
-        aug_training_utterances: list[str]
+        aug_training_utterances: list[str],
+        batch_size: int = 1000,
+        n_process: int = 1
     ) -> list[tuple[str, dict[str, list[tuple[int, int, str]]]]]:
         """
         Find entities in the given training utterances using the provided matchers.
+        Both matchers only look at the token text, so the utterances are tokenized in batches with `nlp.pipe`
+        and no pipeline components should be loaded.
 
         Args:
             nlp (spacy.Language): The Spacy language model.
             matcher (Matcher): The Matcher object for pattern matching.
             phrase_matcher (PhraseMatcher): The PhraseMatcher object for phrase matching.
             aug_training_utterances (list[str]): List of training utterances.
+            batch_size (int, optional): The number of utterances per spaCy batch. Defaults to 1000.
+            n_process (int, optional): The number of spaCy processes. Defaults to 1.
 
         Returns:
             list[tuple[str, dict[str, list[tuple[int, int, str]]]]]: List of tuples containing the utterances and the detected entities.
         """
         training_data: list[tuple[str, dict[str, list[tuple[int, int, str]]]]] = []
 
-        for utterance in aug_training_utterances:
-            doc: spacy.Language = nlp(utterance)
-        
-            matches: list[tuple[int, int, int]] = matcher(doc)
-            phrase_matches: list[tuple[int, int, int]] = phrase_matcher(doc)
-            
-            entities: list[tuple[int, int, str]] = []
-            for match_id, start, end in matches:
-                entity_name: str = nlp.vocab.strings[match_id]
-                entities.append((doc[start].idx, doc[end - 1].idx + len(doc[end - 1]), entity_name))
-        
-            for match_id, start, end in phrase_matches:
-                entity_name: str = nlp.vocab.strings[match_id]
-                entities.append((doc[start].idx, doc[end - 1].idx + len(doc[end - 1]), entity_name))
-        
+        for utterance, doc in zip(aug_training_utterances, nlp.pipe(aug_training_utterances, batch_size=batch_size, n_process=n_process)):
+            entities: list[tuple[int, int, str]] = NamedEntityRecognition.get_matcher_entities(nlp, matcher, phrase_matcher, doc)
             training_data.append((utterance, {"entities": entities}))
 
         return training_data
 
     @staticmethod
-    def get_training_data(aug_training_utterances: list[str], entities_path: str, spacy_trained_pipeline: str) -> list[tuple[str, dict[str, list[tuple[int, int, str]]]]]:
+    def get_matcher_entities(
+        nlp: spacy.Language,
+        matcher: Matcher,
+        phrase_matcher: PhraseMatcher,
+        doc: spacy.tokens.Doc
+    ) -> list[tuple[int, int, str]]:
+        """
+        Find the non-overlapping entities of a tokenized utterance with the provided matchers.
+
+        Args:
+            nlp (spacy.Language): The Spacy language model.
+            matcher (Matcher): The Matcher object for pattern matching.
+            phrase_matcher (PhraseMatcher): The PhraseMatcher object for phrase matching.
+            doc (spacy.tokens.Doc): The tokenized utterance.
+
+        Returns:
+            list[tuple[int, int, str]]: The start and end character offsets and the label of every entity, sorted by start.
+        """
+        matches: list[tuple[int, int, str]] = [
+            (start, end, nlp.vocab.strings[match_id]) for match_id, start, end in matcher(doc) + phrase_matcher(doc)
+        ]
+
+        return NamedEntityRecognition.get_character_offsets(doc, NamedEntityRecognition.resolve_overlaps(matches))
+
+    @staticmethod
+    def replace_matched_entities(
+        utterances: list[str],
+        entities_path: str,
+        spacy_trained_pipeline: str,
+        batch_size: int = 1000
+    ) -> list[str]:
+        """
+        Replace the entities found by the Matcher and PhraseMatcher with special tokens.
+        This is the reference the rule-based `EntityMasker` is checked against.
+
+        Args:
+            utterances (list[str]): The utterances.
+            entities_path (str): The path of the text file to read entities from.
+            spacy_trained_pipeline: (str): The trained pipeline from spacy whose tokenizer is used.
+            batch_size (int, optional): The number of utterances per spaCy batch. Defaults to 1000.
+
+        Returns:
+            list[str]: The utterances with the entities replaced.
+        """
+        nlp: spacy.Language = SpacyPipelines.get_tokenizer(spacy_trained_pipeline)
+        matcher: Matcher = NamedEntityRecognition.create_matcher(nlp)
+        phrase_matcher: PhraseMatcher = NamedEntityRecognition.create_phrase_matcher(nlp, DataLoading.load_entities(entities_path))
+
+        return [
+            NamedEntityRecognition.rewrite_entities(utterance, NamedEntityRecognition.get_matcher_entities(nlp, matcher, phrase_matcher, doc))
+            for utterance, doc in zip(utterances, nlp.pipe(utterances, batch_size=batch_size))
+        ]
+
+    @staticmethod
+    def get_training_data(
+        aug_training_utterances: list[str],
+        entities_path: str,
+        spacy_trained_pipeline: str,
+        batch_size: int = 1000,
+        n_process: int = 1
+    ) -> list[tuple[str, dict[str, list[tuple[int, int, str]]]]]:
         """
         Process training data by loading models, entities, creating matchers, and finding entities in the utterances.
+        Only the tokenizer of the pipeline is used, which yields the same tokens and therefore the same matches.
 
         Args:
             aug_training_utterances (list[str]): List of training utterances.
             entities_path (str): The path of the text file to read entities from.
             spacy_trained_pipeline: (str): The trained pipeline from spacy that will be used.
+            batch_size (int, optional): The number of utterances per spaCy batch. Defaults to 1000.
+            n_process (int, optional): The number of spaCy processes. Defaults to 1.
             
         Returns:
             list[tuple[str, dict[str, list[tuple[int, int, str]]]]]: Processed training data with found entities.
         """
-        nlp: spacy.Language = spacy.load(spacy_trained_pipeline)
+        nlp: spacy.Language = SpacyPipelines.get_tokenizer(spacy_trained_pipeline)
         
         entities_dict: dict[str, list[str]] = DataLoading.load_entities(entities_path)
         
@@ -115,7 +236,7 @@ class NamedEntityRecognition:
         phrase_matcher: PhraseMatcher = NamedEntityRecognition.create_phrase_matcher(nlp, entities_dict)
         
         training_data: list[tuple[str, dict[str, list[tuple[int, int, str]]]]] = NamedEntityRecognition.find_entities(
-            nlp, matcher, phrase_matcher, aug_training_utterances)
+            nlp, matcher, phrase_matcher, aug_training_utterances, batch_size, n_process)
 
         return training_data
 
@@ -153,62 +274,150 @@ class NamedEntityRecognition:
             for entity in annotations.get("entities"):
                 ner.add_label(entity[2])
 
+    @staticmethod
+    def compounding_batch_sizes(start: float, stop: float, compound: float) -> Iterator[int]:
+        """
+        Yield batch sizes growing geometrically from `start` to `stop`.
+
+        Args:
+            start (float): The first batch size.
+            stop (float): The largest batch size.
+            compound (float): The factor the batch size grows by after every batch.
+
+        Returns:
+            Iterator[int]: The batch sizes.
+        """
+        size: float = start
+        while True:
+            yield int(size)
+            size = min(size * compound, stop)
+
+    @staticmethod
+    def create_examples(
+        nlp: spacy.Language,
+        training_data: list[tuple[str, dict[str, list[tuple[int, int, str]]]]]
+    ) -> list[spacy.training.example.Example]:
+        """
+        Create the spaCy Examples of the training data once, so they are reused in every epoch.
+
+        Args:
+            nlp (spacy.Language): The Spacy Language model.
+            training_data (list[tuple[str, dict[str, list[tuple[int, int, str]]]]]): The training data.
+
+        Returns:
+            list[spacy.training.example.Example]: The Examples.
+        """
+        return [
+            spacy.training.example.Example.from_dict(doc, annotations)
+            for doc, (_, annotations) in zip(nlp.tokenizer.pipe(text for text, _ in training_data), training_data)
+        ]
+
     @staticmethod
     def train_ner_model(
         nlp: spacy.Language, 
         training_data: list[tuple[str, dict[str, list[tuple[int, int, str]]]]], 
-        iterations: int
+        iterations: int,
+        batch_start: float = 4.0,
+        batch_stop: float = 32.0,
+        batch_compound: float = 1.001,
+        dropout: float = 0.3,
+        patience: int = 3,
+        dev_fraction: float = 0.1,
+        seed: int = 42
     ) -> tuple[spacy.Language, list[float]]:
         """
         Train the NER model using the provided training data.
 
+        The Examples are built once and shuffled every epoch, and every update uses a whole minibatch with
+        compounding size. After every epoch the model is scored by the entity F1 on a held-out part of the
+        training data, or by the NER loss if there is none. Training stops when the score did not improve
+        for `patience` epochs, and the model of the best epoch is restored.
+
         Args:
             nlp (spacy.Language): The Spacy Language model.
             training_data (list[tuple[str, dict[str, list[tuple[int, int, str]]]]]): The training data.
-            iterations (int): The number of training iterations.
+            iterations (int): The maximum number of training epochs.
+            batch_start (float, optional): The first batch size of every epoch. Defaults to 4.0.
+            batch_stop (float, optional): The largest batch size. Defaults to 32.0.
+            batch_compound (float, optional): The factor the batch size grows by after every batch. Defaults to 1.001.
+            dropout (float, optional): The dropout rate. Defaults to 0.3.
+            patience (int, optional): The number of epochs without improvement before training stops. Defaults to 3.
+            dev_fraction (float, optional): The fraction of the training data held out for scoring. Defaults to 0.1.
+            seed (int, optional): The random seed for the split, the shuffling and the model initialization. Defaults to 42.
 
         Returns:
             tuple[spacy.Language, list[float]]: The trained Spacy Language model and the list of training losses.
         """
+        spacy.util.fix_random_seed(seed)
+        rng: random.Random = random.Random(seed)
+
+        examples: list[spacy.training.example.Example] = NamedEntityRecognition.create_examples(nlp, training_data)
+        rng.shuffle(examples)
+        dev_size: int = int(len(examples) * dev_fraction)
+        dev_examples: list[spacy.training.example.Example] = examples[:dev_size]
+        train_examples: list[spacy.training.example.Example] = examples[dev_size:]
+
         # Disable all pipes other than 'ner' during training
         other_pipes: list[str] = [pipe for pipe in nlp.pipe_names if pipe != "ner"]
         
         with nlp.disable_pipes(*other_pipes):  # only train NER
-            nlp.begin_training()
+            optimizer: Optimizer = nlp.initialize(lambda: train_examples)
             training_loss: list[float] = []
+            best_score: Optional[float] = None
+            best_model: Optional[bytes] = None
+            epochs_without_improvement: int = 0
             
             for iteration in range(iterations):
                 print("Starting iteration " + str(iteration))
                 losses: dict[str, float] = {}
-                
-                for batch in spacy.util.minibatch(training_data, size=2):
-                    for text, annotations in batch:
-                        doc: spacy.tokens.Doc = nlp.make_doc(text)
-                        example: spacy.training.example.Example = spacy.training.example.Example.from_dict(doc, annotations)
-                        nlp.update([example], losses=losses, drop=0.3)
+                rng.shuffle(train_examples)
+
+                batch_sizes: Iterator[int] = NamedEntityRecognition.compounding_batch_sizes(batch_start, batch_stop, batch_compound)
+                for batch in spacy.util.minibatch(train_examples, size=batch_sizes):
+                    nlp.update(batch, sgd=optimizer, losses=losses, drop=dropout)
                     
                 training_loss.append(losses.get("ner"))
-                print(f'losses (iteration {iteration}): {losses}')
+
+                if dev_examples:
+                    score: float = nlp.evaluate(dev_examples).get("ents_f") or 0.0
+                else:
+                    score = -losses.get("ner", 0.0)
+                print(f'losses (iteration {iteration}): {losses}, score: {score:.4f}')
+
+                if best_score is None or score > best_score:
+                    best_score = score
+                    best_model = nlp.to_bytes()
+                    epochs_without_improvement = 0
+                else:
+                    epochs_without_improvement += 1
+                    if epochs_without_improvement >= patience:
+                        print(f"Stopping early after iteration {iteration}, best score: {best_score:.4f}")
+                        break
+
+            if best_model is not None:
+                nlp.from_bytes(best_model)
             
             return nlp, training_loss
 
     @staticmethod
     def train_ner(training_data: list[tuple[str, dict[str, list[tuple[int, int, str]]]]], 
-                  iterations: int
+                  iterations: int,
+                  **training_options: Union[int, float]
     ) -> tuple[spacy.Language, list[float]]:
         """
         Train the NER model using the provided training data and iterations.
 
         Args:
             training_data (list[tuple[str, dict[str, list[tuple[int, int, str]]]]]): The training data.
-            iterations (int): The number of training iterations.
+            iterations (int): The maximum number of training epochs.
+            **training_options (Union[int, float]): The batching, dropout and early stopping options of `train_ner_model`.
 
         Returns:
             tuple[spacy.Language, list[float]]: A tuple containing the trained Spacy Language model and a list of training losses.
         """
         nlp: spacy.Language = NamedEntityRecognition.create_ner_model()
         NamedEntityRecognition.add_labels_to_ner_model(nlp, training_data)
-        trained_nlp, train_loss = NamedEntityRecognition.train_ner_model(nlp, training_data, iterations)
+        trained_nlp, train_loss = NamedEntityRecognition.train_ner_model(nlp, training_data, iterations, **training_options)
 
         return trained_nlp, train_loss
 
@@ -247,28 +456,61 @@ class NamedEntityRecognition:
         return extracted_entities
 
     @staticmethod
-    def replace_entities(aug_training_utterances: list[str], trained_nlp: spacy.Language) -> list[str]:
+    def get_placeholder(entity_label: str) -> str:
+        """
+        Return the special token that replaces an entity of the given label.
+
+        Args:
+            entity_label (str): The entity label.
+
+        Returns:
+            str: The special token.
+        """
+        return f"`ENTITÄTS{entity_label.upper()}`"
+
+    @staticmethod
+    def rewrite_entities(utterance: str, entities: list[tuple[int, int, str]]) -> str:
+        """
+        Rebuild the utterance in one pass with every entity span replaced by its special token.
+
+        Args:
+            utterance (str): The utterance.
+            entities (list[tuple[int, int, str]]): The start and end character offsets and the label
+                of every entity, sorted by start and not overlapping.
+
+        Returns:
+            str: The utterance with the entities replaced.
+        """
+        parts: list[str] = []
+        position: int = 0
+
+        for start_char, end_char, entity_label in entities:
+            parts.append(utterance[position:start_char])
+            parts.append(NamedEntityRecognition.get_placeholder(entity_label))
+            position = end_char
+
+        parts.append(utterance[position:])
+
+        return "".join(parts)
+
+    @staticmethod
+    def replace_entities(aug_training_utterances: list[str], trained_nlp: spacy.Language, batch_size: int = 256) -> list[str]:
         """
         Replace the entities in the augmented training utterances with special tokens.
+        The utterances are processed in batches with `nlp.pipe` and only the recognized spans are replaced.
 
         Args:
             aug_training_utterances (list[str]): List of augmented trainging utterances.
             trained_nlp (spacy.Language): Trained NER model. 
+            batch_size (int, optional): The number of utterances per spaCy batch. Defaults to 256.
 
         Returns:
             list[str]: List of the augmented training utterances with the entities replaced.
         """
         new_utterances: list[str] = []
         
-        for utterance in aug_training_utterances:
-            doc: spacy.Language = trained_nlp(utterance)
-            ents: list[tuple[str, int, int, str]] = [(e.text, e.start_char, e.end_char, e.label_) for e in doc.ents]
-
-            new_utterance: str = utterance
-            for entity_text, _, _, entity_label in ents:
-                placeholder = f"`ENTITÄTS{entity_label.upper()}`"
-                new_utterance = new_utterance.replace(entity_text, placeholder)
-
-            new_utterances.append(new_utterance)
+        for utterance, doc in zip(aug_training_utterances, trained_nlp.pipe(aug_training_utterances, batch_size=batch_size)):
+            entities: list[tuple[int, int, str]] = [(e.start_char, e.end_char, e.label_) for e in doc.ents]
+            new_utterances.append(NamedEntityRecognition.rewrite_entities(utterance, entities))
 
-        return new_utterances
\ No newline at end of file
+        return new_utterances
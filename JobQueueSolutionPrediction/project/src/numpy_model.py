@@ -0,0 +1,161 @@
+import json
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class NumpyModel:
+    """
+    NumPy-only forward pass for the Conv1D text classifier built by `ModelTraining.get_model`.
+
+    The model is described by a list of layer specifications (class name and configuration)
+    and their weights, as written by `NumpyModel.export`. Serving it does not require TensorFlow.
+    """
+
+    supported_layers: frozenset[str] = frozenset({
+        "Embedding", "Conv1D", "MaxPooling1D", "GlobalMaxPooling1D", "Dense", "Dropout"
+    })
+
+    def __init__(self, layers: list[dict[str, any]], weights: list[list[np.ndarray]]):
+        unsupported: list[str] = [layer["class_name"] for layer in layers if layer["class_name"] not in self.supported_layers]
+        if unsupported:
+            raise ValueError(f"Unsupported layers for NumPy inference: {', '.join(unsupported)}")
+
+        self.layers: list[dict[str, any]] = layers
+        self.weights: list[list[np.ndarray]] = weights
+
+    @property
+    def output_shape(self) -> tuple[None, int]:
+        """
+        The output shape of the model, matching the Keras `output_shape` attribute.
+
+        Returns:
+            tuple[None, int]: The batch dimension and the number of labels.
+        """
+        return (None, self.weights[-1][-1].shape[0])
+
+    @staticmethod
+    def export(model: object, file_path: str) -> None:
+        """
+        Export the layer specifications and weights of a trained Keras Sequential model to a compressed `.npz` file.
+
+        Args:
+            model (tf.keras.models.Sequential): The trained Keras model.
+            file_path (str): The path to save the `.npz` file.
+
+        Returns:
+            None
+        """
+        layers: list[dict[str, any]] = []
+        arrays: dict[str, np.ndarray] = {}
+
+        for i, layer in enumerate(model.layers):
+            layer_weights: list[np.ndarray] = layer.get_weights()
+            layers.append({"class_name": type(layer).__name__, "config": layer.get_config(), "num_weights": len(layer_weights)})
+
+            for j, weight in enumerate(layer_weights):
+                arrays[f"layer_{i}_weight_{j}"] = weight.astype(np.float32)
+
+        np.savez_compressed(file_path, layers=np.array(json.dumps(layers, default=str)), **arrays)
+
+    @staticmethod
+    def load(file_path: str) -> "NumpyModel":
+        """
+        Load a model exported with `NumpyModel.export`.
+
+        Args:
+            file_path (str): The path to the `.npz` file.
+
+        Returns:
+            NumpyModel: The loaded model.
+        """
+        with np.load(file_path, allow_pickle=False) as archive:
+            layers: list[dict[str, any]] = json.loads(str(archive["layers"]))
+            weights: list[list[np.ndarray]] = [
+                [archive[f"layer_{i}_weight_{j}"] for j in range(layer["num_weights"])]
+                for i, layer in enumerate(layers)
+            ]
+
+        return NumpyModel(layers, weights)
+
+    @staticmethod
+    def pad(x: np.ndarray, size: int, stride: int, padding: str, value: float) -> np.ndarray:
+        """
+        Pad the time axis the same way TensorFlow does for `same` padding.
+
+        Args:
+            x (np.ndarray): The input of shape (batch, steps, channels).
+            size (int): The window size.
+            stride (int): The stride.
+            padding (str): Either `valid` or `same`.
+            value (float): The value used for padding.
+
+        Returns:
+            np.ndarray: The padded input.
+        """
+        if padding != "same":
+            return x
+
+        steps: int = x.shape[1]
+        total: int = max((-(-steps // stride) - 1) * stride + size - steps, 0)
+
+        return np.pad(x, ((0, 0), (total // 2, total - total // 2), (0, 0)), constant_values=value)
+
+    @staticmethod
+    def activate(x: np.ndarray, activation: str) -> np.ndarray:
+        """
+        Apply a Keras activation function.
+
+        Args:
+            x (np.ndarray): The input.
+            activation (str): The name of the activation.
+
+        Returns:
+            np.ndarray: The activated input.
+        """
+        if activation == "relu":
+            return np.maximum(x, 0)
+        if activation == "softmax":
+            exp: np.ndarray = np.exp(x - np.max(x, axis=-1, keepdims=True))
+            return exp / np.sum(exp, axis=-1, keepdims=True)
+        if activation == "linear":
+            return x
+
+        raise ValueError(f"Unsupported activation for NumPy inference: {activation}")
+
+    def predict(self, x: np.ndarray, verbose: int = 0) -> np.ndarray:
+        """
+        Run the forward pass on a batch of vectorized utterances.
+
+        Args:
+            x (np.ndarray): The vectorized utterances of shape (batch, max_sequence_length).
+            verbose (int, optional): Ignored, accepted for compatibility with `Sequential.predict`. Defaults to 0.
+
+        Returns:
+            np.ndarray: The softmax output of shape (batch, num_labels).
+        """
+        output: np.ndarray = np.asarray(x)
+
+        for layer, weights in zip(self.layers, self.weights):
+            config: dict[str, any] = layer["config"]
+            class_name: str = layer["class_name"]
+
+            if class_name == "Embedding":
+                output = weights[0][output.astype(np.int64)]
+            elif class_name == "Conv1D":
+                size: int = config["kernel_size"][0]
+                stride: int = config["strides"][0]
+                output = self.pad(output, size, stride, config["padding"], 0.0)
+                windows: np.ndarray = sliding_window_view(output, size, axis=1)[:, ::stride]
+                output = np.einsum("blck,kco->blo", windows, weights[0]) + weights[1]
+                output = self.activate(output, config["activation"])
+            elif class_name == "MaxPooling1D":
+                size = config["pool_size"][0]
+                stride = config["strides"][0]
+                output = self.pad(output, size, stride, config["padding"], -np.inf)
+                output = sliding_window_view(output, size, axis=1)[:, ::stride].max(axis=-1)
+            elif class_name == "GlobalMaxPooling1D":
+                output = output.max(axis=1)
+            elif class_name == "Dense":
+                output = self.activate(output @ weights[0] + weights[1], config["activation"])
+
+        return output
@@ -0,0 +1,140 @@
+import sys
+import time
+import threading
+from typing import Optional
+from collections import OrderedDict
+
+sys.path.append('src')
+
+from src.prediction_store import PredictionStore
+
+
+class PredictionCache:
+    """
+    In-memory LRU cache with a time to live for predictions.
+
+    Entries are keyed on the model version and the entity-masked, preprocessed job queue
+    error, so messages that differ only in record numbers, emails or user names share an entry.
+    An optional persistent store backs the in-memory entries across restarts and processes.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, store: Optional[PredictionStore] = None):
+        self.max_size: int = max_size
+        self.ttl_seconds: float = ttl_seconds
+        self.entries: OrderedDict[tuple[str, str], tuple[float, tuple[str, float]]] = OrderedDict()
+        self.store: Optional[PredictionStore] = store
+        self.lock: threading.Lock = threading.Lock()
+        self.hits: int = 0
+        self.store_hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, model_version: str, preprocessed_job_queue_error: str) -> Optional[tuple[str, float]]:
+        """
+        Look up a cached prediction.
+
+        Args:
+            model_version (str): The version of the model that produced the prediction.
+            preprocessed_job_queue_error (str): The preprocessed job queue error.
+
+        Returns:
+            Optional[tuple[str, float]]: The cached prediction and confidence, or None on a miss.
+        """
+        key: tuple[str, str] = (model_version, preprocessed_job_queue_error)
+
+        with self.lock:
+            entry: Optional[tuple[float, tuple[str, float]]] = self.entries.get(key)
+
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self.entries[key]
+                self.evictions += 1
+                entry = None
+
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+
+                return entry[1]
+
+        prediction: Optional[tuple[str, float]] = None if self.store is None else self.store.get(model_version, preprocessed_job_queue_error)
+
+        with self.lock:
+            if prediction is None:
+                self.misses += 1
+                return None
+
+            self.store_hits += 1
+
+        self.put_in_memory(key, prediction)
+
+        return prediction
+
+    def put(self, model_version: str, preprocessed_job_queue_error: str, prediction: tuple[str, float]) -> None:
+        """
+        Store a prediction, evicting the least recently used entry when the cache is full.
+
+        Args:
+            model_version (str): The version of the model that produced the prediction.
+            preprocessed_job_queue_error (str): The preprocessed job queue error.
+            prediction (tuple[str, float]): The prediction and confidence.
+
+        Returns:
+            None
+        """
+        if self.store is not None:
+            self.store.put(model_version, preprocessed_job_queue_error, prediction)
+
+        self.put_in_memory((model_version, preprocessed_job_queue_error), prediction)
+
+    def put_many(self, model_version: str, predictions: list[tuple[str, tuple[str, float]]]) -> None:
+        """
+        Store several predictions, writing them to the persistent store in one transaction.
+
+        Args:
+            model_version (str): The version of the model that produced the predictions.
+            predictions (list[tuple[str, tuple[str, float]]]): Pairs of preprocessed job queue error and prediction with confidence.
+
+        Returns:
+            None
+        """
+        if self.store is not None and predictions:
+            self.store.put_many(model_version, predictions)
+
+        for preprocessed_job_queue_error, prediction in predictions:
+            self.put_in_memory((model_version, preprocessed_job_queue_error), prediction)
+
+    def put_in_memory(self, key: tuple[str, str], prediction: tuple[str, float]) -> None:
+        """
+        Store a prediction in memory only, evicting the least recently used entry when the cache is full.
+
+        Args:
+            key (tuple[str, str]): The model version and preprocessed job queue error.
+            prediction (tuple[str, float]): The prediction and confidence.
+
+        Returns:
+            None
+        """
+        if self.max_size <= 0:
+            return
+
+        with self.lock:
+            self.entries[key] = (time.monotonic(), prediction)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return the cache counters.
+
+        Args:
+            None
+
+        Returns:
+            dict[str, int]: The number of memory hits, store hits, misses, evictions and cached entries.
+        """
+        with self.lock:
+            return {"hits": self.hits, "store_hits": self.store_hits, "misses": self.misses,
+                    "evictions": self.evictions, "size": len(self.entries)}
@@ -0,0 +1,116 @@
+import os
+import time
+import sqlite3
+import threading
+from typing import Optional
+
+
+class PredictionStore:
+    """
+    SQLite-backed store for predictions that survives restarts and is shared between worker processes.
+
+    Every entry carries the model version (the hash of the model artifacts), so retraining the
+    model invalidates all previous entries automatically. The entries of other versions are only
+    deleted by the explicit `prune` maintenance step, since workers of the previous version may
+    still be serving during a rolling deploy.
+    """
+
+    def __init__(self, file_path: str):
+        directory: str = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.lock: threading.Lock = threading.Lock()
+        self.connection: sqlite3.Connection = sqlite3.connect(file_path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS predictions (
+                model_version TEXT NOT NULL,
+                preprocessed_error TEXT NOT NULL,
+                prediction TEXT,
+                confidence REAL NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (model_version, preprocessed_error)
+            )
+            """
+        )
+        self.connection.commit()
+
+    def get(self, model_version: str, preprocessed_job_queue_error: str) -> Optional[tuple[str, float]]:
+        """
+        Look up a stored prediction.
+
+        Args:
+            model_version (str): The version of the model that produced the prediction.
+            preprocessed_job_queue_error (str): The preprocessed job queue error.
+
+        Returns:
+            Optional[tuple[str, float]]: The stored prediction and confidence, or None if it is not stored.
+        """
+        with self.lock:
+            row: Optional[tuple[str, float]] = self.connection.execute(
+                "SELECT prediction, confidence FROM predictions WHERE model_version = ? AND preprocessed_error = ?",
+                (model_version, preprocessed_job_queue_error)
+            ).fetchone()
+
+        return None if row is None else (row[0], row[1])
+
+    def put_many(self, model_version: str, predictions: list[tuple[str, tuple[str, float]]]) -> None:
+        """
+        Store predictions, replacing existing entries for the same preprocessed job queue errors.
+
+        Args:
+            model_version (str): The version of the model that produced the predictions.
+            predictions (list[tuple[str, tuple[str, float]]]): Pairs of preprocessed job queue error and prediction with confidence.
+
+        Returns:
+            None
+        """
+        created_at: float = time.time()
+        rows: list[tuple[str, str, str, float, float]] = [
+            (model_version, preprocessed_job_queue_error, prediction, float(confidence), created_at)
+            for preprocessed_job_queue_error, (prediction, confidence) in predictions
+        ]
+
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO predictions (model_version, preprocessed_error, prediction, confidence, created_at) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self.connection.commit()
+
+    def put(self, model_version: str, preprocessed_job_queue_error: str, prediction: tuple[str, float]) -> None:
+        """
+        Store a single prediction.
+
+        Args:
+            model_version (str): The version of the model that produced the prediction.
+            preprocessed_job_queue_error (str): The preprocessed job queue error.
+            prediction (tuple[str, float]): The prediction and confidence.
+
+        Returns:
+            None
+        """
+        self.put_many(model_version, [(preprocessed_job_queue_error, prediction)])
+
+    def prune(self, model_version: str, max_age_seconds: float) -> int:
+        """
+        Delete the entries produced by other model versions that were stored more than `max_age_seconds` ago.
+        Entries still written by workers of a previous version are recent and therefore kept.
+
+        Args:
+            model_version (str): The current model version.
+            max_age_seconds (float): The age after which entries of other model versions are deleted.
+
+        Returns:
+            int: The number of deleted entries.
+        """
+        with self.lock:
+            cursor: sqlite3.Cursor = self.connection.execute(
+                "DELETE FROM predictions WHERE model_version != ? AND created_at < ?", (model_version, time.time() - max_age_seconds)
+            )
+            self.connection.commit()
+
+        return cursor.rowcount
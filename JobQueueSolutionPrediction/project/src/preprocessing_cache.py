@@ -0,0 +1,123 @@
+import os
+import json
+import pickle
+import hashlib
+from typing import Optional
+
+
+class PreprocessingCache:
+    """
+    Content-addressed cache of preprocessed training utterances, persisted between training runs.
+
+    Every entry is keyed by the hash of the utterance and of the context it was preprocessed in:
+    the contractions, the custom spelling dictionary with the spelling backend, the preprocessing
+    spec, and the name and version of the spaCy pipeline that lemmatizes. Changing any of them changes every key, so stale entries are never reused. Each entry holds
+    the preprocessed utterance and the words and lemmas needed to rebuild the lemma table.
+    """
+
+    def __init__(self, file_path: str, context_hash: str):
+        self.file_path: str = file_path
+        self.context_hash: str = context_hash
+        self.entries: dict[str, tuple[str, list[tuple[str, str]]]] = {}
+        self.used_keys: set[str] = set()
+
+        if os.path.exists(file_path):
+            with open(file_path, "rb") as cache_file:
+                self.entries = pickle.load(cache_file)
+
+    @staticmethod
+    def hash_context(
+        contractions: dict[str, str],
+        spelling_dictionary_hash: str,
+        preprocessing_spec: dict[str, any],
+        spacy_meta: dict[str, any]
+    ) -> str:
+        """
+        Compute the hash of everything besides the utterance that determines its preprocessed form.
+
+        Args:
+            contractions (dict[str, str]): Dictionary of contractions.
+            spelling_dictionary_hash (str): The hash of the custom spelling dictionary and spelling backend.
+            preprocessing_spec (dict[str, any]): The preprocessing spec.
+            spacy_meta (dict[str, any]): The meta of the spaCy pipeline used for lemmatization.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the context.
+        """
+        context: str = json.dumps(
+            {
+                "contractions": sorted(contractions.items()),
+                "spelling": spelling_dictionary_hash,
+                "spec": preprocessing_spec,
+                "spacy": {key: spacy_meta.get(key) for key in ("lang", "name", "version")}
+            },
+            sort_keys=True,
+            ensure_ascii=False
+        )
+
+        return hashlib.sha256(context.encode("utf-8")).hexdigest()
+
+    def get_key(self, utterance: str) -> str:
+        """
+        Compute the cache key of an utterance.
+
+        Args:
+            utterance (str): The utterance.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the context and the utterance.
+        """
+        return hashlib.sha256(f"{self.context_hash}\0{utterance}".encode("utf-8")).hexdigest()
+
+    def get(self, utterance: str) -> Optional[tuple[str, list[tuple[str, str]]]]:
+        """
+        Look up the preprocessed form of an utterance.
+
+        Args:
+            utterance (str): The utterance.
+
+        Returns:
+            Optional[tuple[str, list[tuple[str, str]]]]: The preprocessed utterance and its words with their lemmas,
+                or None if the utterance was not preprocessed in this context before.
+        """
+        key: str = self.get_key(utterance)
+        entry: Optional[tuple[str, list[tuple[str, str]]]] = self.entries.get(key)
+
+        if entry is not None:
+            self.used_keys.add(key)
+
+        return entry
+
+    def put(self, utterance: str, preprocessed_utterance: str, word_lemmas: list[tuple[str, str]]) -> None:
+        """
+        Store the preprocessed form of an utterance.
+
+        Args:
+            utterance (str): The utterance.
+            preprocessed_utterance (str): The preprocessed utterance.
+            word_lemmas (list[tuple[str, str]]): The words of the utterance before lemmatization with their lemmas.
+
+        Returns:
+            None
+        """
+        key: str = self.get_key(utterance)
+        self.entries[key] = (preprocessed_utterance, word_lemmas)
+        self.used_keys.add(key)
+
+    def save(self) -> None:
+        """
+        Save the entries used in this run, dropping the ones of utterances that are no longer trained on.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        directory: str = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        entries: dict[str, tuple[str, list[tuple[str, str]]]] = {key: self.entries[key] for key in self.used_keys}
+        with open(self.file_path, "wb") as cache_file:
+            pickle.dump(entries, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
@@ -0,0 +1,221 @@
+import os
+import sys
+from functools import partial
+from typing import Callable, Optional
+
+sys.path.append('src')
+
+from src.lemma_table import LemmaTable
+from src.data_loading import DataLoading
+from src.text_normalizer import TextNormalizer
+from src.text_preprocessing import TextPreprocessing
+
+
+class PreprocessingPipeline:
+    """
+    Preprocessing chain compiled from a declarative spec of step names and parameters.
+
+    The spec is saved as JSON next to the other artifacts. Compiling it binds every step to its
+    parameters once, so processing an utterance is a loop over a flat list of callables.
+    Consecutive normalizer steps are fused into a single `TextNormalizer` pass. Steps with a
+    batch implementation, such as lemmatization with `nlp.pipe`, use it in `process_batch`.
+    With a `lemma_table` parameter, lemmatization looks words up in a `LemmaTable` first.
+    """
+
+    spec_version: int = 1
+    step_parameters: dict[str, tuple[str, ...]] = {
+        "lowercase": (),
+        "remove_unimportant": (),
+        "replace_abbreviations": (),
+        "remove_stopwords": (),
+        "correct_spelling": ("file_path",),
+        "lemmatize": ("trained_pipeline",)
+    }
+    optional_step_parameters: dict[str, tuple[str, ...]] = {
+        "lemmatize": ("lemma_table",)
+    }
+    normalizer_steps: tuple[str, ...] = ("lowercase", "remove_unimportant", "replace_abbreviations", "remove_stopwords")
+
+    def __init__(
+        self,
+        steps: list[tuple[str, Callable[[str], str]]],
+        batch_functions: Optional[dict[int, Callable[..., list[str]]]] = None
+    ):
+        self.steps: list[tuple[str, Callable[[str], str]]] = steps
+        self.functions: list[Callable[[str], str]] = [function for _, function in steps]
+        self.batch_functions: dict[int, Callable[..., list[str]]] = batch_functions or {}
+
+    @staticmethod
+    def build_spec(config: dict[str, any], use_lemma_table: bool = False) -> dict[str, any]:
+        """
+        Build the spec of the preprocessing chain used at training time.
+
+        Args:
+            config (dict[str, any]): The configuration file.
+            use_lemma_table (bool, optional): Whether lemmatization uses the lemma table saved at training time. Defaults to False.
+
+        Returns:
+            dict[str, any]: The spec with its version and the list of steps.
+        """
+        lemmatize_params: dict[str, str] = {"trained_pipeline": config['spacy']['trained_pipeline']}
+        if use_lemma_table:
+            lemmatize_params["lemma_table"] = config['paths']['lemma_table']
+
+        return {
+            "version": PreprocessingPipeline.spec_version,
+            "steps": [
+                {"name": "lowercase"},
+                {"name": "remove_unimportant"},
+                {"name": "replace_abbreviations"},
+                {"name": "remove_stopwords"},
+                {"name": "correct_spelling", "params": {"file_path": config['paths']['spelling']}},
+                {"name": "lemmatize", "params": lemmatize_params}
+            ]
+        }
+
+    @staticmethod
+    def compile(spec: dict[str, any], contractions: dict[str, str], script_dir: str) -> "PreprocessingPipeline":
+        """
+        Validate a spec and bind every step to its parameters.
+
+        Args:
+            spec (dict[str, any]): The spec with its version and the list of steps.
+            contractions (dict[str, str]): Dictionary of contractions.
+            script_dir (str): The project directory that relative file paths are resolved against.
+
+        Returns:
+            PreprocessingPipeline: The compiled pipeline.
+        """
+        if spec.get("version") != PreprocessingPipeline.spec_version:
+            raise ValueError(f"Unsupported preprocessing spec version: {spec.get('version')}")
+
+        names: list[str] = []
+        params: list[dict[str, any]] = []
+        for step in spec.get("steps", []):
+            name: str = step.get("name")
+            step_params: dict[str, any] = step.get("params", {})
+
+            if name not in PreprocessingPipeline.step_parameters:
+                raise ValueError(f"Unknown preprocessing step: {name}")
+            required_params: set[str] = set(PreprocessingPipeline.step_parameters[name])
+            allowed_params: set[str] = required_params | set(PreprocessingPipeline.optional_step_parameters.get(name, ()))
+            if not required_params <= set(step_params) <= allowed_params:
+                raise ValueError(
+                    f"Preprocessing step {name} expects the parameters {list(PreprocessingPipeline.step_parameters[name])}, "
+                    f"optionally {list(PreprocessingPipeline.optional_step_parameters.get(name, ()))}, got {sorted(step_params)}"
+                )
+
+            names.append(name)
+            params.append(step_params)
+
+        steps: list[tuple[str, Callable[[str], str]]] = []
+        batch_functions: dict[int, Callable[..., list[str]]] = {}
+        normalizer_steps_count: int = len(PreprocessingPipeline.normalizer_steps)
+        i: int = 0
+
+        while i < len(names):
+            if tuple(names[i:i + normalizer_steps_count]) == PreprocessingPipeline.normalizer_steps:
+                steps.append(("normalize", TextNormalizer.get_instance(contractions).normalize))
+                i += normalizer_steps_count
+                continue
+
+            function, batch_function = PreprocessingPipeline.bind_step(names[i], params[i], contractions, script_dir)
+            if batch_function is not None:
+                batch_functions[len(steps)] = batch_function
+            steps.append((names[i], function))
+            i += 1
+
+        return PreprocessingPipeline(steps, batch_functions)
+
+    @staticmethod
+    def bind_step(
+        name: str,
+        params: dict[str, any],
+        contractions: dict[str, str],
+        script_dir: str
+    ) -> tuple[Callable[[str], str], Optional[Callable[..., list[str]]]]:
+        """
+        Bind a single validated step, and its batch implementation if it has one, to its parameters.
+
+        Args:
+            name (str): The name of the step.
+            params (dict[str, any]): The parameters of the step.
+            contractions (dict[str, str]): Dictionary of contractions.
+            script_dir (str): The project directory that relative file paths are resolved against.
+
+        Returns:
+            tuple[Callable[[str], str], Optional[Callable[..., list[str]]]]: The bound step and the bound batch step or None.
+        """
+        if name == "lemmatize":
+            if "lemma_table" in params:
+                lemma_table: LemmaTable = LemmaTable(*DataLoading.load_lemma_table(os.path.join(script_dir, params["lemma_table"])))
+                return (
+                    partial(lemma_table.lemmatize_text, spacy_trained_pipeline=params["trained_pipeline"]),
+                    partial(lemma_table.lemmatize_texts, spacy_trained_pipeline=params["trained_pipeline"])
+                )
+
+            return (
+                partial(TextPreprocessing.lemmatize_text, spacy_trained_pipeline=params["trained_pipeline"]),
+                partial(TextPreprocessing.lemmatize_texts, spacy_trained_pipeline=params["trained_pipeline"])
+            )
+
+        builders: dict[str, Callable[[], Callable[[str], str]]] = {
+            "lowercase": lambda: TextPreprocessing.lower_text,
+            "remove_unimportant": lambda: TextPreprocessing.remove_unimportant_data,
+            "replace_abbreviations": lambda: partial(TextPreprocessing.replace_abbreviations, contractions=contractions),
+            "remove_stopwords": lambda: TextPreprocessing.remove_stopwords,
+            "correct_spelling": lambda: partial(
+                TextPreprocessing.correct_spelling, file_path=os.path.join(script_dir, params["file_path"])
+            )
+        }
+
+        return builders[name](), None
+
+    def process(self, utterance: str) -> str:
+        """
+        Run the compiled steps on an utterance.
+
+        Args:
+            utterance (str): The utterance to be preprocessed.
+
+        Returns:
+            str: The preprocessed utterance.
+        """
+        for function in self.functions:
+            utterance = function(utterance)
+
+        return utterance
+
+    def process_batch(
+        self,
+        utterances: list[str],
+        batch_size: int = 256,
+        n_process: int = 1,
+        word_lemmas: Optional[list[list[tuple[str, str]]]] = None
+    ) -> list[str]:
+        """
+        Run the compiled steps on a batch of utterances, step by step, keeping their order.
+
+        Args:
+            utterances (list[str]): The utterances to be preprocessed.
+            batch_size (int, optional): The number of texts per spaCy batch. Defaults to 256.
+            n_process (int, optional): The number of spaCy processes, -1 for one per CPU. Defaults to 1.
+            word_lemmas (Optional[list[list[tuple[str, str]]]], optional): If given, spaCy lemmatization
+                appends the words of every utterance with their lemmas to it, to build a `LemmaTable`. Defaults to None.
+
+        Returns:
+            list[str]: The preprocessed utterances.
+        """
+        texts: list[str] = list(utterances)
+        batch_kwargs: dict[str, any] = {"batch_size": batch_size, "n_process": n_process}
+        if word_lemmas is not None:
+            batch_kwargs["word_lemmas"] = word_lemmas
+
+        for i, function in enumerate(self.functions):
+            batch_function: Optional[Callable[..., list[str]]] = self.batch_functions.get(i)
+            if batch_function is None:
+                texts = [function(text) for text in texts]
+            else:
+                texts = batch_function(texts, **batch_kwargs)
+
+        return texts
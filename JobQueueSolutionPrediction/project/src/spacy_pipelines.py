@@ -0,0 +1,69 @@
+import spacy
+import threading
+
+
+class SpacyPipelines:
+    """
+    Process-wide cache of loaded spaCy pipelines, shared by training and serving.
+
+    Pipelines are keyed by their name and the components that were excluded, so each
+    configuration is loaded from disk only once per process.
+    """
+
+    lemmatizer_excluded_components: tuple[str, ...] = ("parser", "ner", "senter")
+    tokenizer_excluded_components: tuple[str, ...] = (
+        "tok2vec", "tagger", "morphologizer", "parser", "lemmatizer", "attribute_ruler", "ner", "senter"
+    )
+
+    _pipelines: dict[tuple[str, tuple[str, ...]], spacy.Language] = {}
+    _lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def get_pipeline(spacy_trained_pipeline: str, exclude: tuple[str, ...] = ()) -> spacy.Language:
+        """
+        Return a loaded spaCy pipeline, loading it on the first request.
+
+        Args:
+            spacy_trained_pipeline (str): The trained pipeline from spacy that will be used.
+            exclude (tuple[str, ...], optional): The components that are not loaded. Defaults to ().
+
+        Returns:
+            spacy.Language: The loaded pipeline.
+        """
+        key: tuple[str, tuple[str, ...]] = (spacy_trained_pipeline, tuple(sorted(exclude)))
+        nlp: spacy.Language = SpacyPipelines._pipelines.get(key)
+
+        if nlp is None:
+            with SpacyPipelines._lock:
+                nlp = SpacyPipelines._pipelines.get(key)
+                if nlp is None:
+                    nlp = spacy.load(spacy_trained_pipeline, exclude=list(key[1]))
+                    SpacyPipelines._pipelines[key] = nlp
+
+        return nlp
+
+    @staticmethod
+    def get_lemmatizer(spacy_trained_pipeline: str) -> spacy.Language:
+        """
+        Return the pipeline with only the components lemmatization needs (tokenizer, tagger/morphologizer and lemmatizer).
+
+        Args:
+            spacy_trained_pipeline (str): The trained pipeline from spacy that will be used.
+
+        Returns:
+            spacy.Language: The pruned pipeline.
+        """
+        return SpacyPipelines.get_pipeline(spacy_trained_pipeline, SpacyPipelines.lemmatizer_excluded_components)
+
+    @staticmethod
+    def get_tokenizer(spacy_trained_pipeline: str) -> spacy.Language:
+        """
+        Return the pipeline without any components, so `nlp.pipe` only tokenizes.
+
+        Args:
+            spacy_trained_pipeline (str): The trained pipeline from spacy that will be used.
+
+        Returns:
+            spacy.Language: The tokenizer-only pipeline.
+        """
+        return SpacyPipelines.get_pipeline(spacy_trained_pipeline, SpacyPipelines.tokenizer_excluded_components)
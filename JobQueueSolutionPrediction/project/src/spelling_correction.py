@@ -0,0 +1,216 @@
+import os
+import sys
+import json
+import hashlib
+import threading
+from typing import Optional, Union
+from collections import OrderedDict
+from spellchecker import SpellChecker
+
+sys.path.append('src')
+
+from src.symspell import SymSpell
+
+
+class SpellingCorrector:
+    """
+    Process-wide German spell checker with the custom spelling dictionary merged in.
+
+    Corrections are memoized per word in a bounded LRU memo that can be saved to and loaded
+    from disk. A saved memo is only reused with the custom spelling dictionary and backend it was built with.
+    The backend is either pyspellchecker or a precomputed SymSpell index, selected with `configure`.
+    """
+
+    backends: tuple[str, ...] = ("pyspellchecker", "symspell")
+    backend: str = "pyspellchecker"
+    index_path: Optional[str] = None
+    max_edit_distance: int = 2
+    prefix_length: int = 7
+
+    _instances: dict[str, "SpellingCorrector"] = {}
+    _lock: threading.Lock = threading.Lock()
+
+    def __init__(self, file_path: str, max_memo_size: int = 100000):
+        self.dictionary_hash: str = f"{self.hash_file(file_path)}:{self.backend}:{self.max_edit_distance}"
+        self.spell: Union[SpellChecker, SymSpell] = self.build_checker(file_path, self.dictionary_hash)
+        self.max_memo_size: int = max_memo_size
+        self.memo: OrderedDict[str, str] = OrderedDict()
+        self.memo_lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def get_instance(file_path: str) -> "SpellingCorrector":
+        """
+        Return the shared spelling corrector for a custom spelling dictionary, building it on the first request.
+
+        Args:
+            file_path (str): The path of the text file to read the custom spelling from.
+
+        Returns:
+            SpellingCorrector: The shared spelling corrector.
+        """
+        key: str = os.path.abspath(file_path)
+        corrector: SpellingCorrector = SpellingCorrector._instances.get(key)
+
+        if corrector is None:
+            with SpellingCorrector._lock:
+                corrector = SpellingCorrector._instances.get(key)
+                if corrector is None:
+                    corrector = SpellingCorrector(key)
+                    SpellingCorrector._instances[key] = corrector
+
+        return corrector
+
+    @staticmethod
+    def configure(spelling_config: dict[str, any], index_path: Optional[str] = None) -> None:
+        """
+        Select the spelling backend used by spelling correctors created afterwards.
+
+        Args:
+            spelling_config (dict[str, any]): The `spelling` section of the configuration.
+            index_path (Optional[str]): The path of the serialized SymSpell index. Defaults to None.
+
+        Returns:
+            None
+        """
+        backend: str = spelling_config.get("backend", "pyspellchecker")
+        if backend not in SpellingCorrector.backends:
+            raise ValueError(f"Unknown spelling backend: {backend}")
+
+        with SpellingCorrector._lock:
+            SpellingCorrector.backend = backend
+            SpellingCorrector.index_path = index_path
+            SpellingCorrector.max_edit_distance = spelling_config.get("max_edit_distance", 2)
+            SpellingCorrector.prefix_length = spelling_config.get("prefix_length", 7)
+            SpellingCorrector._instances.clear()
+
+    @staticmethod
+    def build_checker(file_path: str, dictionary_hash: str) -> Union[SpellChecker, SymSpell]:
+        """
+        Build the spell checker of the configured backend with the custom spelling dictionary merged in.
+
+        Args:
+            file_path (str): The path of the text file to read the custom spelling from.
+            dictionary_hash (str): The hash identifying the custom spelling dictionary and backend settings.
+
+        Returns:
+            Union[SpellChecker, SymSpell]: The spell checker.
+        """
+        if SpellingCorrector.backend == "pyspellchecker":
+            spell: SpellChecker = SpellChecker(language="de", distance=SpellingCorrector.max_edit_distance)
+            spell.word_frequency.load_text_file(file_path)
+            return spell
+
+        index_path: Optional[str] = SpellingCorrector.index_path
+        if index_path is not None and os.path.exists(index_path):
+            symspell: SymSpell = SymSpell.load(index_path)
+            if symspell.dictionary_hash == dictionary_hash and symspell.prefix_length == SpellingCorrector.prefix_length:
+                return symspell
+
+        symspell = SymSpell.from_spellchecker(file_path, SpellingCorrector.max_edit_distance, SpellingCorrector.prefix_length, dictionary_hash)
+        if index_path is not None:
+            symspell.save(index_path)
+
+        return symspell
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """
+        Compute the content hash of a file.
+
+        Args:
+            file_path (str): The path of the file.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the file.
+        """
+        with open(file_path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    def correct_word(self, word: str) -> str:
+        """
+        Correct a single word, using the memo when the word was seen before.
+
+        Args:
+            word (str): The word to correct.
+
+        Returns:
+            str: The corrected word, or the word itself if it is known or has no correction.
+        """
+        with self.memo_lock:
+            corrected_word: str = self.memo.get(word)
+            if corrected_word is not None:
+                self.memo.move_to_end(word)
+                return corrected_word
+
+        if word in self.spell:
+            corrected_word = word
+        else:
+            correction: str = self.spell.correction(word)
+            corrected_word = correction if isinstance(correction, str) else word
+
+        with self.memo_lock:
+            self.memo[word] = corrected_word
+            if len(self.memo) > self.max_memo_size:
+                self.memo.popitem(last=False)
+
+        return corrected_word
+
+    def correct(self, text: str) -> str:
+        """
+        Correct the spelling of every word in the text.
+
+        Args:
+            text (str): The text to be adjusted.
+
+        Returns:
+            str: The adjusted text with spelling mistakes corrected.
+        """
+        return " ".join(self.correct_word(word) for word in text.split())
+
+    def load_memo(self, file_path: str) -> int:
+        """
+        Load a memo saved by `save_memo` if it was built with the same custom spelling dictionary and backend.
+
+        Args:
+            file_path (str): The path of the JSON memo file.
+
+        Returns:
+            int: The number of loaded corrections.
+        """
+        if not os.path.exists(file_path):
+            return 0
+
+        with open(file_path, encoding="utf-8") as memo_file:
+            saved_memo: dict[str, any] = json.load(memo_file)
+
+        if saved_memo.get("dictionary_hash") != self.dictionary_hash:
+            return 0
+
+        corrections: dict[str, str] = saved_memo.get("corrections", {})
+        with self.memo_lock:
+            for word, corrected_word in corrections.items():
+                self.memo.setdefault(word, corrected_word)
+            while len(self.memo) > self.max_memo_size:
+                self.memo.popitem(last=False)
+
+        return len(corrections)
+
+    def save_memo(self, file_path: str) -> None:
+        """
+        Save the memo to a JSON file.
+
+        Args:
+            file_path (str): The path of the JSON memo file.
+
+        Returns:
+            None
+        """
+        with self.memo_lock:
+            corrections: dict[str, str] = dict(self.memo)
+
+        directory: str = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(file_path, "w", encoding="utf-8") as memo_file:
+            json.dump({"dictionary_hash": self.dictionary_hash, "corrections": corrections}, memo_file, ensure_ascii=False)
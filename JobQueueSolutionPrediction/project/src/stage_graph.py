@@ -0,0 +1,278 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+from typing import Callable, Optional
+
+
+class Stage:
+    """
+    A step of the training pipeline with declared inputs and outputs.
+
+    The key of a stage is the hash of its configuration sections, the contents of its input files
+    and the keys of the stages producing its inputs, so a stage is invalidated by any upstream change.
+    Outputs are pickled by default; stages with outputs that cannot be pickled provide `save` and `load`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[..., dict[str, object]],
+        inputs: list[str],
+        outputs: list[str],
+        config_keys: list[str] = None,
+        files: list[str] = None,
+        artifacts: list[str] = None,
+        save: Optional[Callable[[dict[str, object], str], None]] = None,
+        load: Optional[Callable[[str], dict[str, object]]] = None
+    ):
+        self.name: str = name
+        self.run: Callable[..., dict[str, object]] = run
+        self.inputs: list[str] = inputs
+        self.outputs: list[str] = outputs
+        self.config_keys: list[str] = config_keys or []
+        self.files: list[str] = files or []
+        self.artifacts: list[str] = artifacts or []
+        self.save: Optional[Callable[[dict[str, object], str], None]] = save
+        self.load: Optional[Callable[[str], dict[str, object]]] = load
+
+
+class StageGraph:
+    """
+    Runs the training stages in order, loading the cached outputs of stages whose key is unchanged.
+
+    Every stage's outputs and key are stored in its own directory below `cache_dir`. Files and
+    artifacts are keys of the `paths` section of the configuration, resolved against `script_dir`.
+    """
+
+    def __init__(self, stages: list[Stage], config: dict[str, any], script_dir: str, cache_dir: str):
+        self.stages: list[Stage] = stages
+        self.config: dict[str, any] = config
+        self.script_dir: str = script_dir
+        self.cache_dir: str = cache_dir
+        self.timings: dict[str, float] = {}
+
+        producers: dict[str, str] = {}
+        for stage in stages:
+            missing_inputs: list[str] = [name for name in stage.inputs if name not in producers and name not in ("config", "script_dir")]
+            if missing_inputs:
+                raise ValueError(f"Stage {stage.name} has inputs that no earlier stage produces: {missing_inputs}")
+            producers.update({output: stage.name for output in stage.outputs})
+
+        self.producers: dict[str, str] = producers
+
+    def get_stage_dir(self, stage: Stage) -> str:
+        """
+        Return the directory holding the cached outputs and key of a stage.
+
+        Args:
+            stage (Stage): The stage.
+
+        Returns:
+            str: The directory of the stage.
+        """
+        return os.path.join(self.cache_dir, stage.name)
+
+    def get_config_value(self, config_key: str) -> object:
+        """
+        Resolve a dotted key, such as `paths.entities`, in the configuration.
+
+        Args:
+            config_key (str): The dotted key.
+
+        Returns:
+            object: The configuration value, or None if it does not exist.
+        """
+        value: object = self.config
+        for part in config_key.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+
+        return value
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """
+        Compute the content hash of a file, or of a marker if it does not exist.
+
+        Args:
+            file_path (str): The path of the file.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the file.
+        """
+        if not os.path.exists(file_path):
+            return "missing"
+
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def compute_keys(self) -> dict[str, str]:
+        """
+        Compute the key of every stage.
+
+        Args:
+            None
+
+        Returns:
+            dict[str, str]: The key of every stage by name.
+        """
+        keys: dict[str, str] = {}
+
+        for stage in self.stages:
+            upstream_stages: list[str] = sorted({self.producers[name] for name in stage.inputs if name in self.producers})
+            description: dict[str, object] = {
+                "stage": stage.name,
+                "config": {config_key: self.get_config_value(config_key) for config_key in stage.config_keys},
+                "files": {
+                    path_key: self.hash_file(os.path.join(self.script_dir, self.config['paths'][path_key])) for path_key in stage.files
+                },
+                "upstream": {name: keys[name] for name in upstream_stages}
+            }
+            keys[stage.name] = hashlib.sha256(json.dumps(description, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+        return keys
+
+    def is_cached(self, stage: Stage, key: str) -> bool:
+        """
+        Check whether a stage's cached outputs were produced with the given key and its artifacts exist.
+
+        Args:
+            stage (Stage): The stage.
+            key (str): The current key of the stage.
+
+        Returns:
+            bool: Whether the stage can be skipped.
+        """
+        key_path: str = os.path.join(self.get_stage_dir(stage), "key.txt")
+        if not os.path.exists(key_path):
+            return False
+
+        with open(key_path) as key_file:
+            if key_file.read().strip() != key:
+                return False
+
+        return all(os.path.exists(os.path.join(self.script_dir, self.config['paths'][path_key])) for path_key in stage.artifacts)
+
+    def save_outputs(self, stage: Stage, outputs: dict[str, object], key: str) -> None:
+        """
+        Save a stage's outputs and key, writing the key last so that an interrupted save is not reused.
+
+        Args:
+            stage (Stage): The stage.
+            outputs (dict[str, object]): The outputs of the stage.
+            key (str): The key of the stage.
+
+        Returns:
+            None
+        """
+        stage_dir: str = self.get_stage_dir(stage)
+        os.makedirs(stage_dir, exist_ok=True)
+
+        key_path: str = os.path.join(stage_dir, "key.txt")
+        if os.path.exists(key_path):
+            os.remove(key_path)
+
+        if stage.save is not None:
+            stage.save(outputs, stage_dir)
+        elif stage.outputs:
+            with open(os.path.join(stage_dir, "outputs.pkl"), "wb") as outputs_file:
+                pickle.dump(outputs, outputs_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with open(key_path, "w") as key_file:
+            key_file.write(key)
+
+    def load_outputs(self, stage: Stage) -> dict[str, object]:
+        """
+        Load a stage's cached outputs.
+
+        Args:
+            stage (Stage): The stage.
+
+        Returns:
+            dict[str, object]: The outputs of the stage.
+        """
+        stage_dir: str = self.get_stage_dir(stage)
+
+        if stage.load is not None:
+            return stage.load(stage_dir)
+        if not stage.outputs:
+            return {}
+
+        with open(os.path.join(stage_dir, "outputs.pkl"), "rb") as outputs_file:
+            outputs: dict[str, object] = pickle.load(outputs_file)
+
+        return outputs
+
+    def plan(self, from_stage: Optional[str] = None) -> list[tuple[Stage, str, bool]]:
+        """
+        Decide which stages run and which load their cached outputs.
+
+        Args:
+            from_stage (Optional[str]): The stage from which every stage is rerun regardless of its cache. Defaults to None.
+
+        Returns:
+            list[tuple[Stage, str, bool]]: Every stage with its key and whether it runs.
+        """
+        names: list[str] = [stage.name for stage in self.stages]
+        if from_stage is not None and from_stage not in names:
+            raise ValueError(f"Unknown stage: {from_stage}. Stages: {', '.join(names)}")
+
+        keys: dict[str, str] = self.compute_keys()
+        forced: bool = False
+        plan: list[tuple[Stage, str, bool]] = []
+
+        for stage in self.stages:
+            forced = forced or stage.name == from_stage
+            plan.append((stage, keys[stage.name], forced or not self.is_cached(stage, keys[stage.name])))
+
+        return plan
+
+    def run(self, from_stage: Optional[str] = None, dry_run: bool = False) -> dict[str, object]:
+        """
+        Run the stages, loading the outputs of unchanged stages that are not needed downstream of a rerun.
+
+        Args:
+            from_stage (Optional[str]): The stage from which every stage is rerun regardless of its cache. Defaults to None.
+            dry_run (bool): Only print which stages would run. Defaults to False.
+
+        Returns:
+            dict[str, object]: All produced and loaded outputs.
+        """
+        plan: list[tuple[Stage, str, bool]] = self.plan(from_stage)
+        needed: set[str] = set()
+        for stage, _, runs in plan:
+            if runs:
+                needed.update(stage.inputs)
+
+        for stage, key, runs in plan:
+            print(f"{stage.name}: {'run' if runs else 'cached'} ({key[:12]})")
+
+        if dry_run:
+            return {}
+
+        context: dict[str, object] = {"config": self.config, "script_dir": self.script_dir}
+
+        for stage, key, runs in plan:
+            start: float = time.perf_counter()
+
+            if runs:
+                outputs: dict[str, object] = stage.run(**{name: context[name] for name in stage.inputs})
+                self.save_outputs(stage, outputs, key)
+            elif any(output in needed for output in stage.outputs):
+                outputs = self.load_outputs(stage)
+            else:
+                outputs = {}
+
+            context.update(outputs)
+            self.timings[stage.name] = time.perf_counter() - start
+            print(f"Stage {stage.name} {'ran' if runs else 'was cached'} in {self.timings[stage.name]:.2f}s.")
+
+        for name, seconds in self.timings.items():
+            print(f"{name}: {seconds:.2f}s")
+
+        return context
@@ -0,0 +1,177 @@
+import pickle
+from typing import Optional
+from spellchecker import SpellChecker
+
+
+class SymSpell:
+    """
+    Spelling correction with a precomputed symmetric-delete index.
+
+    Every dictionary word is indexed under all strings obtained by deleting up to
+    `max_edit_distance` characters from its first `prefix_length` characters. Candidates for a
+    misspelled word are looked up with the deletes of its own prefix and verified with the
+    optimal string alignment distance, so no insert or replace edits have to be generated.
+    Corrections follow pyspellchecker: the closest known word, ties broken by frequency.
+    """
+
+    def __init__(self, frequencies: dict[str, int], max_edit_distance: int = 2, prefix_length: int = 7):
+        self.max_edit_distance: int = max_edit_distance
+        self.prefix_length: int = prefix_length
+        self.dictionary_hash: Optional[str] = None
+        self.words: list[str] = list(frequencies)
+        self.frequencies: dict[str, int] = dict(frequencies)
+        self.longest_word_length: int = max((len(word) for word in self.words), default=0)
+        self.deletes: dict[str, list[int]] = {}
+
+        for word_id, word in enumerate(self.words):
+            for delete in self.get_deletes(word[:prefix_length], max_edit_distance):
+                self.deletes.setdefault(delete, []).append(word_id)
+
+    @staticmethod
+    def from_spellchecker(
+        file_path: str,
+        max_edit_distance: int = 2,
+        prefix_length: int = 7,
+        dictionary_hash: Optional[str] = None
+    ) -> "SymSpell":
+        """
+        Build the index from the German pyspellchecker frequency list merged with the custom spelling dictionary.
+
+        Args:
+            file_path (str): The path of the text file to read the custom spelling from.
+            max_edit_distance (int, optional): The maximum edit distance of a correction. Defaults to 2.
+            prefix_length (int, optional): The number of leading characters that are indexed. Defaults to 7.
+            dictionary_hash (Optional[str], optional): The hash of the custom spelling dictionary, stored with the index. Defaults to None.
+
+        Returns:
+            SymSpell: The built index.
+        """
+        spell: SpellChecker = SpellChecker(language="de")
+        spell.word_frequency.load_text_file(file_path)
+
+        symspell = SymSpell(dict(spell.word_frequency.dictionary), max_edit_distance, prefix_length)
+        symspell.dictionary_hash = dictionary_hash
+
+        return symspell
+
+    @staticmethod
+    def load(file_path: str) -> "SymSpell":
+        """
+        Load an index saved with `save`.
+
+        Args:
+            file_path (str): The path of the pickle file.
+
+        Returns:
+            SymSpell: The loaded index.
+        """
+        with open(file_path, "rb") as index_file:
+            symspell: SymSpell = pickle.load(index_file)
+
+        return symspell
+
+    def save(self, file_path: str) -> None:
+        """
+        Save the index using pickle.
+
+        Args:
+            file_path (str): The path to save the pickle file.
+
+        Returns:
+            None
+        """
+        with open(file_path, "wb") as index_file:
+            pickle.dump(self, index_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def get_deletes(word: str, max_edit_distance: int) -> set[str]:
+        """
+        Generate the word and every string obtained by deleting up to `max_edit_distance` characters from it.
+
+        Args:
+            word (str): The word.
+            max_edit_distance (int): The maximum number of deleted characters.
+
+        Returns:
+            set[str]: The word and its deletes.
+        """
+        deletes: set[str] = {word}
+        current: set[str] = {word}
+
+        for _ in range(max_edit_distance):
+            current = {candidate[:i] + candidate[i + 1:] for candidate in current for i in range(len(candidate))} - deletes
+            deletes |= current
+
+        return deletes
+
+    @staticmethod
+    def distance(source: str, target: str, max_distance: int) -> int:
+        """
+        Compute the optimal string alignment distance, stopping early once it exceeds `max_distance`.
+
+        Args:
+            source (str): The first word.
+            target (str): The second word.
+            max_distance (int): The largest distance of interest.
+
+        Returns:
+            int: The distance, or `max_distance + 1` if it is larger than `max_distance`.
+        """
+        if abs(len(source) - len(target)) > max_distance:
+            return max_distance + 1
+
+        previous_previous: list[int] = []
+        previous: list[int] = list(range(len(target) + 1))
+
+        for i in range(1, len(source) + 1):
+            current: list[int] = [i] + [0] * len(target)
+            for j in range(1, len(target) + 1):
+                cost: int = 0 if source[i - 1] == target[j - 1] else 1
+                current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+                if i > 1 and j > 1 and source[i - 1] == target[j - 2] and source[i - 2] == target[j - 1]:
+                    current[j] = min(current[j], previous_previous[j - 2] + 1)
+            if min(current) > max_distance:
+                return max_distance + 1
+            previous_previous, previous = previous, current
+
+        return min(previous[-1], max_distance + 1)
+
+    def __contains__(self, word: str) -> bool:
+        return word.lower() in self.frequencies
+
+    def correction(self, word: str) -> Optional[str]:
+        """
+        Find the most probable correction of a word.
+
+        Args:
+            word (str): The word to correct.
+
+        Returns:
+            Optional[str]: The closest known word with the highest frequency, the word itself if it
+                should not be checked, or None if there is no known word within `max_edit_distance`.
+        """
+        word = word.lower()
+
+        if word in self.frequencies or len(word) > self.longest_word_length + 3:
+            return word
+
+        best_word: Optional[str] = None
+        best_key: tuple[int, int, str] = (self.max_edit_distance + 1, 0, "")
+        seen: set[int] = set()
+
+        for delete in self.get_deletes(word[:self.prefix_length], self.max_edit_distance):
+            for word_id in self.deletes.get(delete, ()):
+                if word_id in seen:
+                    continue
+                seen.add(word_id)
+
+                candidate: str = self.words[word_id]
+                distance: int = self.distance(word, candidate, self.max_edit_distance)
+                if distance > self.max_edit_distance:
+                    continue
+
+                key: tuple[int, int, str] = (distance, -self.frequencies[candidate], candidate)
+                if best_word is None or key < best_key:
+                    best_word, best_key = candidate, key
+
+        return best_word
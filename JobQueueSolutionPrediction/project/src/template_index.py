@@ -0,0 +1,103 @@
+import re
+import sys
+import hashlib
+from typing import Optional
+
+sys.path.append('src')
+
+from src.named_entity_recognition import NamedEntityRecognition
+
+
+class TemplateIndex:
+    """
+    Maps fingerprints of normalized, masked job queue errors to their intent tag.
+
+    The index is built from the training utterances at training time. A production error
+    whose fingerprint matches a training utterance is answered with a dictionary lookup
+    instead of running preprocessing and the model.
+
+    Entities are masked with the token patterns of `NamedEntityRecognition`, like the Matcher does:
+    every whitespace-separated word that matches a pattern, once the surrounding quotes and punctuation
+    are stripped, is replaced by the placeholder of the first matching label.
+    """
+
+    token_patterns: list[tuple[str, re.Pattern]] = [
+        (NamedEntityRecognition.get_placeholder(label), re.compile(pattern))
+        for label, pattern in NamedEntityRecognition.token_patterns.items()
+    ]
+    word_punctuation: str = "'\"()[]{}<>,;:!?."
+    separator_pattern: re.Pattern = re.compile(r"[\W_]+")
+
+    def __init__(self, fingerprints: dict[str, str]):
+        self.fingerprints: dict[str, str] = fingerprints
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Normalize a job queue error by masking emails, users and numbers, lowercasing it and collapsing punctuation.
+
+        Args:
+            text (str): The job queue error.
+
+        Returns:
+            str: The normalized job queue error.
+        """
+        words: list[str] = [
+            next((placeholder for placeholder, pattern in TemplateIndex.token_patterns if pattern.search(word.strip(TemplateIndex.word_punctuation))), word)
+            for word in text.split()
+        ]
+        text = TemplateIndex.separator_pattern.sub(" ", " ".join(words).lower())
+
+        return text.strip()
+
+    @staticmethod
+    def fingerprint(text: str) -> str:
+        """
+        Compute the fingerprint of a job queue error.
+
+        Args:
+            text (str): The job queue error.
+
+        Returns:
+            str: The hexadecimal SHA-1 digest of the normalized job queue error.
+        """
+        return hashlib.sha1(TemplateIndex.normalize(text).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def build(training_utterances: list[str], training_labels: list[str]) -> "TemplateIndex":
+        """
+        Build the index from the training utterances, dropping fingerprints shared by different labels.
+
+        Args:
+            training_utterances (list[str]): The list of utterances.
+            training_labels (list[str]): The list of labels.
+
+        Returns:
+            TemplateIndex: The built template index.
+        """
+        fingerprints: dict[str, str] = {}
+        ambiguous: set[str] = set()
+
+        for utterance, label in zip(training_utterances, training_labels):
+            fingerprint: str = TemplateIndex.fingerprint(utterance)
+
+            if fingerprints.get(fingerprint, label) != label:
+                ambiguous.add(fingerprint)
+            fingerprints[fingerprint] = label
+
+        for fingerprint in ambiguous:
+            del fingerprints[fingerprint]
+
+        return TemplateIndex(fingerprints)
+
+    def lookup(self, job_queue_error: str) -> Optional[str]:
+        """
+        Look up the tag of a job queue error.
+
+        Args:
+            job_queue_error (str): The job queue error.
+
+        Returns:
+            Optional[str]: The tag of the matching training utterance, or None if there is no match.
+        """
+        return self.fingerprints.get(self.fingerprint(job_queue_error))
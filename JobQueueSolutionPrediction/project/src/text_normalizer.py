@@ -0,0 +1,102 @@
+import re
+import threading
+from typing import Optional
+from nltk.corpus import stopwords
+
+
+class TextNormalizer:
+    """
+    Single-pass replacement for the lowercase, remove_unimportant, replace_abbreviations and
+    remove_stopwords steps of `TextPreprocessing`, producing the same output as running them in order.
+
+    The URL removal is the only regular expression left. The literal replacements are done with
+    `str.replace`, the punctuation with one translate table. The text is split once, and every
+    token is mapped through a precomputed table of its expansion with the stopwords already removed.
+    """
+
+    url_pattern: re.Pattern = re.compile(r"https?:\/\/.*[\r\n]*", flags=re.MULTILINE)
+    literal_replacements: tuple[tuple[str, str], ...] = (("<a href", " "), ("&amp;", ""))
+    # `remove_unimportant_data` also replaces "<br />", but "/" is already a space at that point.
+    punctuation_table: dict[int, str] = str.maketrans({character: " " for character in "_'-;%()|+&=*.,!?:#$@[]/\""})
+
+    _stopwords: Optional[frozenset[str]] = None
+    _instances: dict[int, tuple[dict[str, str], "TextNormalizer"]] = {}
+    _lock: threading.Lock = threading.Lock()
+
+    def __init__(self, contractions: dict[str, str]):
+        stops: frozenset[str] = self.get_stopwords()
+
+        self.contractions: dict[str, str] = contractions
+        self.expansions: dict[str, tuple[str, ...]] = {
+            word: tuple(expanded_word for expanded_word in expansion.split() if expanded_word not in stops)
+            for word, expansion in contractions.items()
+        }
+        self.stopwords: frozenset[str] = stops
+
+    @staticmethod
+    def get_stopwords() -> frozenset[str]:
+        """
+        Return the German NLTK stopwords, reading them on the first request.
+
+        Args:
+            None
+
+        Returns:
+            frozenset[str]: The stopwords.
+        """
+        if TextNormalizer._stopwords is None:
+            TextNormalizer._stopwords = frozenset(stopwords.words("german"))
+
+        return TextNormalizer._stopwords
+
+    @staticmethod
+    def get_instance(contractions: dict[str, str]) -> "TextNormalizer":
+        """
+        Return the shared normalizer for a contractions dictionary, building it on the first request.
+        The contractions are expected not to change after they were loaded.
+
+        Args:
+            contractions (dict[str, str]): Dictionary of contractions.
+
+        Returns:
+            TextNormalizer: The shared normalizer.
+        """
+        entry: Optional[tuple[dict[str, str], TextNormalizer]] = TextNormalizer._instances.get(id(contractions))
+
+        if entry is None or entry[0] is not contractions:
+            with TextNormalizer._lock:
+                entry = TextNormalizer._instances.get(id(contractions))
+                if entry is None or entry[0] is not contractions:
+                    entry = (contractions, TextNormalizer(contractions))
+                    TextNormalizer._instances[id(contractions)] = entry
+
+        return entry[1]
+
+    def normalize(self, text: str) -> str:
+        """
+        Lowercase the text, remove unimportant data, expand abbreviations and remove stopwords.
+
+        Args:
+            text (str): The text to be normalized.
+
+        Returns:
+            str: The normalized text.
+        """
+        text = text.lower()
+
+        if "http" in text:
+            text = self.url_pattern.sub("", text)
+        for old, new in self.literal_replacements:
+            if old in text:
+                text = text.replace(old, new)
+        text = text.translate(self.punctuation_table)
+
+        words: list[str] = []
+        for word in text.split():
+            expansion: Optional[tuple[str, ...]] = self.expansions.get(word)
+            if expansion is not None:
+                words.extend(expansion)
+            elif word not in self.stopwords:
+                words.append(word)
+
+        return " ".join(words)
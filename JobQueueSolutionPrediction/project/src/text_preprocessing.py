@@ -1,10 +1,13 @@
 import re
-import os
+import sys
 import spacy
-import spellchecker
-from typing import Callable
-from nltk.corpus import stopwords
-from spellchecker import SpellChecker
+from typing import Optional
+
+sys.path.append('src')
+
+from src.spacy_pipelines import SpacyPipelines
+from src.text_normalizer import TextNormalizer
+from src.spelling_correction import SpellingCorrector
 
 
 class TextPreprocessing:
@@ -77,7 +80,7 @@ class TextPreprocessing:
             str: The adjusted text with stopwords removed.
         """
         new_text: str = text.split()
-        stops: set = set(stopwords.words("german"))
+        stops: frozenset[str] = TextNormalizer.get_stopwords()
         new_text = [w for w in new_text if not w in stops]
         new_text = " ".join(new_text)
         
@@ -95,18 +98,7 @@ class TextPreprocessing:
         Returns:
             str: The adjusted text with spelling mistakes corrected.
         """ 
-        spell: spellchecker = SpellChecker(language="de")
-        spell.word_frequency.load_text_file(file_path)
-        corrected_text: list[str] = []
-        words: list[str] = text.split()
-        
-        for word in words:
-            corrected_word: str = spell.correction(word)
-            corrected_text.append(word if word in spell else corrected_word if isinstance(corrected_word, str) else word)
-
-        text = " ".join(corrected_text)
-        
-        return text
+        return SpellingCorrector.get_instance(file_path).correct(text)
 
     @staticmethod
     def lemmatize_text(text: str, spacy_trained_pipeline: str) -> str:
@@ -120,7 +112,7 @@ class TextPreprocessing:
         Returns:
             str: The lemmatized text.
         """
-        nlp: spacy.Language = spacy.load(spacy_trained_pipeline)
+        nlp: spacy.Language = SpacyPipelines.get_lemmatizer(spacy_trained_pipeline)
         doc: spacy.tokens.Doc = nlp(text)
         
         lemmas: list[str] = [token.lemma_ for token in doc]
@@ -129,59 +121,60 @@ class TextPreprocessing:
         return lemmatized_text
 
     @staticmethod
-    def clean_text(text: str, contractions: dict[str, str], spelling_file_path: str, spacy_trained_pipeline: str) -> list[str]:
+    def lemmatize_texts(texts: list[str], 
+                        spacy_trained_pipeline: str, 
+                        batch_size: int = 256, 
+                        n_process: int = 1,
+                        word_lemmas: Optional[list[list[tuple[str, str]]]] = None
+    ) -> list[str]:
         """
-        Cleans the text by removing unwanted characters, stopwords, and lemmatizing the text.
+        Lemmatizes a batch of texts with `nlp.pipe`, keeping their order.
 
         Args:
-            text (str): The text to be cleaned.
-            contractions (dict[str, str]): Dictionary of contractions.
-            file_path (str): The path of the text file to read the custom spelling from.
+            texts (list[str]): The texts to be lemmatized.
             spacy_trained_pipeline: (str): The trained pipeline from spacy that will be used.
+            batch_size (int, optional): The number of texts per spaCy batch. Defaults to 256.
+            n_process (int, optional): The number of processes, -1 for one per CPU. Defaults to 1.
+            word_lemmas (Optional[list[list[tuple[str, str]]]], optional): If given, the word and lemma
+                of every whitespace-separated word are appended to it, one list per text. Defaults to None.
 
         Returns:
-            list[str]: The cleaned text as a list of strings.
+            list[str]: The lemmatized texts.
         """
-        text = TextPreprocessing.lower_text(text)
-        text = TextPreprocessing.remove_unimportant_data(text)
-        text = TextPreprocessing.replace_abbreviations(text, contractions)
-        text = TextPreprocessing.remove_stopwords(text)
-        text = TextPreprocessing.correct_spelling(text, spelling_file_path)
-        text = TextPreprocessing.lemmatize_text(text, spacy_trained_pipeline)
-        
-        return text
+        nlp: spacy.Language = SpacyPipelines.get_lemmatizer(spacy_trained_pipeline)
+        lemmatized_texts: list[str] = []
+
+        for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+            lemmas: list[str] = [token.lemma_ for token in doc]
+            lemmatized_texts.append(" ".join(lemmas))
+
+            if word_lemmas is not None:
+                text_word_lemmas: list[tuple[str, str]] = []
+                word_start: int = 0
+                for token in doc:
+                    if token.whitespace_ or token.i == len(doc) - 1:
+                        text_word_lemmas.append((doc[word_start:token.i + 1].text, " ".join(lemmas[word_start:token.i + 1])))
+                        word_start = token.i + 1
+                word_lemmas.append(text_word_lemmas)
+
+        return lemmatized_texts
 
     @staticmethod
-    def preprocess_utterance(user_utterance: str, 
-                             preprocessing_functions: dict[str, Callable[[str], str]], 
-                             contractions: dict[str, str],
-                             config: dict[str, any]
-    ) -> str:
+    def clean_text(text: str, contractions: dict[str, str], spelling_file_path: str, spacy_trained_pipeline: str) -> list[str]:
         """
-        Preprocesses the user utterance using the provided preprocessing functions.
+        Cleans the text by removing unwanted characters, stopwords, and lemmatizing the text.
 
         Args:
-            user_utterance (str): The utterance to be preprocessed.
-            preprocessing_functions (dict[str, Callable[[str], str]]): Dictionary of preprocessing functions.
+            text (str): The text to be cleaned.
             contractions (dict[str, str]): Dictionary of contractions.
-            config (dict[str, any]): The configuration file.
+            file_path (str): The path of the text file to read the custom spelling from.
+            spacy_trained_pipeline: (str): The trained pipeline from spacy that will be used.
 
         Returns:
-            str: The preprocessed user utterance.
+            list[str]: The cleaned text as a list of strings.
         """
-        processed_utterance: str = user_utterance
-        parent_script_dir: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        
-        for function_name, function in preprocessing_functions.items():
-            switch = {
-                "lowercase": lambda: function(processed_utterance),
-                "remove_unimportant": lambda: function(processed_utterance),
-                "replace_abbreviations": lambda: function(processed_utterance, contractions),
-                "remove_stopwords": lambda: function(processed_utterance),
-                "correct_spelling": lambda: function(processed_utterance, os.path.join(parent_script_dir, config['paths']['spelling'])),
-                "lemmatize": lambda: function(processed_utterance, config['spacy']['trained_pipeline']),
-            }
+        text = TextNormalizer.get_instance(contractions).normalize(text)
+        text = TextPreprocessing.correct_spelling(text, spelling_file_path)
+        text = TextPreprocessing.lemmatize_text(text, spacy_trained_pipeline)
         
-            processed_utterance = switch.get(function_name, lambda: processed_utterance)()
-
-        return processed_utterance
\ No newline at end of file
+        return text
@@ -0,0 +1,134 @@
+import threading
+import numpy as np
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    import tensorflow as tf
+
+
+class TFLiteModel:
+    """
+    Serving backend running a TFLite export of the Keras text classifier through `tf.lite.Interpreter`.
+
+    The exported model has a fixed `[batch_size, max_sequence_length]` input signature; larger
+    inputs are split into chunks and the last chunk is padded.
+    """
+
+    quantizations: tuple[str, ...] = ("float16", "int8")
+
+    def __init__(self, interpreter: "tf.lite.Interpreter"):
+        self.interpreter: tf.lite.Interpreter = interpreter
+        self.interpreter.allocate_tensors()
+        self.input_details: dict[str, any] = self.interpreter.get_input_details()[0]
+        self.output_details: dict[str, any] = self.interpreter.get_output_details()[0]
+        self.batch_size: int = int(self.input_details["shape"][0])
+        self.lock: threading.Lock = threading.Lock()
+
+    @property
+    def output_shape(self) -> tuple[None, int]:
+        """
+        The output shape of the model, matching the Keras `output_shape` attribute.
+
+        Returns:
+            tuple[None, int]: The batch dimension and the number of labels.
+        """
+        return (None, int(self.output_details["shape"][-1]))
+
+    @staticmethod
+    def export(
+        model: "tf.keras.models.Sequential",
+        file_path: str,
+        quantization: str,
+        calibration_data: np.ndarray,
+        batch_size: int
+    ) -> None:
+        """
+        Convert a trained Keras model to a post-training quantized TFLite model with a fixed input signature.
+
+        Args:
+            model (tf.keras.models.Sequential): The trained Keras model.
+            file_path (str): The path to save the `.tflite` file.
+            quantization (str): Either `float16` or `int8`.
+            calibration_data (np.ndarray): Vectorized training utterances used to calibrate the int8 quantization.
+            batch_size (int): The fixed batch size of the input signature.
+
+        Returns:
+            None
+        """
+        if quantization not in TFLiteModel.quantizations:
+            raise ValueError(f"Unknown TFLite quantization: {quantization}")
+
+        import tensorflow as tf
+
+        inputs = tf.keras.Input(shape=(calibration_data.shape[1],), batch_size=batch_size, dtype=tf.int32)
+        fixed_model: tf.keras.Model = tf.keras.Model(inputs, model(inputs, training=False))
+
+        converter: tf.lite.TFLiteConverter = tf.lite.TFLiteConverter.from_keras_model(fixed_model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+        if quantization == "float16":
+            converter.target_spec.supported_types = [tf.float16]
+        else:
+            def representative_dataset() -> Iterator[list[np.ndarray]]:
+                for batch in TFLiteModel.get_batches(calibration_data.astype(np.int32), batch_size):
+                    yield [batch]
+
+            converter.representative_dataset = representative_dataset
+
+        with open(file_path, "wb") as tflite_file:
+            tflite_file.write(converter.convert())
+
+    @staticmethod
+    def load(file_path: str) -> "TFLiteModel":
+        """
+        Load a TFLite model.
+
+        Args:
+            file_path (str): The path to the `.tflite` file.
+
+        Returns:
+            TFLiteModel: The loaded model.
+        """
+        import tensorflow as tf
+
+        return TFLiteModel(tf.lite.Interpreter(model_path=file_path))
+
+    @staticmethod
+    def get_batches(x: np.ndarray, batch_size: int) -> Iterator[np.ndarray]:
+        """
+        Split the input into batches of exactly `batch_size` rows, padding the last batch with zeros.
+
+        Args:
+            x (np.ndarray): The input of shape (rows, max_sequence_length).
+            batch_size (int): The batch size.
+
+        Returns:
+            Iterator[np.ndarray]: The batches.
+        """
+        for start in range(0, len(x), batch_size):
+            batch: np.ndarray = x[start:start + batch_size]
+            if len(batch) < batch_size:
+                batch = np.pad(batch, ((0, batch_size - len(batch)), (0, 0)))
+            yield batch
+
+    def predict(self, x: np.ndarray, verbose: int = 0) -> np.ndarray:
+        """
+        Run the interpreter on a batch of vectorized utterances.
+
+        Args:
+            x (np.ndarray): The vectorized utterances of shape (batch, max_sequence_length).
+            verbose (int, optional): Ignored, accepted for compatibility with `Sequential.predict`. Defaults to 0.
+
+        Returns:
+            np.ndarray: The softmax output of shape (batch, num_labels).
+        """
+        x = np.asarray(x).astype(self.input_details["dtype"])
+        outputs: list[np.ndarray] = []
+
+        with self.lock:
+            for batch in self.get_batches(x, self.batch_size):
+                self.interpreter.set_tensor(self.input_details["index"], batch)
+                self.interpreter.invoke()
+                outputs.append(self.interpreter.get_tensor(self.output_details["index"]).copy())
+
+        return np.concatenate(outputs)[:len(x)]
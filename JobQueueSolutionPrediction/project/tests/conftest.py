@@ -0,0 +1,77 @@
+import os
+import sys
+import json
+import pickle
+import pytest
+import numpy as np
+
+PROJECT_DIR: str = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+
+@pytest.fixture
+def serving_dir(tmp_path) -> str:
+    """
+    Write a minimal set of prediction artifacts for the TensorFlow-free serving path: a dictionary
+    vectorizer, a NumPy model, rule-based entity masking and a blank German spaCy tokenizer.
+    """
+    spacy = pytest.importorskip("spacy")
+    preprocessing = pytest.importorskip("sklearn.preprocessing")
+
+    tags: list[str] = ["drucker", "email"]
+    intents: dict[str, list[dict[str, object]]] = {"intents": [
+        {"tag": "drucker", "patterns": ["Der Drucker ist offline."], "response": "Drucker neu starten."},
+        {"tag": "email", "patterns": ["Die E-Mail-Adresse ist ungültig."], "response": "E-Mail-Adresse prüfen."}
+    ]}
+    (tmp_path / "intents.json").write_text(json.dumps(intents), encoding="utf-8")
+    (tmp_path / "contractions.txt").write_text("z.B.=zum Beispiel\n", encoding="utf-8")
+    (tmp_path / "entities.txt").write_text("Benutzer:\n- Max Mustermann\n", encoding="utf-8")
+    (tmp_path / "spelling.txt").write_text("drucker offline email ungültig\n", encoding="utf-8")
+    (tmp_path / "preprocessing_spec.json").write_text(
+        json.dumps({"version": 1, "steps": [{"name": "lowercase"}]}), encoding="utf-8"
+    )
+    spacy.blank("de").to_disk(tmp_path / "tokenizer")
+
+    vectorizer_config: dict[str, object] = {
+        "standardize": "lower_and_strip_punctuation", "split": "whitespace", "ngrams": None, "output_mode": "int",
+        "output_sequence_length": 6, "vocabulary": ["", "[UNK]", "drucker", "offline", "email", "ungültig"]
+    }
+    with open(tmp_path / "vectorizer.pkl", "wb") as vectorizer_file:
+        pickle.dump({"config": vectorizer_config, "weights": []}, vectorizer_file)
+
+    label_encoder = preprocessing.LabelEncoder().fit(tags)
+    with open(tmp_path / "label_encoder.pkl", "wb") as label_encoder_file:
+        pickle.dump(label_encoder, label_encoder_file)
+
+    embeddings: np.ndarray = np.zeros((6, 2), dtype=np.float32)
+    embeddings[2:4, 0] = 1.0
+    embeddings[4:6, 1] = 1.0
+    layers: list[dict[str, object]] = [
+        {"class_name": "Embedding", "config": {}, "num_weights": 1},
+        {"class_name": "GlobalMaxPooling1D", "config": {}, "num_weights": 0},
+        {"class_name": "Dense", "config": {"activation": "softmax"}, "num_weights": 2}
+    ]
+    np.savez_compressed(
+        tmp_path / "numpy_model.npz", layers=np.array(json.dumps(layers)), layer_0_weight_0=embeddings,
+        layer_2_weight_0=np.eye(2, dtype=np.float32) * 4.0, layer_2_weight_1=np.zeros(2, dtype=np.float32)
+    )
+
+    config: dict[str, object] = {
+        "paths": {
+            "intents": "intents.json",
+            "contractions": "contractions.txt",
+            "entities": "entities.txt",
+            "spelling": "spelling.txt",
+            "preprocessing_spec": "preprocessing_spec.json",
+            "nlp": "trained_nlp",
+            "vectorizer": "vectorizer.pkl",
+            "label_encoder": "label_encoder.pkl",
+            "numpy_model": "numpy_model.npz",
+            "prediction_store": "prediction_store.sqlite"
+        },
+        "spacy": {"trained_pipeline": str(tmp_path / "tokenizer")},
+        "serving": {"backend": "numpy", "vectorizer": "dictionary", "entity_masking": True, "ner_fallback": False}
+    }
+    (tmp_path / "config.json").write_text(json.dumps(config), encoding="utf-8")
+
+    return str(tmp_path)
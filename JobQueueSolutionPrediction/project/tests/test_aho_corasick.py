@@ -0,0 +1,44 @@
+from src.aho_corasick import AhoCorasick
+
+
+def find_all_naive(phrases: list[tuple[tuple[str, ...], str]], symbols: list[str]) -> list[tuple[int, int, str]]:
+    return sorted(
+        (start, start + len(phrase), label)
+        for phrase, label in set(phrases) if phrase
+        for start in range(len(symbols) - len(phrase) + 1)
+        if tuple(symbols[start:start + len(phrase)]) == phrase
+    )
+
+
+def test_finds_overlapping_and_nested_phrases():
+    automaton = AhoCorasick([(("a", "b"), "AB"), (("b", "c"), "BC"), (("a", "b", "c"), "ABC"), (("b",), "B")])
+
+    assert sorted(automaton.find_all(["x", "a", "b", "c", "a", "b"])) == [
+        (1, 3, "AB"), (1, 4, "ABC"), (2, 3, "B"), (2, 4, "BC"), (4, 6, "AB"), (5, 6, "B")
+    ]
+
+
+def test_follows_failure_links_after_a_partial_match():
+    automaton = AhoCorasick([(("a", "a", "b"), "AAB"), (("a", "b", "a"), "ABA")])
+
+    assert sorted(automaton.find_all(["a", "a", "a", "b", "a"])) == [(1, 4, "AAB"), (2, 5, "ABA")]
+
+
+def test_same_phrase_with_several_labels_and_duplicates():
+    automaton = AhoCorasick([(("CRONUS",), "Mandant"), (("CRONUS",), "Firma"), (("CRONUS",), "Mandant"), ((), "Leer")])
+
+    assert sorted(automaton.find_all(["CRONUS", "AG"])) == [(0, 1, "Firma"), (0, 1, "Mandant")]
+
+
+def test_matches_naive_search():
+    phrases: list[tuple[tuple[str, ...], str]] = [
+        (("a",), "1"), (("a", "b"), "2"), (("b", "a", "b"), "3"), (("a", "b", "a", "b"), "4"), (("c", "c"), "5")
+    ]
+    symbols: list[str] = list("abababccabcabba")
+
+    assert sorted(AhoCorasick(phrases).find_all(symbols)) == find_all_naive(phrases, symbols)
+
+
+def test_no_phrases_and_no_symbols():
+    assert AhoCorasick([]).find_all(["a", "b"]) == []
+    assert AhoCorasick([(("a",), "A")]).find_all([]) == []
@@ -0,0 +1,68 @@
+import pytest
+
+pytest.importorskip("nlpaug")
+
+from collections import Counter
+
+from src.data_augmentation import DataAugmentation
+from src.augmentation_cache import AugmentationCache
+
+
+class FakeAugmenter:
+    """Augmenter appending the action and a counter to every text, optionally dropping the last result."""
+
+    def __init__(self, action: str, drop_last: bool = False):
+        self.action: str = action
+        self.drop_last: bool = drop_last
+        self.calls: list[list[str]] = []
+
+    def augment(self, texts: list[str]) -> list[str]:
+        self.calls.append(list(texts))
+        augmented: list[str] = [f"{text} {self.action}{i}" for i, text in enumerate(texts)]
+
+        return augmented[:-1] if self.drop_last else augmented
+
+
+@pytest.fixture
+def augmenters(monkeypatch) -> dict[str, FakeAugmenter]:
+    fakes: dict[str, FakeAugmenter] = {action: FakeAugmenter(action) for action in DataAugmentation.actions}
+    monkeypatch.setattr(DataAugmentation, "get_augmenter", lambda self, action: fakes[action])
+    monkeypatch.setattr(DataAugmentation, "seed_random", lambda self: None)
+
+    return fakes
+
+
+def test_augment_batches_requests_per_action(augmenters):
+    results: list[list[str]] = DataAugmentation().augment([("a", "insert", 2), ("b", "substitute", 1), ("a", "insert", 1)])
+
+    assert results == [["a insert0", "a insert1"], ["b substitute0"], ["a insert0"]]
+    assert augmenters["insert"].calls == [["a", "a"]]
+    assert augmenters["substitute"].calls == [["b"]]
+
+
+def test_augment_raises_when_the_augmenter_drops_results(augmenters):
+    augmenters["insert"].drop_last = True
+
+    with pytest.raises(ValueError, match="returned 1 utterances for 2 texts"):
+        DataAugmentation().augment([("a", "insert", 2)])
+
+
+def test_augment_only_generates_missing_augmentations(augmenters, tmp_path):
+    cache: AugmentationCache = AugmentationCache(str(tmp_path / "augmentation_cache.pkl"))
+    DataAugmentation(cache=cache).augment([("a", "insert", 1)])
+
+    assert DataAugmentation(cache=cache).augment([("a", "insert", 3)]) == [["a insert0", "a insert0", "a insert1"]]
+    assert augmenters["insert"].calls == [["a"], ["a", "a"]]
+
+
+def test_get_augmented_utterances_labels_fills_every_label(augmenters):
+    utterances, labels = DataAugmentation().get_augmented_utterances_labels(
+        ["a", "b", "c"], ["x", "y", "y"], Counter(["x", "y", "y"]), [], 2
+    )
+
+    assert utterances == ["a", "a insert0", "b", "c"]
+    assert labels == ["x", "x", "y", "y"]
+
+
+def test_get_utterances():
+    assert DataAugmentation.get_utterances("y", ["x", "y", "y"], ["a", "b", "c"]) == ["b", "c"]
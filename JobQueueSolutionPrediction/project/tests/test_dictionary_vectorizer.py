@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+
+from src.data_saving import DataSaving
+from src.dictionary_vectorizer import DictionaryVectorizer
+
+
+@pytest.fixture
+def vectorize_layer() -> "tf.keras.layers.TextVectorization":
+    layer = tf.keras.layers.TextVectorization(max_tokens=8, output_sequence_length=4)
+    layer.adapt(["drucker ist offline", "drucker druckt nicht", "Email ist ungültig", "ÜBER drucker"])
+
+    return layer
+
+
+def get_dictionary_vectorizer(layer: "tf.keras.layers.TextVectorization") -> DictionaryVectorizer:
+    return DictionaryVectorizer.from_saved(DataSaving.get_vectorizer_state(layer))
+
+
+@pytest.mark.parametrize("texts", [
+    ["Drucker, IST: offline!", "(email) [ungültig]?", "DRUCKER\tist\n\nOFFLINE"],
+    ["Scanner brennt", "drucker ÜBER über Über", "x-y_z"],
+    ["drucker ist offline drucker druckt nicht", "drucker", ""],
+])
+def test_matches_the_text_vectorization_layer(vectorize_layer, texts):
+    expected: np.ndarray = vectorize_layer(tf.constant(texts)).numpy()
+
+    np.testing.assert_array_equal(get_dictionary_vectorizer(vectorize_layer).vectorize(texts), expected)
+
+
+def test_pads_truncates_and_maps_unknown_tokens(vectorize_layer):
+    dictionary_vectorizer: DictionaryVectorizer = get_dictionary_vectorizer(vectorize_layer)
+    drucker: int = dictionary_vectorizer.token_ids["drucker"]
+
+    vectorized: np.ndarray = dictionary_vectorizer.vectorize(["Drucker", "scanner drucker drucker drucker drucker"])
+
+    np.testing.assert_array_equal(vectorized, [[drucker, 0, 0, 0], [1, drucker, drucker, drucker]])
+    assert vectorized.dtype == np.int32
+
+
+def test_rejects_unsupported_configurations():
+    layer = tf.keras.layers.TextVectorization(output_mode="multi_hot", vocabulary=["drucker"])
+
+    with pytest.raises(ValueError):
+        get_dictionary_vectorizer(layer)
+
+
+def test_saved_state_rebuilds_the_text_vectorization_layer(vectorize_layer):
+    from src.model_registry import ModelRegistry
+
+    texts: list[str] = ["Drucker ist offline", "scanner druckt nicht"]
+    rebuilt = ModelRegistry.build_vectorizer(DataSaving.get_vectorizer_state(vectorize_layer))
+
+    np.testing.assert_array_equal(rebuilt(tf.constant(texts)).numpy(), vectorize_layer(tf.constant(texts)).numpy())
@@ -0,0 +1,65 @@
+import pytest
+
+spacy = pytest.importorskip("spacy")
+pytest.importorskip("sklearn")
+
+from src.helper import Helper
+from src.entity_masker import EntityMasker
+from src.named_entity_recognition import NamedEntityRecognition
+
+ENTITIES: dict[str, list[str]] = {
+    "Benutzer": ["Max Mustermann", "Erika Musterfrau"],
+    "Mandant": ["CRONUS AG", "CRONUS"],
+    "Tabelle": ["Debitor"]
+}
+
+UTTERANCES: list[str] = [
+    "Die E-Mail-Adresse test.bobl@axians-infoma.com ist ungültig.",
+    "Die E-Mail-Adresse max.mustermann2@firma.de ist ungültig.",
+    "Der Benutzer FUM-GLOBAL\\Max.Mustermann hat keine Berechtigung für Debitor 10000.",
+    "Max Mustermann kann den Mandanten CRONUS AG nicht öffnen.",
+    "Der Auftrag 4711 im Mandanten CRONUS wurde von Erika Musterfrau gesperrt.",
+    "Debitor10000 existiert bereits.",
+    "Die Sitzung wurde beendet, bitte erneut anmelden.",
+    ""
+]
+
+
+@pytest.fixture
+def nlp():
+    return spacy.blank("de")
+
+
+def test_mask_replaces_entities_with_placeholders(nlp):
+    masker: EntityMasker = EntityMasker(ENTITIES, nlp)
+
+    assert masker.mask([UTTERANCES[3], UTTERANCES[4]]) == [
+        "`ENTITÄTSBENUTZER` kann den Mandanten `ENTITÄTSMANDANT` nicht öffnen.",
+        "Der Auftrag `ENTITÄTSNUMMER` im Mandanten `ENTITÄTSMANDANT` wurde von `ENTITÄTSBENUTZER` gesperrt."
+    ]
+
+
+def test_overlapping_patterns_prefer_the_earlier_token_pattern(nlp):
+    masker: EntityMasker = EntityMasker(ENTITIES, nlp)
+
+    assert masker.find_entities([UTTERANCES[1]]) == [[(19, 43, "Email")]]
+
+
+def test_mask_matches_the_matcher_and_phrase_matcher(nlp):
+    masker: EntityMasker = EntityMasker(ENTITIES, nlp)
+    matcher = NamedEntityRecognition.create_matcher(nlp)
+    phrase_matcher = NamedEntityRecognition.create_phrase_matcher(nlp, ENTITIES)
+
+    expected: list[str] = [
+        NamedEntityRecognition.rewrite_entities(utterance, NamedEntityRecognition.get_matcher_entities(nlp, matcher, phrase_matcher, doc))
+        for utterance, doc in zip(UTTERANCES, nlp.tokenizer.pipe(UTTERANCES))
+    ]
+
+    assert masker.mask(UTTERANCES) == expected
+
+
+def test_replace_entities_without_trained_nlp(nlp):
+    masker: EntityMasker = EntityMasker(ENTITIES, nlp)
+
+    assert Helper.replace_entities(UTTERANCES, None, masker) == masker.mask(UTTERANCES)
+    assert Helper.replace_entities(UTTERANCES, None, None) == UTTERANCES
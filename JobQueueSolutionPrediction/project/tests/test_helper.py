@@ -0,0 +1,71 @@
+import pytest
+import numpy as np
+
+pytest.importorskip("spacy")
+pytest.importorskip("sklearn")
+
+from sklearn.preprocessing import LabelEncoder
+
+from src.helper import Helper
+from src.dictionary_vectorizer import DictionaryVectorizer
+from src.preprocessing_pipeline import PreprocessingPipeline
+
+
+class FailingEntityMasker:
+    """Entity masker that fails on every batch containing the word "kaputt"."""
+
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    def find_entities(self, texts: list[str]) -> list[list[tuple[int, int, str]]]:
+        self.batches.append(list(texts))
+        if any("kaputt" in text for text in texts):
+            raise ValueError("Entity masking failed.")
+
+        return [[(0, 3, "Nummer")] if text.startswith("123") else [] for text in texts]
+
+
+def test_entity_replacement_errors_only_affect_their_message():
+    pipeline: PreprocessingPipeline = PreprocessingPipeline([("lowercase", str.lower)])
+
+    processed: list[tuple[object, object]] = Helper.process_job_queue_errors(
+        ["123 Fehler", "kaputt", None, "Drucker=offline"], None, pipeline, FailingEntityMasker()
+    )
+
+    assert processed == [
+        ("`entitätsnummer` fehler", None),
+        (None, "Entity masking failed."),
+        (None, "Error message must be a string, got NoneType."),
+        ("drucker offline", None)
+    ]
+
+
+def test_entities_are_replaced_in_one_batch_when_nothing_fails():
+    pipeline: PreprocessingPipeline = PreprocessingPipeline([("lowercase", str.lower)])
+    entity_masker: FailingEntityMasker = FailingEntityMasker()
+
+    assert Helper.process_job_queue_errors(["123 Fehler", "Drucker"], None, pipeline, entity_masker) == [
+        ("`entitätsnummer` fehler", None), ("drucker", None)
+    ]
+    assert entity_masker.batches == [["123 Fehler", "Drucker"]]
+
+
+class FixedModel:
+    """Model predicting the same probabilities for every input."""
+
+    output_shape: tuple[None, int] = (None, 3)
+
+    def predict(self, x: np.ndarray, verbose: int = 0) -> np.ndarray:
+        return np.tile(np.array([[0.2, 0.7, 0.1]], dtype=np.float32), (len(x), 1))
+
+
+def test_calculate_prediction_stores_the_best_prediction():
+    intents: dict[str, list[dict[str, str]]] = {"intents": [
+        {"tag": "a", "response": "Antwort A"}, {"tag": "b", "response": "Antwort B"}, {"tag": "c", "response": "Antwort C"}
+    ]}
+    helper: Helper = Helper()
+
+    helper.calculate_prediction("drucker offline", intents, DictionaryVectorizer({}, 4), LabelEncoder().fit(["a", "b", "c"]), FixedModel())
+
+    assert helper.prediction == "Antwort B"
+    assert helper.confidence == pytest.approx(0.7)
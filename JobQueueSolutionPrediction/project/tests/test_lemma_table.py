@@ -0,0 +1,75 @@
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from spacy.language import Language
+
+from src.lemma_table import LemmaTable
+from src.spacy_pipelines import SpacyPipelines
+from src.text_preprocessing import TextPreprocessing
+
+PIPELINE: str = "test_context_lemmatizer"
+
+TRAINING_TEXTS: list[str] = [
+    "die aufträge wurden gesperrt",
+    "der auftrag wurde gesperrt",
+    "gesperrt wurde der auftrag, bitte prüfen",
+    "die benutzer sind gesperrt",
+    "benutzer gesperrt",
+    ""
+]
+
+
+@Language.component("test_context_lemmatizer")
+def context_lemmatizer(doc: spacy.tokens.Doc) -> spacy.tokens.Doc:
+    """Lemmatize like a tagger would: the lemma of a word after "die" depends on that context."""
+    for token in doc:
+        after_article: bool = token.i > 0 and doc[token.i - 1].lower_ == "die"
+        token.lemma_ = f"{token.lower_}_plural" if after_article else token.lower_.rstrip("e")
+
+    return doc
+
+
+@pytest.fixture(autouse=True)
+def lemmatizer(monkeypatch):
+    nlp: spacy.Language = spacy.blank("de")
+    nlp.add_pipe("test_context_lemmatizer")
+    key: tuple[str, tuple[str, ...]] = (PIPELINE, tuple(sorted(SpacyPipelines.lemmatizer_excluded_components)))
+    monkeypatch.setitem(SpacyPipelines._pipelines, key, nlp)
+
+
+def build_table(texts: list[str]) -> LemmaTable:
+    word_lemmas: list[list[tuple[str, str]]] = []
+    TextPreprocessing.lemmatize_texts(texts, PIPELINE, word_lemmas=word_lemmas)
+
+    return LemmaTable.from_word_lemmas(word_lemmas)
+
+
+def test_table_matches_the_full_pipeline_on_the_training_set():
+    lemma_table: LemmaTable = build_table(TRAINING_TEXTS)
+
+    assert lemma_table.lemmatize_texts(TRAINING_TEXTS, PIPELINE) == TextPreprocessing.lemmatize_texts(TRAINING_TEXTS, PIPELINE)
+    assert [lemma_table.lemmatize_text(text, PIPELINE) for text in TRAINING_TEXTS] == [
+        TextPreprocessing.lemmatize_text(text, PIPELINE) for text in TRAINING_TEXTS
+    ]
+
+
+def test_context_dependent_words_are_left_out():
+    lemma_table: LemmaTable = build_table(TRAINING_TEXTS)
+
+    assert lemma_table.get("benutzer") is None
+    assert lemma_table.get("gesperrt") == "gesperrt"
+    assert lemma_table.get("auftrag,") == "auftrag ,"
+    assert lemma_table.get("aufträge") == "aufträge_plural"
+
+
+def test_texts_with_missing_words_are_lemmatized_in_context():
+    lemma_table: LemmaTable = build_table(TRAINING_TEXTS)
+    texts: list[str] = ["die benutzer wurden gesperrt", "der auftrag wurde gesperrt", "der  auftrag", "neue aufträge"]
+
+    assert lemma_table.lemmatize_texts(texts, PIPELINE) == [
+        "di benutzer_plural wurden gesperrt",
+        "der auftrag wurd gesperrt",
+        TextPreprocessing.lemmatize_text("der  auftrag", PIPELINE),
+        "neu aufträg"
+    ]
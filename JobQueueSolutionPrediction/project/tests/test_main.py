@@ -0,0 +1,42 @@
+import sys
+import importlib
+import pytest
+
+pytest.importorskip("flask")
+
+from src.model_registry import ModelRegistry
+
+
+@pytest.fixture
+def client(serving_dir):
+    ModelRegistry.reset()
+    ModelRegistry.get_instance(serving_dir)
+    main = importlib.reload(sys.modules["main"]) if "main" in sys.modules else importlib.import_module("main")
+
+    yield main.app.test_client()
+
+    main.batcher.close()
+    ModelRegistry.reset()
+
+
+@pytest.mark.parametrize("payload", [{"errorMessages": "Der Drucker ist offline"}, {"errorMessages": None}, {}, ["Der Drucker ist offline"]])
+def test_batch_rejects_error_messages_that_are_not_a_list(client, payload):
+    response = client.post("/predict/batch", json=payload)
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "errorMessages must be a list of error messages."}
+
+
+def test_batch_rejects_invalid_json(client):
+    response = client.post("/predict/batch", data="{", content_type="application/json")
+
+    assert response.status_code == 400
+
+
+def test_batch_reports_errors_per_message(client):
+    response = client.post("/predict/batch", json={"errorMessages": ["Der Drucker ist offline", 42]})
+
+    assert response.status_code == 200
+    predictions: list[dict[str, object]] = response.get_json()["predictions"]
+    assert predictions[0]["prediction"] == "Drucker neu starten." and predictions[0]["error"] is None
+    assert predictions[1]["prediction"] is None and predictions[1]["error"] == "Error message must be a string, got int."
@@ -0,0 +1,86 @@
+import threading
+import pytest
+from concurrent.futures import Future
+
+from src.micro_batcher import MicroBatcher
+
+
+class RecordingPredictor:
+    """Batch prediction function recording its batches, optionally blocking until released."""
+
+    def __init__(self, blocked: bool = False):
+        self.batches: list[list[str]] = []
+        self.release: threading.Event = threading.Event()
+        if not blocked:
+            self.release.set()
+
+    def __call__(self, texts: list[str]) -> list[tuple[str, float]]:
+        self.release.wait()
+        self.batches.append(list(texts))
+
+        return [(text.upper(), 1.0) for text in texts]
+
+
+def test_concurrent_requests_are_combined_into_one_batch():
+    predictor: RecordingPredictor = RecordingPredictor()
+    batcher: MicroBatcher = MicroBatcher(predictor, batch_window_ms=200, max_batch_size=3)
+
+    futures: list[Future] = [batcher.submit(text) for text in ["a", "b", "c", "d"]]
+
+    assert [future.result(timeout=5) for future in futures] == [("A", 1.0), ("B", 1.0), ("C", 1.0), ("D", 1.0)]
+    assert predictor.batches == [["a", "b", "c"], ["d"]]
+    batcher.close()
+
+
+def test_an_exception_reaches_every_future_of_the_batch():
+    def predict_batch(texts: list[str]) -> list[tuple[str, float]]:
+        raise RuntimeError("Model failed.")
+
+    batcher: MicroBatcher = MicroBatcher(predict_batch, batch_window_ms=100, max_batch_size=8)
+    futures: list[Future] = [batcher.submit(text) for text in ["a", "b"]]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="Model failed."):
+            future.result(timeout=5)
+    batcher.close()
+
+
+def test_a_prediction_count_mismatch_fails_the_whole_batch():
+    batcher: MicroBatcher = MicroBatcher(lambda texts: [("A", 1.0)], batch_window_ms=100, max_batch_size=8)
+    futures: list[Future] = [batcher.submit(text) for text in ["a", "b"]]
+
+    for future in futures:
+        with pytest.raises(ValueError, match="returned 1 predictions for 2 requests"):
+            future.result(timeout=5)
+    batcher.close()
+
+
+def test_predict_times_out_and_cancels_the_request():
+    predictor: RecordingPredictor = RecordingPredictor(blocked=True)
+    batcher: MicroBatcher = MicroBatcher(predictor, batch_window_ms=1, max_batch_size=1, request_timeout_ms=50)
+
+    first: Future = batcher.submit("a")
+    with pytest.raises(TimeoutError, match="did not finish within"):
+        batcher.predict("b")
+
+    predictor.release.set()
+    assert first.result(timeout=5) == ("A", 1.0)
+    batcher.close(timeout=5)
+    assert predictor.batches == [["a"]]
+
+
+def test_close_finishes_pending_requests_and_rejects_new_ones():
+    predictor: RecordingPredictor = RecordingPredictor(blocked=True)
+    batcher: MicroBatcher = MicroBatcher(predictor, batch_window_ms=1, max_batch_size=8)
+    futures: list[Future] = [batcher.submit(text) for text in ["a", "b"]]
+
+    closer: threading.Thread = threading.Thread(target=batcher.close)
+    closer.start()
+    predictor.release.set()
+    closer.join(timeout=5)
+
+    assert not batcher.worker.is_alive()
+    assert [future.result(timeout=0) for future in futures] == [("A", 1.0), ("B", 1.0)]
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit("c")
+    batcher.close()
@@ -0,0 +1,42 @@
+import sys
+import textwrap
+import subprocess
+
+from conftest import PROJECT_DIR
+
+
+def test_numpy_backend_does_not_import_tensorflow(serving_dir):
+    script: str = textwrap.dedent(f"""
+        import sys
+        sys.path.insert(0, {PROJECT_DIR!r})
+
+        from src.model_registry import ModelRegistry
+        from predict import predict_solutions
+
+        registry = ModelRegistry.get_instance({serving_dir!r})
+        results = predict_solutions(["Der Drucker ist offline", "Die Email ist ungültig"], registry)
+
+        assert [result["prediction"] for result in results] == ["Drucker neu starten.", "E-Mail-Adresse prüfen."], results
+        assert "tensorflow" not in sys.modules
+        assert "keras" not in sys.modules
+    """)
+
+    completed = subprocess.run([sys.executable, "-c", script], cwd=serving_dir, capture_output=True, text=True)
+
+    assert completed.returncode == 0, completed.stderr
+
+
+def test_load_data_returns_the_registry_artifacts(serving_dir):
+    from predict import load_data
+    from src.model_registry import ModelRegistry
+
+    ModelRegistry.reset()
+    try:
+        registry: ModelRegistry = ModelRegistry.get_instance(serving_dir)
+
+        assert load_data(registry.config, serving_dir) == (
+            registry.intents, registry.trained_nlp, registry.contractions, registry.preprocessing_pipeline,
+            registry.job_queue_vectorizer, registry.job_queue_label_encoder, registry.job_queue_model
+        )
+    finally:
+        ModelRegistry.reset()
@@ -0,0 +1,73 @@
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from spacy.training import Example
+
+from src.named_entity_recognition import NamedEntityRecognition
+
+ENTITIES: dict[str, list[str]] = {
+    "Benutzer": ["Max Mustermann", "Erika Musterfrau"],
+    "Mandant": ["CRONUS AG", "CRONUS"],
+    "Tabelle": ["Debitor", "Debitorposten"]
+}
+
+INTENT_UTTERANCES: list[str] = [
+    "Die E-Mail-Adresse 'test.bobl@axians-infoma.com' ist ungültig.",
+    "Die E-Mail-Adresse 'max.mustermann2@firma.de' ist ungültig.",
+    "Der Benutzer FUM-GLOBAL\\Max.Mustermann hat keine Berechtigung für Debitor 10000.",
+    "Max Mustermann kann den Mandanten CRONUS AG nicht öffnen.",
+    "Der Auftrag 4711 im Mandanten CRONUS wurde von Erika Musterfrau gesperrt.",
+    "Das Debitorposten 12 existiert bereits.",
+    "Die Sitzung wurde beendet, bitte erneut anmelden.",
+    "Fehler beim Senden an service123@firma.de in Zeile 42."
+]
+
+
+def get_baseline_entities(nlp, matcher, phrase_matcher, doc) -> list[tuple[int, int, str]]:
+    """The entities of the original `find_entities`: every Matcher match followed by every PhraseMatcher match."""
+    return [
+        (doc[start].idx, doc[end - 1].idx + len(doc[end - 1]), nlp.vocab.strings[match_id])
+        for match_id, start, end in list(matcher(doc)) + list(phrase_matcher(doc))
+    ]
+
+
+def overlaps(entities: list[tuple[int, int, str]]) -> bool:
+    spans: list[tuple[int, int, str]] = sorted(entities)
+    return any(next_start < end for (_, end, _), (next_start, _, _) in zip(spans, spans[1:]))
+
+
+def test_annotations_match_the_baseline_wherever_the_baseline_was_trainable():
+    nlp = spacy.blank("de")
+    matcher = NamedEntityRecognition.create_matcher(nlp)
+    phrase_matcher = NamedEntityRecognition.create_phrase_matcher(nlp, ENTITIES)
+
+    changed: list[str] = []
+    for doc in nlp.tokenizer.pipe(INTENT_UTTERANCES):
+        baseline: list[tuple[int, int, str]] = get_baseline_entities(nlp, matcher, phrase_matcher, doc)
+        entities: list[tuple[int, int, str]] = NamedEntityRecognition.get_matcher_entities(nlp, matcher, phrase_matcher, doc)
+
+        Example.from_dict(doc, {"entities": entities})
+
+        if not overlaps(baseline):
+            assert entities == sorted(baseline), doc.text
+            continue
+
+        changed.append(doc.text)
+        with pytest.raises(ValueError, match="E103"):
+            Example.from_dict(doc, {"entities": baseline})
+
+    assert changed == [INTENT_UTTERANCES[1], INTENT_UTTERANCES[3], INTENT_UTTERANCES[7]]
+
+
+def test_resolve_overlaps_prefers_longest_then_earliest_then_label_rank():
+    matches: list[tuple[int, int, str]] = [
+        (0, 1, "Nummer"), (0, 1, "Email"),
+        (2, 3, "Mandant"), (2, 4, "Mandant"),
+        (5, 7, "Benutzer"), (6, 8, "Tabelle"),
+        (9, 10, "Nummer"), (9, 10, "Nummer")
+    ]
+
+    assert NamedEntityRecognition.resolve_overlaps(matches) == [
+        (0, 1, "Email"), (2, 4, "Mandant"), (5, 7, "Benutzer"), (9, 10, "Nummer")
+    ]
@@ -0,0 +1,88 @@
+import time
+
+from src.prediction_cache import PredictionCache
+from src.prediction_store import PredictionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_evicts_the_least_recently_used_entry():
+    cache: PredictionCache = PredictionCache(max_size=2, ttl_seconds=60)
+
+    cache.put("v1", "a", ("A", 0.1))
+    cache.put("v1", "b", ("B", 0.2))
+    assert cache.get("v1", "a") == ("A", 0.1)
+    cache.put("v1", "c", ("C", 0.3))
+
+    assert cache.get("v1", "b") is None
+    assert cache.get("v1", "a") == ("A", 0.1)
+    assert cache.get("v1", "c") == ("C", 0.3)
+    assert list(cache.entries) == [("v1", "a"), ("v1", "c")]
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock: FakeClock = FakeClock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    cache: PredictionCache = PredictionCache(max_size=10, ttl_seconds=60)
+
+    cache.put("v1", "a", ("A", 0.1))
+    clock.now = 60.0
+    assert cache.get("v1", "a") == ("A", 0.1)
+    clock.now = 60.5
+    cache.put("v1", "b", ("B", 0.2))
+    clock.now = 120.0
+
+    assert cache.get("v1", "a") is None
+    assert cache.get("v1", "b") == ("B", 0.2)
+    assert ("v1", "a") not in cache.entries
+
+
+def test_entries_are_keyed_on_the_model_version():
+    cache: PredictionCache = PredictionCache(max_size=10, ttl_seconds=60)
+
+    cache.put("v1", "a", ("A", 0.1))
+
+    assert cache.get("v2", "a") is None
+
+
+def test_stats_count_hits_misses_and_evictions():
+    cache: PredictionCache = PredictionCache(max_size=1, ttl_seconds=60)
+
+    cache.put("v1", "a", ("A", 0.1))
+    cache.get("v1", "a")
+    cache.get("v1", "b")
+    cache.put_many("v1", [("b", ("B", 0.2)), ("c", ("C", 0.3))])
+
+    assert cache.stats() == {"hits": 1, "store_hits": 0, "misses": 1, "evictions": 2, "size": 1}
+
+
+def test_writes_through_to_the_store_and_reads_back_from_it(tmp_path):
+    store: PredictionStore = PredictionStore(str(tmp_path / "predictions.sqlite"))
+    cache: PredictionCache = PredictionCache(max_size=10, ttl_seconds=60, store=store)
+
+    cache.put("v1", "a", ("A", 0.1))
+    cache.put_many("v1", [("b", ("B", 0.2))])
+    assert store.get("v1", "a") == ("A", 0.1)
+    assert store.get("v1", "b") == ("B", 0.2)
+
+    restarted: PredictionCache = PredictionCache(max_size=10, ttl_seconds=60, store=store)
+    assert restarted.get("v1", "a") == ("A", 0.1)
+    assert restarted.get("v1", "a") == ("A", 0.1)
+    assert restarted.get("v1", "c") is None
+    assert restarted.stats() == {"hits": 1, "store_hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+
+def test_a_zero_size_cache_only_uses_the_store(tmp_path):
+    store: PredictionStore = PredictionStore(str(tmp_path / "predictions.sqlite"))
+    cache: PredictionCache = PredictionCache(max_size=0, ttl_seconds=60, store=store)
+
+    cache.put("v1", "a", ("A", 0.1))
+
+    assert cache.entries == {}
+    assert cache.get("v1", "a") == ("A", 0.1)
@@ -0,0 +1,41 @@
+import os
+import time
+
+from src.prediction_store import PredictionStore
+
+
+def test_get_and_put(tmp_path):
+    store: PredictionStore = PredictionStore(str(tmp_path / "store" / "predictions.sqlite"))
+
+    store.put("v1", "drucker offline", ("Drucker neu starten.", 0.9))
+    store.put_many("v1", [("drucker offline", ("Drucker prüfen.", 0.8)), ("email ungültig", ("E-Mail-Adresse prüfen.", 0.7))])
+
+    assert store.get("v1", "drucker offline") == ("Drucker prüfen.", 0.8)
+    assert store.get("v1", "email ungültig") == ("E-Mail-Adresse prüfen.", 0.7)
+    assert store.get("v2", "drucker offline") is None
+
+
+def test_prune_only_deletes_old_entries_of_other_versions(tmp_path, monkeypatch):
+    store: PredictionStore = PredictionStore(str(tmp_path / "predictions.sqlite"))
+
+    monkeypatch.setattr(time, "time", lambda: 1000.0)
+    store.put("v1", "alt", ("Alt.", 0.5))
+    store.put("v2", "alt", ("Neu.", 0.5))
+    monkeypatch.setattr(time, "time", lambda: 5000.0)
+    store.put("v1", "frisch", ("Frisch.", 0.5))
+
+    assert store.prune("v2", 3600) == 1
+    assert store.get("v1", "alt") is None
+    assert store.get("v1", "frisch") == ("Frisch.", 0.5)
+    assert store.get("v2", "alt") == ("Neu.", 0.5)
+
+
+def test_registry_startup_keeps_entries_of_other_versions(serving_dir):
+    from src.model_registry import ModelRegistry
+
+    PredictionStore(os.path.join(serving_dir, "prediction_store.sqlite")).put("previous", "drucker offline", ("Alt.", 0.5))
+
+    registry: ModelRegistry = ModelRegistry(serving_dir)
+    registry.load()
+
+    assert registry.prediction_cache.store.get("previous", "drucker offline") == ("Alt.", 0.5)
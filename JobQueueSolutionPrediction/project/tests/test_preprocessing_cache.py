@@ -0,0 +1,35 @@
+from src.preprocessing_cache import PreprocessingCache
+
+CONTRACTIONS: dict[str, str] = {"gibt's": "gibt es"}
+SPEC: dict[str, object] = {"version": 1, "steps": [{"name": "lowercase"}]}
+META: dict[str, object] = {"lang": "de", "name": "core_news_sm", "version": "3.7.0", "description": "German pipeline"}
+
+
+def hash_context(**changes: object) -> str:
+    arguments: dict[str, object] = {
+        "contractions": CONTRACTIONS, "spelling_dictionary_hash": "spelling", "preprocessing_spec": SPEC, "spacy_meta": META
+    }
+
+    return PreprocessingCache.hash_context(**{**arguments, **changes})
+
+
+def test_context_hash_depends_on_the_spacy_pipeline():
+    assert hash_context() == hash_context(spacy_meta={**META, "description": "Updated description"})
+    assert hash_context() != hash_context(spacy_meta={**META, "version": "3.8.0"})
+    assert hash_context() != hash_context(spacy_meta={**META, "name": "core_news_lg"})
+
+
+def test_context_hash_depends_on_the_preprocessing_inputs():
+    assert hash_context() != hash_context(contractions={})
+    assert hash_context() != hash_context(spelling_dictionary_hash="other")
+    assert hash_context() != hash_context(preprocessing_spec={"version": 1, "steps": []})
+
+
+def test_entries_are_not_shared_between_contexts(tmp_path):
+    file_path: str = str(tmp_path / "preprocessed.pkl")
+    cache: PreprocessingCache = PreprocessingCache(file_path, hash_context())
+    cache.put("Drucker offline", "drucker offline", [("drucker", "drucker")])
+    cache.save()
+
+    assert PreprocessingCache(file_path, hash_context()).get("Drucker offline") == ("drucker offline", [("drucker", "drucker")])
+    assert PreprocessingCache(file_path, hash_context(spacy_meta={**META, "version": "3.8.0"})).get("Drucker offline") is None
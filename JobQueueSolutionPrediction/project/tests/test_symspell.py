@@ -0,0 +1,111 @@
+import random
+import pytest
+
+spellchecker = pytest.importorskip("spellchecker")
+
+from src.symspell import SymSpell
+
+FREQUENCIES: dict[str, int] = {
+    "drucker": 50, "druckerei": 5, "email": 40, "emil": 2, "offline": 30, "ungültig": 20,
+    "auftrag": 25, "auftraggeber": 4, "warteschlange": 10, "abc": 1, "hand": 7, "hund": 7
+}
+
+
+def import_is_expected_difference():
+    for module in ("spacy", "sklearn", "nltk"):
+        pytest.importorskip(module)
+
+    from benchmark_spelling import is_expected_difference
+
+    return is_expected_difference
+
+
+@pytest.fixture
+def symspell() -> SymSpell:
+    return SymSpell(FREQUENCIES, max_edit_distance=2, prefix_length=7)
+
+
+@pytest.mark.parametrize("word, correction", [
+    ("drucker", "drucker"),
+    ("Drucker", "drucker"),
+    ("drukcer", "drucker"),
+    ("drcker", "drucker"),
+    ("drucckerr", "drucker"),
+    ("emial", "email"),
+    ("emal", "email"),
+    ("ungultig", "ungültig"),
+    ("warteschlnage", "warteschlange"),
+    ("warteschlangee", "warteschlange"),
+    ("auftragebr", "auftraggeber"),
+])
+def test_corrects_to_the_closest_most_frequent_word(symspell, word, correction):
+    assert symspell.correction(word) == correction
+
+
+def test_returns_none_without_a_candidate_and_skips_long_words(symspell):
+    assert symspell.correction("xyz") is None
+    assert symspell.correction("x" * 20) == "x" * 20
+    assert "Email" in symspell and "emial" not in symspell
+
+
+def test_breaks_frequency_ties_alphabetically(symspell):
+    assert symspell.correction("hend") == "hand"
+
+
+@pytest.mark.parametrize("source, target, distance", [
+    ("drucker", "drucker", 0),
+    ("drukcer", "drucker", 1),
+    ("drcker", "drucker", 1),
+    ("ca", "abc", 3),
+    ("hand", "hund", 1),
+])
+def test_uses_the_optimal_string_alignment_distance(source, target, distance):
+    assert SymSpell.distance(source, target, 5) == distance
+    assert SymSpell.distance(source, target, 2) == min(distance, 3)
+
+
+def test_matches_pyspellchecker_up_to_the_distance(symspell):
+    is_expected_difference = import_is_expected_difference()
+
+    spell = spellchecker.SpellChecker(language=None, distance=2)
+    spell.word_frequency.load_json(FREQUENCIES)
+
+    generator: random.Random = random.Random(0)
+    letters: str = "abcdefghijklmnopqrstuvwxyzäöüß"
+    words: list[str] = []
+    for _ in range(300):
+        word: list[str] = list(generator.choice(list(FREQUENCIES)))
+        for _ in range(generator.randint(1, 2)):
+            position: int = generator.randrange(len(word))
+            edit: int = generator.randrange(3)
+            if edit == 0:
+                del word[position]
+            elif edit == 1:
+                word.insert(position, generator.choice(letters))
+            else:
+                word[position] = generator.choice(letters)
+        words.append("".join(word))
+
+    for word in words:
+        expected: str = spell.correction(word) or word
+        actual: str = symspell.correction(word) or word
+        assert is_expected_difference(symspell, word, expected, actual), (word, expected, actual)
+
+
+def test_detects_missed_candidates(symspell):
+    is_expected_difference = import_is_expected_difference()
+
+    assert is_expected_difference(symspell, "ca", "abc", "ca")
+    assert is_expected_difference(symspell, "hend", "hund", "hand")
+    assert not is_expected_difference(symspell, "drukcer", "drucker", "drukcer")
+    assert not is_expected_difference(symspell, "emal", "email", "emil")
+
+
+def test_save_and_load_round_trip(symspell, tmp_path):
+    symspell.dictionary_hash = "hash"
+    symspell.save(str(tmp_path / "index.pkl"))
+
+    loaded: SymSpell = SymSpell.load(str(tmp_path / "index.pkl"))
+
+    assert loaded.dictionary_hash == "hash"
+    assert loaded.correction("drukcer") == "drucker"
@@ -0,0 +1,39 @@
+import re
+import pytest
+
+pytest.importorskip("spacy")
+
+from src.template_index import TemplateIndex
+from src.named_entity_recognition import NamedEntityRecognition
+
+
+def test_uses_the_token_patterns_of_the_matcher():
+    assert [pattern.pattern for _, pattern in TemplateIndex.token_patterns] == list(NamedEntityRecognition.token_patterns.values())
+    assert not any(pattern.flags & re.IGNORECASE for _, pattern in TemplateIndex.token_patterns)
+
+
+def test_normalize_masks_entities_like_the_matcher():
+    assert TemplateIndex.normalize("Die E-Mail-Adresse 'test.bobl@axians-infoma.com' ist ungültig.") == \
+        "die e mail adresse entitätsemail ist ungültig"
+    assert TemplateIndex.normalize("Der Benutzer FUM-GLOBAL\\Max.Mustermann, Auftrag A4711.") == \
+        "der benutzer entitätsbenutzer auftrag entitätsnummer"
+    assert TemplateIndex.normalize("Adresse MAX@FIRMA.DE ist ungültig") == "adresse max firma de ist ungültig"
+
+
+def test_messages_differing_only_in_entities_collide():
+    assert TemplateIndex.fingerprint("Auftrag 4711 von max@firma.de gesperrt.") == \
+        TemplateIndex.fingerprint("Auftrag  12 von erika.musterfrau@firma.de  gesperrt")
+    assert TemplateIndex.fingerprint("Auftrag 4711 gesperrt.") != TemplateIndex.fingerprint("Auftrag 4711 freigegeben.")
+    assert TemplateIndex.fingerprint("Adresse MAX@FIRMA.DE ungültig") != TemplateIndex.fingerprint("Adresse max@firma.de ungültig")
+
+
+def test_build_drops_ambiguous_fingerprints():
+    template_index: TemplateIndex = TemplateIndex.build(
+        ["Auftrag 4711 gesperrt.", "Auftrag 12 gesperrt", "Beleg 1 fehlt.", "Beleg 2 fehlt", "Drucker offline"],
+        ["auftrag", "auftrag", "beleg", "buchung", "drucker"]
+    )
+
+    assert template_index.lookup("Auftrag 99 gesperrt!") == "auftrag"
+    assert template_index.lookup("Drucker offline.") == "drucker"
+    assert template_index.lookup("Beleg 3 fehlt.") is None
+    assert len(template_index.fingerprints) == 2
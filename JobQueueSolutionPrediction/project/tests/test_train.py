@@ -0,0 +1,63 @@
+import os
+import pytest
+
+spacy = pytest.importorskip("spacy")
+pytest.importorskip("tensorflow")
+pytest.importorskip("nlpaug")
+
+import train
+from src.named_entity_recognition import NamedEntityRecognition
+
+
+@pytest.fixture
+def ner_config(tmp_path) -> dict[str, object]:
+    spacy.blank("de").to_disk(tmp_path / "tokenizer")
+    (tmp_path / "entities.txt").write_text("Benutzer:\n- Max Mustermann\n", encoding="utf-8")
+
+    return {
+        "paths": {"entities": "entities.txt", "stage_cache": "stages"},
+        "spacy": {"trained_pipeline": str(tmp_path / "tokenizer")},
+        "ner": {"iterations": 1, "batch_size": 8, "n_process": 1},
+        "serving": {"entity_masking": True, "ner_fallback": False}
+    }
+
+
+def test_ner_is_not_trained_without_ner_fallback(ner_config, tmp_path, monkeypatch):
+    def train_ner(*args, **kwargs):
+        raise AssertionError("The NER must not be trained when serving does not use it.")
+
+    monkeypatch.setattr(NamedEntityRecognition, "train_ner", train_ner)
+
+    outputs: dict[str, object] = train.run_ner_stage(["Max Mustermann hat Auftrag 4711 gesperrt."], ner_config, str(tmp_path))
+
+    assert outputs == {
+        "ner_training_utterances": ["`ENTITÄTSBENUTZER` hat Auftrag `ENTITÄTSNUMMER` gesperrt."],
+        "trained_nlp": None
+    }
+
+    stage_dir: str = str(tmp_path / "stages" / "ner")
+    os.makedirs(os.path.join(stage_dir, "nlp"))
+    train.save_ner_stage(outputs, stage_dir)
+
+    assert not os.path.exists(os.path.join(stage_dir, "nlp"))
+    assert train.load_ner_stage(stage_dir) == outputs
+
+
+def test_model_stage_only_requires_the_nlp_artifact_with_ner(ner_config, tmp_path):
+    def get_artifacts(config: dict[str, object]) -> list[str]:
+        return next(stage for stage in train.build_stage_graph(config, str(tmp_path)).stages if stage.name == "model").artifacts
+
+    assert "nlp" not in get_artifacts(ner_config)
+
+    ner_config["serving"]["ner_fallback"] = True
+    assert "nlp" in get_artifacts(ner_config)
+
+
+def test_model_stage_requires_the_tflite_artifacts_when_exported(ner_config, tmp_path):
+    def get_artifacts(config: dict[str, object]) -> list[str]:
+        return next(stage for stage in train.build_stage_graph(config, str(tmp_path)).stages if stage.name == "model").artifacts
+
+    assert "tflite_report" not in get_artifacts(ner_config)
+
+    ner_config["tflite"] = {"export": True}
+    assert {"tflite_float16_model", "tflite_int8_model", "tflite_report"} <= set(get_artifacts(ner_config))
@@ -1,11 +1,16 @@
 import os
 import sys
+import json
+import shutil
+import hashlib
+import argparse
+import time
 import spacy
 import warnings
 import numpy as np 
 import tensorflow as tf
 from collections import Counter
-from typing import Union, Callable
+from typing import Union, Callable, Optional
 from keras.models import Sequential
 warnings.filterwarnings("ignore")
 
@@ -15,9 +20,21 @@ from src.data_saving import DataSaving
 from src.data_loading import DataLoading
 from src.data_processing import DataProcessing
 from src.data_augmentation import DataAugmentation
+from src.augmentation_cache import AugmentationCache
 from src.model_training import ModelTraining
-from src.text_preprocessing import TextPreprocessing
+from src.template_index import TemplateIndex
+from src.lemma_table import LemmaTable
+from src.preprocessing_cache import PreprocessingCache
+from src.stage_graph import Stage, StageGraph
+from src.numpy_model import NumpyModel
+from src.tflite_model import TFLiteModel
+from src.dictionary_vectorizer import DictionaryVectorizer
+from src.preprocessing_pipeline import PreprocessingPipeline
+from src.spelling_correction import SpellingCorrector
 from src.named_entity_recognition import NamedEntityRecognition
+from src.entity_masker import EntityMasker
+from src.spacy_pipelines import SpacyPipelines
+from src.helper import Helper
 
 
 def load_intents(config: dict[str, any], script_dir: str) -> dict[str, list[str]]:
@@ -54,7 +71,14 @@ def process_training_data(intents: dict[str, list[str]],
     training_labels: list[str] = DataProcessing.get_training_labels(intents)
     labels: list[str] = DataProcessing.get_labels(intents)
 
-    data_augmentation = DataAugmentation()
+    augmentation_cache: AugmentationCache = AugmentationCache(os.path.join(script_dir, config['paths']['augmentation_cache']))
+    data_augmentation = DataAugmentation(
+        config['data_augmentation']['model_path'],
+        config['data_augmentation']['batch_size'],
+        config['data_augmentation']['num_threads'],
+        config['data_augmentation']['seed'],
+        augmentation_cache
+    )
 
     stopwords_path: str = os.path.join(script_dir, config['paths']['stopwords'])
     aug_stopwords: list[str] = DataLoading.load_stopwords(stopwords_path)
@@ -62,17 +86,33 @@ def process_training_data(intents: dict[str, list[str]],
     aug_training_utterances, aug_training_labels = data_augmentation.get_augmented_utterances_labels(
         training_utterances, training_labels, Counter(training_labels), aug_stopwords, config['data_augmentation']['utterances_length']
     )
+    augmentation_cache.save()
 
     aug_training_utterances: list[str] = [x.replace("=", " ").replace("'", " ") for x in aug_training_utterances]
 
     return aug_training_utterances, aug_training_labels, labels
 
+def uses_trained_nlp(config: dict[str, any]) -> bool:
+    """
+    Check whether serving uses the trained NER, either instead of the entity masker or as its fallback.
+
+    Args:
+        config (dict[str, any]): Configuration dictionary.
+
+    Returns:
+        bool: Whether the NER has to be trained and saved.
+    """
+    serving: dict[str, any] = config.get('serving', {})
+
+    return not serving.get('entity_masking', False) or serving.get('ner_fallback', True)
+
 def load_entities_and_train_ner(aug_training_utterances: list[str],
                                 config: dict[str, any],
                                 script_dir: str
-) -> NamedEntityRecognition:
+) -> tuple[list[str], Optional[spacy.Language]]:
     """
-    Load entities, train NER, and extract/replaces entities in the training utterances.
+    Load entities, train NER, and extract/replaces entities in the training utterances the same way serving does.
+    The NER is only trained when serving uses it; with entity masking and no NER fallback only the masker runs.
 
     Args:
         aug_training_utterances (list[str]): Augmented training utterances.
@@ -80,18 +120,39 @@ def load_entities_and_train_ner(aug_training_utterances: list[str],
         script_dir: str: The script directory path.
 
     Returns:
-        NamedEntityRecognition: The trained NLP object.
+        tuple[list[str], Optional[spacy.Language]]: The training utterances with replaced entities and the trained NLP object or None.
     """
     entities_path: str = os.path.join(script_dir, config['paths']['entities'])
-    training_data: list[tuple[str, dict[str, list[tuple[int, int, str]]]]] = NamedEntityRecognition.get_training_data(aug_training_utterances, entities_path, config['spacy']['trained_pipeline'])
-    trained_nlp: spacy.Language = NamedEntityRecognition.train_ner(training_data, config['ner']['iterations'])[0]
-    aug_training_utterances: list[str] = NamedEntityRecognition.replace_entities(aug_training_utterances, trained_nlp)
+    trained_nlp: Optional[spacy.Language] = None
+
+    if uses_trained_nlp(config):
+        training_data: list[tuple[str, dict[str, list[tuple[int, int, str]]]]] = NamedEntityRecognition.get_training_data(
+            aug_training_utterances, entities_path, config['spacy']['trained_pipeline'], config['ner']['batch_size'], config['ner']['n_process'])
+        trained_nlp = NamedEntityRecognition.train_ner(
+            training_data,
+            config['ner']['iterations'],
+            batch_start=config['ner']['batch_start'],
+            batch_stop=config['ner']['batch_stop'],
+            batch_compound=config['ner']['batch_compound'],
+            dropout=config['ner']['dropout'],
+            patience=config['ner']['patience'],
+            dev_fraction=config['ner']['dev_fraction']
+        )[0]
+
+    entity_masker: Optional[EntityMasker] = None
+    if config.get('serving', {}).get('entity_masking', False):
+        entity_masker = EntityMasker(DataLoading.load_entities(entities_path), SpacyPipelines.get_tokenizer(config['spacy']['trained_pipeline']))
+        verify_entity_masker(entity_masker, aug_training_utterances, entities_path, config['spacy']['trained_pipeline'])
+    aug_training_utterances: list[str] = Helper.replace_entities(aug_training_utterances, trained_nlp, entity_masker)
     
     return aug_training_utterances, trained_nlp
 
-def preprocess_training_utterances(aug_training_utterances: list[str], config: dict[str, any], script_dir: str) -> list[str]:
+def preprocess_training_utterances(aug_training_utterances: list[str], 
+                                   config: dict[str, any], 
+                                   script_dir: str
+) -> tuple[list[str], LemmaTable]:
     """
-    Preprocess training utterances using various text preprocessing techniques.
+    Preprocess training utterances using various text preprocessing techniques and build the lemma table of their words.
 
     Args:
         aug_training_utterances (list[str]): Augmented training utterances.
@@ -99,21 +160,58 @@ def preprocess_training_utterances(aug_training_utterances: list[str], config: d
         script_dir: str: The script directory path.
 
     Returns:
-        list[str]: List of preprocessed training utterances.
+        tuple[list[str], LemmaTable]: List of preprocessed training utterances and the lemma table.
     """
     spelling_path: str = os.path.join(script_dir, config['paths']['spelling'])
     contractions_path: str = os.path.join(script_dir, config['paths']['contractions'])
     contractions: dict[str, str] = DataLoading.load_contractions(contractions_path)
+    spelling_memo_path: str = os.path.join(script_dir, config['paths']['spelling_memo'])
+    SpellingCorrector.configure(config.get('spelling', {}), os.path.join(script_dir, config['paths']['spelling_index']))
+    spelling_corrector: SpellingCorrector = SpellingCorrector.get_instance(spelling_path)
+    spelling_corrector.load_memo(spelling_memo_path)
+    preprocessing_spec: dict[str, any] = PreprocessingPipeline.build_spec(config)
+    preprocessing_pipeline: PreprocessingPipeline = PreprocessingPipeline.compile(preprocessing_spec, contractions, script_dir)
+    preprocessing_cache: PreprocessingCache = PreprocessingCache(
+        os.path.join(script_dir, config['paths']['preprocessed_training_utterances']),
+        PreprocessingCache.hash_context(
+            contractions,
+            spelling_corrector.dictionary_hash,
+            preprocessing_spec,
+            SpacyPipelines.get_lemmatizer(config['spacy']['trained_pipeline']).meta
+        )
+    )
+
+    new_utterances: list[str] = list(dict.fromkeys(
+        utterance for utterance in aug_training_utterances if preprocessing_cache.get(utterance) is None
+    ))
+    preprocessing: dict[str, int] = config.get('preprocessing', {})
+    new_word_lemmas: list[list[tuple[str, str]]] = []
+
+    start: float = time.perf_counter()
+    new_preprocessed_utterances: list[str] = preprocessing_pipeline.process_batch(
+        new_utterances, preprocessing.get('batch_size', 256), preprocessing.get('n_process', 1), new_word_lemmas
+    )
+    seconds: float = time.perf_counter() - start
+    print(f'Preprocessed {len(new_utterances)} new utterances in {seconds:.2f}s '
+          f'({len(new_utterances) / max(seconds, 1e-9):.1f} utterances/s), '
+          f'{len(aug_training_utterances) - len(new_utterances)} utterances were cached.')
+
+    for utterance, preprocessed_utterance, word_lemmas in zip(new_utterances, new_preprocessed_utterances, new_word_lemmas):
+        preprocessing_cache.put(utterance, preprocessed_utterance, word_lemmas)
 
     preprocessed_training_utterances: list[str] = []
-    for i, utterance in enumerate(aug_training_utterances):
-        preprocessed_utterance: str = TextPreprocessing.clean_text(utterance, contractions, spelling_path, config['spacy']['trained_pipeline'])
+    training_word_lemmas: list[list[tuple[str, str]]] = []
+    for utterance in aug_training_utterances:
+        preprocessed_utterance, word_lemmas = preprocessing_cache.get(utterance)
         preprocessed_training_utterances.append(preprocessed_utterance)
+        training_word_lemmas.append(word_lemmas)
 
-        if (i + 1) % 10 == 0 or (i + 1) == len(aug_training_utterances):
-            print(f'Processed {i + 1} utterances.')
+    preprocessing_cache.save()
+    spelling_corrector.save_memo(spelling_memo_path)
+    lemma_table: LemmaTable = LemmaTable.from_word_lemmas(training_word_lemmas)
+    print(f'Built lemma table with {len(lemma_table.words)} words.')
     
-    return preprocessed_training_utterances
+    return preprocessed_training_utterances, lemma_table
 
 def load_and_process_vocabulary_model_training(config: dict[str, any]) -> ModelTraining:
     """
@@ -131,8 +229,47 @@ def load_and_process_vocabulary_model_training(config: dict[str, any]) -> ModelT
     
     return ModelTraining(vocabulary, model, training)
 
+def vectorize_training_utterances(model_training: ModelTraining, 
+                                  preprocessed_training_utterances: list[str], 
+                                  config: dict[str, any], 
+                                  script_dir: str
+) -> np.ndarray:
+    """
+    Adapt the vectorizer to the preprocessed training utterances and vectorize them, reusing the
+    memory-mapped vectorized dataset of the previous run if the utterances and vocabulary are unchanged.
+
+    Args:
+        model_training (ModelTraining): Initialized ModelTraining object.
+        preprocessed_training_utterances (list[str]): List of preprocessed training utterances.
+        config (dict[str, any]): Configuration dictionary.
+        script_dir: str: The script directory path.
+
+    Returns:
+        np.ndarray: Vectorized preprocessed training utterances.
+    """
+    vectorized_path: str = os.path.join(script_dir, config['paths']['vectorized_preprocessed_training_utterances'])
+    key_path: str = os.path.splitext(vectorized_path)[0] + ".sha256"
+    key: str = hashlib.sha256(
+        json.dumps({"utterances": preprocessed_training_utterances, "vocabulary": model_training.vocabulary}, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+    model_training.vectorize_layer.adapt(preprocessed_training_utterances)
+
+    if os.path.exists(vectorized_path) and os.path.exists(key_path):
+        with open(key_path) as key_file:
+            if key_file.read().strip() == key:
+                print('Loaded the cached vectorized training utterances.')
+                return DataLoading.load_vectorized_dataset(vectorized_path)
+
+    vectorized_utterances: np.ndarray = np.asarray(ModelTraining.vectorize_text(preprocessed_training_utterances, model_training.vectorize_layer))
+    DataSaving.save_vectorized_dataset(vectorized_utterances, vectorized_path)
+    with open(key_path, "w") as key_file:
+        key_file.write(key)
+
+    return vectorized_utterances
+
 def train_model(model_training: ModelTraining, 
-                preprocessed_training_utterances: list[str], 
+                vectorized_preprocessed_training_utterances: np.ndarray, 
                 aug_training_labels: list[str], 
                 labels:list[str]
 ) -> Sequential:
@@ -141,7 +278,7 @@ def train_model(model_training: ModelTraining,
 
     Args:
         model_training (ModelTraining): Initialized ModelTraining object.
-        preprocessed_training_utterances (list[str]): List of preprocessed training utterances.
+        vectorized_preprocessed_training_utterances (np.ndarray): Vectorized preprocessed training utterances.
         aug_training_labels (list[str]): List of augmented training labels.
         labels (list[str]): The list of labels.
         
@@ -151,7 +288,6 @@ def train_model(model_training: ModelTraining,
     tf.random.set_seed(42)
 
     training_labels_encoded: np.ndarray = model_training.get_training_labels_encoded(aug_training_labels)
-    vectorized_preprocessed_training_utterances: str = model_training.get_vectorized_preprocessed_training_utterances(preprocessed_training_utterances)
 
     num_labels = len(labels)
     model = model_training.get_model(num_labels)
@@ -160,68 +296,391 @@ def train_model(model_training: ModelTraining,
 
     return model
 
+def build_template_index(intents: dict[str, list[str]]) -> TemplateIndex:
+    """
+    Build the template index from the original training utterances.
+
+    Args:
+        intents (dict[str, list[str]]): Intents dictionary.
+
+    Returns:
+        TemplateIndex: The template index mapping fingerprints to tags.
+    """
+    training_utterances: list[str] = DataProcessing.get_training_utterances(intents)
+    training_labels: list[str] = DataProcessing.get_training_labels(intents)
+
+    return TemplateIndex.build(training_utterances, training_labels)
+
 def save_objects(model_training: ModelTraining, 
-                 trained_nlp: NamedEntityRecognition,
+                 trained_nlp: Optional[spacy.Language],
                  model: Sequential,
+                 template_index: TemplateIndex,
+                 lemma_table: LemmaTable,
                  config: dict[str, any], 
                  script_dir: str) -> None:
     """
-    Save the trained NLP, Keras model, vectorizer, label encoder, and preprocessing functions.
+    Save the trained NLP, Keras model, vectorizer, label encoder, preprocessing spec, template index and lemma table.
 
     Args:
         model_training (ModelTraining): Initialized ModelTraining object.
-        trained_nlp (NamedEntityRecognition): The trained NER model. 
+        trained_nlp (Optional[spacy.Language]): The trained NER model, or None if serving does not use it. 
         model (Sequential): The trained Keras model
+        template_index (TemplateIndex): The template index.
+        lemma_table (LemmaTable): The lemma table of the training vocabulary.
         config (dict[str, any]): Configuration dictionary.
         script_dir: str: The script directory path.
 
     Returns:
         None
     """
-    preprocessing_functions: dict[str, Callable[[str], str]] = {
-        "lowercase": TextPreprocessing.lower_text,
-        "remove_unimportant": TextPreprocessing.remove_unimportant_data,
-        "replace_abbreviations": TextPreprocessing.replace_abbreviations,
-        "remove_stopwords": TextPreprocessing.remove_stopwords,
-        "correct_spelling": TextPreprocessing.correct_spelling,
-        "lemmatize": TextPreprocessing.lemmatize_text
-    }
+    preprocessing_spec: dict[str, any] = PreprocessingPipeline.build_spec(config, use_lemma_table=True)
     
     nlp_path: str = os.path.join(script_dir, config['paths']['nlp'])
     model_path: str = os.path.join(script_dir, config['paths']['model'])
     vectorizer_path: str = os.path.join(script_dir, config['paths']['vectorizer'])
     label_encoder_path: str = os.path.join(script_dir, config['paths']['label_encoder'])
-    preprocessing_functions_path: str = os.path.join(script_dir, config['paths']['preprocessing_functions'])
+    preprocessing_spec_path: str = os.path.join(script_dir, config['paths']['preprocessing_spec'])
+    template_index_path: str = os.path.join(script_dir, config['paths']['template_index'])
+    lemma_table_path: str = os.path.join(script_dir, config['paths']['lemma_table'])
 
-    DataSaving.save_trained_nlp(trained_nlp, nlp_path)
+    if trained_nlp is not None:
+        DataSaving.save_trained_nlp(trained_nlp, nlp_path)
     DataSaving.save_keras_model(model, model_path)
     DataSaving.save_vectorizer(model_training.vectorize_layer, vectorizer_path)
     DataSaving.save_label_encoder(model_training.label_encoder, label_encoder_path)
-    DataSaving.save_preprocessing_functions(preprocessing_functions, preprocessing_functions_path)
+    DataSaving.save_preprocessing_spec(preprocessing_spec, preprocessing_spec_path)
+    DataSaving.save_template_index(template_index.fingerprints, template_index_path)
+    DataSaving.save_lemma_table(lemma_table.words, lemma_table.lemmas, lemma_table_path)
+
+def export_numpy_model(model: Sequential,
+                       vectorized_training_utterances: np.ndarray,
+                       config: dict[str, any],
+                       script_dir: str) -> None:
+    """
+    Export the trained Keras model for NumPy-only inference and check that both produce the same predictions.
 
-def train():
+    Args:
+        model (Sequential): The trained Keras model.
+        vectorized_training_utterances (np.ndarray): Vectorized preprocessed training utterances.
+        config (dict[str, any]): Configuration dictionary.
+        script_dir: str: The script directory path.
+
+    Returns:
+        None
     """
-    Main function to train the prediction model.
+    numpy_model_path: str = os.path.join(script_dir, config['paths']['numpy_model'])
+    NumpyModel.export(model, numpy_model_path)
+
+    keras_predictions: np.ndarray = model.predict(vectorized_training_utterances, verbose=0)
+    numpy_predictions: np.ndarray = NumpyModel.load(numpy_model_path).predict(vectorized_training_utterances)
+
+    max_difference: float = float(np.max(np.abs(keras_predictions - numpy_predictions)))
+    if max_difference > 1e-4:
+        raise ValueError(f"NumPy model deviates from the Keras model by {max_difference}.")
+
+    print(f"Exported NumPy model, maximum deviation from the Keras model: {max_difference:.2e}.")
+
+def verify_dictionary_vectorizer(model_training: ModelTraining,
+                                 preprocessed_training_utterances: list[str],
+                                 vectorized_training_utterances: np.ndarray) -> None:
+    """
+    Check that the dictionary vectorizer used for serving produces the same output as the adapted TextVectorization layer.
 
     Args:
+        model_training (ModelTraining): Initialized ModelTraining object.
+        preprocessed_training_utterances (list[str]): List of preprocessed training utterances.
+        vectorized_training_utterances (np.ndarray): The training utterances vectorized by the TextVectorization layer.
+
+    Returns:
         None
+    """
+    dictionary_vectorizer: DictionaryVectorizer = DictionaryVectorizer.from_saved(DataSaving.get_vectorizer_state(model_training.vectorize_layer))
+
+    dictionary_vectorized: np.ndarray = dictionary_vectorizer.vectorize(preprocessed_training_utterances)
+
+    if vectorized_training_utterances.shape != dictionary_vectorized.shape \
+            or not np.array_equal(vectorized_training_utterances, dictionary_vectorized):
+        raise ValueError("The dictionary vectorizer does not match the TextVectorization layer.")
+
+def verify_entity_masker(entity_masker: EntityMasker, aug_training_utterances: list[str], entities_path: str, spacy_trained_pipeline: str) -> None:
+    """
+    Check that the entity masker used for serving replaces the same entities as the Matcher and PhraseMatcher.
+
+    Args:
+        entity_masker (EntityMasker): The rule-based entity masker.
+        aug_training_utterances (list[str]): Augmented training utterances.
+        entities_path (str): The path of the text file to read entities from.
+        spacy_trained_pipeline (str): The trained pipeline from spacy whose tokenizer is used.
 
     Returns:
         None
     """
-    script_dir: str = os.path.dirname(os.path.realpath(__file__))
-    script_dir: str = os.path.dirname(os.path.realpath(__file__))
-    config_path: str = os.path.join(script_dir, 'config.json')
-    config: dict[str, any] = DataLoading.load_config(config_path)
-    intents: dict[str, list[str]] = load_intents(config, script_dir)
+    masked_utterances: list[str] = entity_masker.mask(aug_training_utterances)
+    matched_utterances: list[str] = NamedEntityRecognition.replace_matched_entities(aug_training_utterances, entities_path, spacy_trained_pipeline)
+
+    mismatches: list[tuple[str, str, str]] = [
+        (utterance, masked, matched)
+        for utterance, masked, matched in zip(aug_training_utterances, masked_utterances, matched_utterances)
+        if masked != matched
+    ]
+    if mismatches:
+        raise ValueError(f"The entity masker does not match the Matcher for {len(mismatches)} utterances, e.g. {mismatches[0]}.")
+
+def evaluate_backend(predict: Callable[[np.ndarray], np.ndarray], vectorized_utterances: np.ndarray, labels_encoded: np.ndarray) -> dict[str, float]:
+    """
+    Measure the accuracy and latency of a serving backend on the vectorized training utterances.
+
+    Args:
+        predict (Callable[[np.ndarray], np.ndarray]): The prediction function of the backend.
+        vectorized_utterances (np.ndarray): The vectorized training utterances.
+        labels_encoded (np.ndarray): The encoded training labels.
+
+    Returns:
+        dict[str, float]: The accuracy and the mean latency per utterance in milliseconds.
+    """
+    start: float = time.perf_counter()
+    predictions: np.ndarray = predict(vectorized_utterances)
+    elapsed: float = time.perf_counter() - start
+
+    return {
+        "accuracy": float(np.mean(np.argmax(predictions, axis=1) == labels_encoded)),
+        "latency_ms": elapsed * 1000 / len(vectorized_utterances)
+    }
+
+def export_tflite_models(model: Sequential,
+                         model_training: ModelTraining,
+                         vectorized_training_utterances: np.ndarray,
+                         aug_training_labels: list[str],
+                         config: dict[str, any],
+                         script_dir: str) -> dict[str, dict[str, float]]:
+    """
+    Export float16 and int8 quantized TFLite models and compare them with the Keras model on the training set.
+
+    Args:
+        model (Sequential): The trained Keras model.
+        model_training (ModelTraining): Initialized ModelTraining object.
+        vectorized_training_utterances (np.ndarray): Vectorized preprocessed training utterances.
+        aug_training_labels (list[str]): List of augmented training labels.
+        config (dict[str, any]): Configuration dictionary.
+        script_dir: str: The script directory path.
+
+    Returns:
+        dict[str, dict[str, float]]: The accuracy and latency of each backend.
+    """
+    labels_encoded: np.ndarray = model_training.label_encoder.transform(aug_training_labels)
+
+    report: dict[str, dict[str, float]] = {
+        "keras": evaluate_backend(lambda x: model.predict(x, verbose=0), vectorized_training_utterances, labels_encoded)
+    }
+
+    for quantization in TFLiteModel.quantizations:
+        tflite_path: str = os.path.join(script_dir, config['paths'][f'tflite_{quantization}_model'])
+        TFLiteModel.export(model, tflite_path, quantization, vectorized_training_utterances, config['tflite']['batch_size'])
+        report[f"tflite_{quantization}"] = evaluate_backend(TFLiteModel.load(tflite_path).predict, vectorized_training_utterances, labels_encoded)
+
+    for backend, metrics in report.items():
+        print(f"{backend}: accuracy {metrics['accuracy']:.4f}, latency {metrics['latency_ms']:.3f} ms per utterance.")
 
+    with open(os.path.join(script_dir, config['paths']['tflite_report']), "w") as report_file:
+        json.dump(report, report_file, indent=4)
+
+    return report
+
+def run_augmentation_stage(config: dict[str, any], script_dir: str) -> dict[str, object]:
+    """
+    Stage: load the intents and augment the training utterances.
+
+    Args:
+        config (dict[str, any]): Configuration dictionary.
+        script_dir: str: The script directory path.
+
+    Returns:
+        dict[str, object]: The augmented training utterances, augmented training labels and labels.
+    """
+    intents: dict[str, list[str]] = load_intents(config, script_dir)
     aug_training_utterances, aug_training_labels, labels = process_training_data(intents, config, script_dir)
-    aug_training_utterances, trained_nlp = load_entities_and_train_ner(aug_training_utterances, config, script_dir)
-    preprocessed_training_utterances: list[str] = preprocess_training_utterances(aug_training_utterances, config, script_dir)
+
+    return {"aug_training_utterances": aug_training_utterances, "aug_training_labels": aug_training_labels, "labels": labels}
+
+def run_ner_stage(aug_training_utterances: list[str], config: dict[str, any], script_dir: str) -> dict[str, object]:
+    """
+    Stage: generate the NER training data, train the NER if serving uses it and replace the entities in the training utterances.
+
+    Args:
+        aug_training_utterances (list[str]): Augmented training utterances.
+        config (dict[str, any]): Configuration dictionary.
+        script_dir: str: The script directory path.
+
+    Returns:
+        dict[str, object]: The training utterances with replaced entities and the trained NLP or None.
+    """
+    ner_training_utterances, trained_nlp = load_entities_and_train_ner(aug_training_utterances, config, script_dir)
+
+    return {"ner_training_utterances": ner_training_utterances, "trained_nlp": trained_nlp}
+
+def save_ner_stage(outputs: dict[str, object], stage_dir: str) -> None:
+    """
+    Save the outputs of the NER stage; the trained NLP, if any, is saved with spaCy instead of pickle.
+
+    Args:
+        outputs (dict[str, object]): The outputs of the NER stage.
+        stage_dir (str): The directory of the stage.
+
+    Returns:
+        None
+    """
+    nlp_path: str = os.path.join(stage_dir, "nlp")
+    if outputs["trained_nlp"] is not None:
+        DataSaving.save_trained_nlp(outputs["trained_nlp"], nlp_path)
+    else:
+        shutil.rmtree(nlp_path, ignore_errors=True)
+    with open(os.path.join(stage_dir, "ner_training_utterances.json"), "w", encoding="utf-8") as utterances_file:
+        json.dump(outputs["ner_training_utterances"], utterances_file, ensure_ascii=False)
+
+def load_ner_stage(stage_dir: str) -> dict[str, object]:
+    """
+    Load the outputs of the NER stage saved by `save_ner_stage`.
+
+    Args:
+        stage_dir (str): The directory of the stage.
+
+    Returns:
+        dict[str, object]: The training utterances with replaced entities and the trained NLP or None.
+    """
+    with open(os.path.join(stage_dir, "ner_training_utterances.json"), encoding="utf-8") as utterances_file:
+        ner_training_utterances: list[str] = json.load(utterances_file)
+
+    nlp_path: str = os.path.join(stage_dir, "nlp")
+    trained_nlp: Optional[spacy.Language] = DataLoading.load_trained_nlp(nlp_path) if os.path.exists(nlp_path) else None
+
+    return {"ner_training_utterances": ner_training_utterances, "trained_nlp": trained_nlp}
+
+def run_preprocessing_stage(ner_training_utterances: list[str], config: dict[str, any], script_dir: str) -> dict[str, object]:
+    """
+    Stage: preprocess the training utterances and build the lemma table.
+
+    Args:
+        ner_training_utterances (list[str]): The training utterances with replaced entities.
+        config (dict[str, any]): Configuration dictionary.
+        script_dir: str: The script directory path.
+
+    Returns:
+        dict[str, object]: The preprocessed training utterances and the lemma table.
+    """
+    preprocessed_training_utterances, lemma_table = preprocess_training_utterances(ner_training_utterances, config, script_dir)
+
+    return {"preprocessed_training_utterances": preprocessed_training_utterances, "lemma_table": lemma_table}
+
+def run_model_stage(preprocessed_training_utterances: list[str],
+                    aug_training_labels: list[str],
+                    labels: list[str],
+                    trained_nlp: Optional[spacy.Language],
+                    lemma_table: LemmaTable,
+                    config: dict[str, any],
+                    script_dir: str
+) -> dict[str, object]:
+    """
+    Stage: vectorize the training utterances, train the model and save and export every prediction artifact.
+
+    Args:
+        preprocessed_training_utterances (list[str]): List of preprocessed training utterances.
+        aug_training_labels (list[str]): List of augmented training labels.
+        labels (list[str]): The list of labels.
+        trained_nlp (Optional[spacy.Language]): The trained NLP, or None if serving does not use it.
+        lemma_table (LemmaTable): The lemma table of the training vocabulary.
+        config (dict[str, any]): Configuration dictionary.
+        script_dir: str: The script directory path.
+
+    Returns:
+        dict[str, object]: No outputs; the artifacts are saved to their configured paths.
+    """
     model_training: ModelTraining = load_and_process_vocabulary_model_training(config)
-    model: Sequential = train_model(model_training, preprocessed_training_utterances, aug_training_labels, labels)
+    vectorized_training_utterances: np.ndarray = vectorize_training_utterances(model_training, preprocessed_training_utterances, config, script_dir)
+    model: Sequential = train_model(model_training, vectorized_training_utterances, aug_training_labels, labels)
+
+    template_index: TemplateIndex = build_template_index(load_intents(config, script_dir))
+
+    save_objects(model_training, trained_nlp, model, template_index, lemma_table, config, script_dir)
+    verify_dictionary_vectorizer(model_training, preprocessed_training_utterances, vectorized_training_utterances)
+    export_numpy_model(model, vectorized_training_utterances, config, script_dir)
 
-    save_objects(model_training, trained_nlp, model, config, script_dir)
+    if config.get("tflite", {}).get("export", False):
+        export_tflite_models(model, model_training, vectorized_training_utterances, aug_training_labels, config, script_dir)
+
+    return {}
+
+def build_stage_graph(config: dict[str, any], script_dir: str) -> StageGraph:
+    """
+    Build the graph of the training stages with their inputs, outputs, configuration sections and files.
+
+    Args:
+        config (dict[str, any]): Configuration dictionary.
+        script_dir: str: The script directory path.
+
+    Returns:
+        StageGraph: The stage graph.
+    """
+    stages: list[Stage] = [
+        Stage(
+            "augmentation", run_augmentation_stage,
+            inputs=["config", "script_dir"],
+            outputs=["aug_training_utterances", "aug_training_labels", "labels"],
+            config_keys=["data_augmentation"],
+            files=["intents", "stopwords"]
+        ),
+        Stage(
+            "ner", run_ner_stage,
+            inputs=["aug_training_utterances", "config", "script_dir"],
+            outputs=["ner_training_utterances", "trained_nlp"],
+            config_keys=["spacy", "ner", "serving.entity_masking", "serving.ner_fallback"],
+            files=["entities"],
+            save=save_ner_stage,
+            load=load_ner_stage
+        ),
+        Stage(
+            "preprocessing", run_preprocessing_stage,
+            inputs=["ner_training_utterances", "config", "script_dir"],
+            outputs=["preprocessed_training_utterances", "lemma_table"],
+            config_keys=["spacy", "spelling"],
+            files=["contractions", "spelling"]
+        ),
+        Stage(
+            "model", run_model_stage,
+            inputs=["preprocessed_training_utterances", "aug_training_labels", "labels", "trained_nlp", "lemma_table", "config", "script_dir"],
+            outputs=[],
+            config_keys=["vocabulary", "model", "training", "tflite", "paths"],
+            files=["intents"],
+            artifacts=(["nlp"] if uses_trained_nlp(config) else [])
+            + ["model", "vectorizer", "label_encoder", "preprocessing_spec", "lemma_table", "template_index", "numpy_model"]
+            + (["tflite_float16_model", "tflite_int8_model", "tflite_report"] if config.get("tflite", {}).get("export", False) else [])
+        )
+    ]
+
+    return StageGraph(stages, config, script_dir, os.path.join(script_dir, config['paths']['stage_cache']))
+
+def train(from_stage: Optional[str] = None, dry_run: bool = False) -> None:
+    """
+    Main function to train the prediction model. Stages whose inputs did not change since the
+    previous run load their cached outputs instead of running again.
+
+    Args:
+        from_stage (Optional[str]): The stage from which every stage is rerun regardless of its cache. Defaults to None.
+        dry_run (bool): Only print which stages would run. Defaults to False.
+
+    Returns:
+        None
+    """
+    script_dir: str = os.path.dirname(os.path.realpath(__file__))
+    config_path: str = os.path.join(script_dir, 'config.json')
+    config: dict[str, any] = DataLoading.load_config(config_path)
+
+    build_stage_graph(config, script_dir).run(from_stage, dry_run)
 
 if __name__ == "__main__":
-    train()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train the job queue prediction model, rerunning only invalidated stages.")
+    parser.add_argument("--from-stage", choices=["augmentation", "ner", "preprocessing", "model"], default=None,
+                        help="Rerun this stage and every later stage regardless of the cache.")
+    parser.add_argument("--dry-run", action="store_true", help="Only print which stages would run.")
+    args = parser.parse_args()
+
+    train(args.from_stage, args.dry_run)
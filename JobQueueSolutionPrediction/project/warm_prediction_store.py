@@ -0,0 +1,37 @@
+import sys
+import argparse
+
+sys.path.append('src')
+
+from predict import predict_solutions
+from src.data_processing import DataProcessing
+from src.model_registry import ModelRegistry
+
+
+def warm_prediction_store(batch_size: int) -> int:
+    """
+    Pre-warm the persistent prediction store with predictions for the utterances in the intents.
+
+    Args:
+        batch_size (int): The number of utterances predicted per model forward pass.
+
+    Returns:
+        int: The number of utterances that were predicted.
+    """
+    registry: ModelRegistry = ModelRegistry.get_instance()
+    training_utterances: list[str] = DataProcessing.get_training_utterances(registry.intents)
+
+    for start in range(0, len(training_utterances), batch_size):
+        predict_solutions(training_utterances[start:start + batch_size], registry, use_templates=False)
+        print(f"Processed {min(start + batch_size, len(training_utterances))} utterances.")
+
+    print(registry.prediction_cache.stats())
+
+    return len(training_utterances)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-warm the prediction store from the intents utterances.")
+    parser.add_argument("--batch-size", type=int, default=64, help="Number of utterances per model forward pass.")
+    args = parser.parse_args()
+
+    warm_prediction_store(args.batch_size)